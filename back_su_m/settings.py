@@ -46,6 +46,7 @@ INSTALLED_APPS = [
     'django_filters',
     
     # Local apps
+    'core',
     'news',
     'research',
     'careers',
@@ -55,8 +56,9 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.profiling.ProfilingMiddleware',  # Включается REQUEST_PROFILING
     'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.locale.LocaleMiddleware',  # Добавлено для поддержки языков
+    'core.language.LanguageMiddleware',  # LocaleMiddleware с выбором языка полей (core.language)
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
@@ -91,9 +93,66 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Файловая тестовая БД: in-memory SQLite блокирует таблицы
+        # при параллельных запросах из нескольких потоков
+        'TEST': {
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'salymbekov-university',
     }
 }
 
+# Профилирование запросов: заголовок Server-Timing и статистика по view
+# (команда profile_report). Включать только для диагностики.
+REQUEST_PROFILING = False
+# С какого числа повторов одного SQL-шаблона в запросе он считается N+1
+REQUEST_PROFILING_REPEAT_THRESHOLD = 5
+# Как часто процесс публикует статистику в кэш (секунды)
+REQUEST_PROFILING_PUBLISH_INTERVAL = 10
+
+# Cache-Control: max-age публичных ответов API с ETag (секунды);
+# 0 - клиент и CDN хранят ответ, но проверяют его условным запросом
+API_CACHE_MAX_AGE = 0
+
+# Время жизни кэша ответов новостей (секунды)
+NEWS_RESPONSE_CACHE_TIMEOUT = 300
+
+# Буферизованный учет просмотров новостей: просмотр добавляется в таблицу-буфер
+# PendingNewsView, а в NewsView и счетчики записывается пачками
+# раз в NEWS_VIEW_FLUSH_INTERVAL секунд (None - только командой flush_news_views)
+NEWS_VIEW_BUFFERING = True
+NEWS_VIEW_FLUSH_INTERVAL = 30
+# Сколько дней хранятся сырые просмотры NewsView после свертки по дням
+# (команда compact_news_views); не меньше 30 - окна популярных новостей
+NEWS_VIEW_RETENTION_DAYS = 90
+
+# Счетчики вакансий: при включенной пакетной записи инкременты
+# копятся в памяти процесса и сбрасываются раз в CAREERS_COUNTER_FLUSH_INTERVAL секунд
+CAREERS_COUNTER_BATCHING = False
+CAREERS_COUNTER_FLUSH_INTERVAL = 10
+
+# Время жизни кэша статистики вакансий (секунды)
+CAREERS_STATS_CACHE_TIMEOUT = 60
+
+# Максимальный возраст снимков статистики news/research (секунды)
+STATS_SNAPSHOT_TIMEOUT = 600
+
+# Фоновые задачи (core.tasks, воркер - команда run_tasks). TASKS_EAGER = True
+# выполняет их в процессе после коммита, без очереди (тесты)
+TASKS_EAGER = False
+# Через сколько секунд задачу, не завершенную воркером, забирает другой воркер
+TASKS_VISIBILITY_TIMEOUT = 300
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -169,7 +228,7 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.SelectablePagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
@@ -179,8 +238,9 @@ REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
         'rest_framework.renderers.BrowsableAPIRenderer',
+        'core.streaming.NDJSONRenderer',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.SelectablePagination',
     'PAGE_SIZE': 20,
 }
 
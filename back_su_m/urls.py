@@ -10,6 +10,7 @@ urlpatterns = [
     path('research/', include('research.urls')),  # Research API endpoints
     path('api/careers/', include('careers.urls')),  # Careers API endpoints
     path('api/banners/', include('banner.urls')),  # Banner API endpoints - ВО МНОЖЕСТВЕННОМ ЧИСЛЕ!
+    path('api/core/', include('core.urls')),  # Единый поиск
 ]
 
 # Serve media files during development
@@ -1,7 +1,7 @@
 # banner/admin.py
 from django.contrib import admin
 from django.utils.html import format_html
-from core_admin import BaseModelAdmin, TranslationAdminMixin, image_preview
+from core_admin import BaseModelAdmin, TranslationAdminMixin, image_preview, preview_url
 from .models import Banner
 
 @admin.register(Banner)
@@ -31,7 +31,7 @@ class BannerAdmin(BaseModelAdmin, TranslationAdminMixin):
                 '<img src="{}" style="max-height: 60px; max-width: 120px; '
                 'border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); '
                 'object-fit: cover;" />',
-                obj.image.url
+                preview_url(obj)
             )
         return format_html('<div style="color: #9ca3af; font-style: italic;">🖼️ Нет изображения</div>')
     banner_image_preview.short_description = '🖼️ Превью'
\ No newline at end of file
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BannerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'banner'
+
+    def ready(self):
+        import banner.signals  # noqa
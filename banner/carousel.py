@@ -0,0 +1,83 @@
+"""
+Карусель баннеров главной страницы из заранее собранных данных.
+
+Список активных баннеров запрашивается при каждой загрузке главной, а
+меняется редко. Поэтому при сохранении и удалении баннера (после коммита)
+упорядоченный список собирается одним запросом сразу для всех языков и
+кладется в кэш; запрос к API только выбирает готовый список по языку и
+дописывает к изображениям схему и хост запроса, не обращаясь к БД.
+
+Ключ содержит версию таблицы баннеров (core.versions), поэтому изменения
+без сигналов, после которых вызывается bump_version (массовые действия
+админки), тоже сменяют карусель. Если ключа в кэше нет (вытеснение,
+перезапуск, новая версия), список собирается заново при первом запросе.
+"""
+from django.core.cache import cache
+from django.db import transaction
+
+from core.language import SUPPORTED_LANGUAGES
+from core.localization import localize
+from core.renditions import srcset
+from core.versions import version_token
+
+from .models import Banner
+
+CACHE_PREFIX = 'banner:carousel'
+# Ключи прежних версий больше не читаются и истекают сами
+CACHE_TIMEOUT = 60 * 60 * 24
+LOCALIZED_FIELDS = ('title', 'subtitle')
+# Баннер отдает перевод на языке запроса как есть, без запасных языков
+LOCALIZED_FALLBACKS = ()
+
+
+def build_carousel():
+    """
+    {язык: [баннер, ...]} - активные баннеры по порядку; изображение - путь
+    без хоста, варианты - карта core.renditions (srcset строится при ответе)
+    """
+    banners = list(Banner.objects.filter(is_active=True).order_by('order', 'id'))
+    return {
+        language: [
+            {
+                'image': banner.image.url if banner.image else None,
+                'image_renditions': banner.image_renditions,
+                **{name: localize(banner, name, language, LOCALIZED_FALLBACKS) for name in LOCALIZED_FIELDS},
+            }
+            for banner in banners
+        ]
+        for language in SUPPORTED_LANGUAGES
+    }
+
+
+def get_cache_key():
+    return f'{CACHE_PREFIX}:{version_token([Banner])}'
+
+
+def rebuild_carousel():
+    payloads = build_carousel()
+    cache.set(get_cache_key(), payloads, CACHE_TIMEOUT)
+    return payloads
+
+
+def schedule_rebuild(**kwargs):
+    """Пересборка после коммита: откаченные изменения в карусель не попадают"""
+    transaction.on_commit(rebuild_carousel)
+
+
+def get_carousel(language):
+    payloads = cache.get(get_cache_key())
+    if payloads is None:
+        payloads = rebuild_carousel()
+    return payloads[language]
+
+
+def absolute_images(items, request):
+    """Элементы ответа: абсолютные URL изображения и srcset, как у BannerSerializer"""
+    response = []
+    for item in items:
+        item = dict(item)
+        image = item['image']
+        item['image'] = request.build_absolute_uri(image) if image else None
+        item['image_srcset'] = srcset(item.pop('image_renditions'), request.build_absolute_uri)
+        response.append(item)
+    return response
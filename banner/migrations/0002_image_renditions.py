@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banner', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='banner',
+            name='image_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name='Варианты изображения'),
+        ),
+    ]
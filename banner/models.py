@@ -4,6 +4,7 @@ from django.utils.translation import gettext_lazy as _
 
 class Banner(models.Model):
     image = models.ImageField(upload_to='banners/', verbose_name=_("Изображение"))
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name=_("Варианты изображения"))
     title_ru = models.CharField(max_length=200, verbose_name=_("Заголовок (русский)"))
     title_kg = models.CharField(max_length=200, verbose_name=_("Заголовок (кыргызский)"))
     title_en = models.CharField(max_length=200, verbose_name=_("Заголовок (английский)"))
@@ -1,31 +1,15 @@
 # banner/serializers.py
 from rest_framework import serializers
+from core.localization import LocalizedField
+from core.renditions import ImageSrcsetField
+from .carousel import LOCALIZED_FALLBACKS
 from .models import Banner
 
 class BannerSerializer(serializers.ModelSerializer):
-    title = serializers.SerializerMethodField()
-    subtitle = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField(source='image_renditions', absolute=True)
+    title = LocalizedField(fallbacks=LOCALIZED_FALLBACKS)
+    subtitle = LocalizedField(fallbacks=LOCALIZED_FALLBACKS)
     
     class Meta:
         model = Banner
-        fields = ['image', 'title', 'subtitle']
-    
-    def get_title(self, obj):
-        request = self.context.get('request')
-        if request:
-            language = request.LANGUAGE_CODE
-            if language == 'ky':
-                return obj.title_kg
-            elif language == 'en':
-                return obj.title_en
-        return obj.title_ru
-    
-    def get_subtitle(self, obj):
-        request = self.context.get('request')
-        if request:
-            language = request.LANGUAGE_CODE
-            if language == 'ky':
-                return obj.subtitle_kg
-            elif language == 'en':
-                return obj.subtitle_en
-        return obj.subtitle_ru
\ No newline at end of file
+        fields = ['image', 'image_srcset', 'title', 'subtitle']
@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from . import carousel
+from .models import Banner
+
+
+@receiver([post_save, post_delete], sender=Banner)
+def rebuild_banner_carousel(sender, raw=False, **kwargs):
+    """Пересобираем карусель при любом изменении баннеров"""
+    if not raw:
+        carousel.schedule_rebuild()
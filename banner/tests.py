@@ -1,3 +1,67 @@
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from . import carousel
+from .models import Banner
+from .serializers import BannerSerializer
+
+
+def create_banner(index=0, **kwargs):
+    defaults = {
+        'image': f'banners/banner-{index}.jpg', 'order': index,
+        'title_ru': f'Баннер {index}', 'title_kg': f'Баннер {index}', 'title_en': f'Banner {index}',
+        'subtitle_ru': 'Подзаголовок', 'subtitle_kg': 'Подзаголовок', 'subtitle_en': '',
+    }
+    defaults.update(kwargs)
+    return Banner.objects.create(**defaults)
+
+
+@override_settings(TASKS_EAGER=True)
+class BannerCarouselTests(TestCase):
+    """Карусель баннеров из собранных по языкам данных"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.second = create_banner(2)
+            create_banner(1)
+            create_banner(3, is_active=False)
+
+    def get_titles(self, **extra):
+        response = self.client.get('/api/banners/', **extra)
+        self.assertEqual(response.status_code, 200)
+        return [item['title'] for item in response.json()['results']]
+
+    def test_no_queries_after_warmup(self):
+        cache.clear()
+        self.client.get('/api/banners/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/banners/', HTTP_ACCEPT_LANGUAGE='en')
+        self.assertEqual([item['title'] for item in response.json()['results']], ['Banner 1', 'Banner 2'])
+        # Пустой перевод отдается как есть, без запасного языка
+        self.assertEqual(response.json()['results'][0]['subtitle'], '')
+
+    def test_payload_matches_serializer(self):
+        request = Request(RequestFactory().get('/api/banners/', HTTP_ACCEPT_LANGUAGE='en'))
+        expected = BannerSerializer(
+            Banner.objects.filter(is_active=True).order_by('order'), many=True, context={'request': request}
+        ).data
+        items = carousel.absolute_images(carousel.get_carousel('en'), request)
+        self.assertEqual(items, [dict(item) for item in expected])
+        self.assertTrue(items[0]['image'].startswith('http://testserver/'))
+
+    def test_rebuilt_on_save_and_delete(self):
+        self.assertEqual(self.get_titles(), ['Баннер 1', 'Баннер 2'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.second.order = 0
+            self.second.title_ru = 'Новый баннер'
+            self.second.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_titles(), ['Новый баннер', 'Баннер 1'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.second.delete()
+        self.assertEqual(self.get_titles(), ['Баннер 1'])
@@ -1,13 +1,26 @@
 # banner/views.py
 from rest_framework import generics
+from rest_framework.response import Response
+from core.conditional import ConditionalGetMixin
+from core.language import get_request_language
+from . import carousel
 from .models import Banner
 from .serializers import BannerSerializer
 
-class BannerListAPIView(generics.ListAPIView):
+class BannerListAPIView(ConditionalGetMixin, generics.ListAPIView):
+    """Активные баннеры из собранной карусели (banner.carousel), без запросов к БД"""
     serializer_class = BannerSerializer
     queryset = Banner.objects.filter(is_active=True)
+    conditional_models = (Banner,)
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
-        return context
\ No newline at end of file
+        return context
+    
+    def list(self, request, *args, **kwargs):
+        items = carousel.get_carousel(get_request_language(request))
+        page = self.paginate_queryset(items)
+        if page is not None:
+            return self.get_paginated_response(carousel.absolute_images(page, request))
+        return Response(carousel.absolute_images(items, request))
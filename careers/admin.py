@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Count
+from core import search
 from core_admin import BaseModelAdmin, TranslationAdminMixin, image_preview, format_date_field
 from .models import CareerCategory, Department, Vacancy, VacancyApplication
 
@@ -238,12 +239,13 @@ class VacancyAdmin(BaseModelAdmin, TranslationAdminMixin):
     actions = ['make_published', 'make_draft', 'make_featured', 'remove_featured']
     
     def make_published(self, request, queryset):
-        updated = queryset.update(status='published')
+        # Статус меняет видимость в поиске: документы индекса обновляются
+        updated = search.update_indexed(queryset, status='published')
         self.message_user(request, f'Опубликовано {updated} вакансий.')
     make_published.short_description = _('Опубликовать выбранные вакансии')
     
     def make_draft(self, request, queryset):
-        updated = queryset.update(status='draft')
+        updated = search.update_indexed(queryset, status='draft')
         self.message_user(request, f'{updated} вакансий переведены в черновики.')
     make_draft.short_description = _('Перевести в черновики')
     
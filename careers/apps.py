@@ -11,3 +11,4 @@ class CareersConfig(AppConfig):
             import careers.translation  # noqa
         except ImportError:
             pass
+        import careers.search  # noqa
@@ -0,0 +1,122 @@
+"""
+Счетчики вакансий (просмотры, заявки).
+
+Все изменения выполняются атомарным UPDATE ... SET field = field + N, без
+чтения текущего значения, поэтому параллельные запросы не теряют инкременты.
+При CAREERS_COUNTER_BATCHING = True инкременты копятся в памяти процесса и
+записываются пачкой: один UPDATE на поле для всех вакансий.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db.models import Case, F, Value, When
+
+from .models import Vacancy
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ('views_count', 'applications_count')
+
+
+class CounterBuffer:
+    """Буфер инкрементов в памяти процесса с периодическим сбросом в БД"""
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields
+        self._pending = Counter()
+        self._lock = threading.Lock()
+        self._flusher = None
+
+    def add(self, pk, field, amount=1):
+        with self._lock:
+            self._pending[(field, pk)] += amount
+        self._ensure_flusher()
+
+    def flush(self):
+        """Записывает накопленные инкременты; возвращает число обновленных строк"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        if not pending:
+            return 0
+
+        updated = 0
+        try:
+            for field in self.fields:
+                increments = {pk: amount for (name, pk), amount in pending.items() if name == field}
+                if increments:
+                    updated += apply_increments(self.model, field, increments)
+        except Exception:
+            # Возвращаем инкременты в буфер, чтобы не потерять их
+            with self._lock:
+                self._pending.update(pending)
+            raise
+        return updated
+
+    def _ensure_flusher(self):
+        interval = getattr(settings, 'CAREERS_COUNTER_FLUSH_INTERVAL', None)
+        if not interval or self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._flush_loop, args=(interval,),
+                name='careers-counter-flusher', daemon=True
+            )
+            self._flusher.start()
+
+    def _flush_loop(self, interval):
+        stop = threading.Event()
+        while not stop.wait(interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Не удалось сбросить буфер счетчиков вакансий')
+
+
+def apply_increments(model, field, increments):
+    """Один атомарный UPDATE для набора {pk: прирост} по одному полю"""
+    if len(increments) == 1:
+        (pk, amount), = increments.items()
+        return model.objects.filter(pk=pk).update(**{field: F(field) + amount})
+
+    return model.objects.filter(pk__in=increments).update(**{
+        field: F(field) + Case(
+            *[When(pk=pk, then=Value(amount)) for pk, amount in increments.items()],
+            default=Value(0)
+        )
+    })
+
+
+vacancy_counters = CounterBuffer(Vacancy, COUNTER_FIELDS)
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        vacancy_counters.flush()
+    except Exception:
+        logger.exception('Не удалось сбросить буфер счетчиков вакансий при завершении')
+
+
+def is_batching_enabled():
+    return getattr(settings, 'CAREERS_COUNTER_BATCHING', False)
+
+
+def increment_vacancy_counter(vacancy_id, field, amount=1):
+    """Увеличивает счетчик вакансии атомарно (или через буфер)"""
+    if field not in COUNTER_FIELDS:
+        raise ValueError(f'Неизвестный счетчик вакансии: {field}')
+
+    if is_batching_enabled():
+        vacancy_counters.add(vacancy_id, field, amount)
+    else:
+        apply_increments(Vacancy, field, {vacancy_id: amount})
+
+
+def flush_vacancy_counters():
+    return vacancy_counters.flush()
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0002_alter_careercategory_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=models.Index(fields=['status', 'posted_date', 'id'], name='careers_vac_status_b9d1ba_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('careers', '0003_vacancy_cursor_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['status', 'posted_date'], name='vacancy_featured_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=models.Index(fields=['status', 'deadline'], name='vacancy_status_deadline_idx'),
+        ),
+    ]
@@ -377,6 +377,15 @@ class Vacancy(models.Model):
             models.Index(fields=['status', 'category']),
             models.Index(fields=['posted_date']),
             models.Index(fields=['deadline']),
+            # Курсорная пагинация списка: WHERE status ORDER BY posted_date, id
+            models.Index(fields=['status', 'posted_date', 'id']),
+            # Рекомендуемые: WHERE status AND is_featured ORDER BY posted_date
+            models.Index(
+                fields=['status', 'posted_date'], name='vacancy_featured_posted_idx',
+                condition=models.Q(is_featured=True),
+            ),
+            # Истекающие: WHERE status AND deadline BETWEEN ORDER BY deadline
+            models.Index(fields=['status', 'deadline'], name='vacancy_status_deadline_idx'),
         ]
     
     def __str__(self):
@@ -0,0 +1,52 @@
+"""
+Поисковый индекс вакансий (см. core.search).
+"""
+from core.search import SearchIndex, register
+
+from .models import Vacancy
+
+
+@register
+class VacancySearchIndex(SearchIndex):
+    model = Vacancy
+    label = 'careers.vacancy'
+
+    def get_queryset(self):
+        return Vacancy.objects.select_related('department')
+
+    def get_title(self, obj, language):
+        return getattr(obj, f'title_{language}')
+
+    def get_body(self, obj, language):
+        return [
+            getattr(obj, f'short_description_{language}'),
+            getattr(obj, f'description_{language}'),
+            getattr(obj, f'responsibilities_{language}'),
+            getattr(obj, f'requirements_{language}'),
+            getattr(obj, f'location_{language}'),
+            getattr(obj.department, f'name_{language}'),
+            obj.tags,
+        ]
+
+    def is_public(self, obj):
+        return obj.status == 'published'
+
+    def get_published_at(self, obj):
+        return obj.posted_date
+
+    def get_result_queryset(self):
+        # Фильтр статуса дублирует is_public индекса: документ мог устареть
+        return Vacancy.objects.filter(status='published').select_related('department').only(
+            'id', 'slug', 'deadline', 'title_ru', 'title_kg', 'title_en',
+            'short_description_ru', 'short_description_kg', 'short_description_en',
+            'department__id', 'department__name_ru', 'department__name_kg', 'department__name_en',
+        )
+
+    def serialize(self, obj, language):
+        return {
+            'title': getattr(obj, f'title_{language}') or obj.title_ru,
+            'summary': getattr(obj, f'short_description_{language}') or obj.short_description_ru,
+            'slug': obj.slug,
+            'date': obj.deadline,
+            'department': getattr(obj.department, f'name_{language}') or obj.department.name_ru,
+        }
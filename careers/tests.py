@@ -1,3 +1,190 @@
-from django.test import TestCase
+import threading
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from rest_framework.test import APIClient
+
+from .counters import flush_vacancy_counters, increment_vacancy_counter
+from .models import CareerCategory, Department, Vacancy, VacancyApplication
+
+
+def create_category(name='academic', **kwargs):
+    defaults = {
+        'display_name_ru': 'Преподавательские',
+        'display_name_kg': 'Окутуучулук',
+        'display_name_en': 'Academic',
+    }
+    defaults.update(kwargs)
+    return CareerCategory.objects.create(name=name, **defaults)
+
+
+def create_department(index=0, **kwargs):
+    defaults = {
+        'name_ru': f'Подразделение {index}',
+        'name_kg': f'Бөлүм {index}',
+        'name_en': f'Department {index}',
+    }
+    defaults.update(kwargs)
+    return Department.objects.create(**defaults)
+
+
+def create_vacancy(category, department, index=0, **kwargs):
+    defaults = {
+        'title_ru': f'Вакансия {index}',
+        'title_kg': f'Вакансия {index}',
+        'title_en': f'Vacancy {index}',
+        'slug': f'vacancy-{index}',
+        'category': category,
+        'department': department,
+        'short_description_ru': 'Кратко',
+        'short_description_kg': 'Кыскача',
+        'short_description_en': 'Short',
+        'description_ru': 'Описание',
+        'description_kg': 'Сүрөттөмө',
+        'description_en': 'Description',
+        'responsibilities_ru': 'Обязанность',
+        'responsibilities_kg': 'Милдет',
+        'responsibilities_en': 'Duty',
+        'requirements_ru': 'Требование',
+        'requirements_kg': 'Талап',
+        'requirements_en': 'Requirement',
+        'status': 'published',
+    }
+    defaults.update(kwargs)
+    return Vacancy.objects.create(**defaults)
+
+
+class VacancyCounterConcurrencyTests(TransactionTestCase):
+    """Параллельные просмотры вакансии не теряют инкременты"""
+
+    workers = 8
+    requests_per_worker = 5
+
+    def setUp(self):
+        self.vacancy = create_vacancy(create_category(), create_department())
+
+    def run_in_parallel(self, target):
+        barrier = threading.Barrier(self.workers)
+        errors = []
+
+        def worker():
+            try:
+                barrier.wait()
+                target()
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_parallel_detail_requests(self):
+        def view_vacancy():
+            client = APIClient()
+            for _ in range(self.requests_per_worker):
+                response = client.get(f'/api/careers/vacancies/{self.vacancy.slug}/')
+                self.assertEqual(response.status_code, 200)
+
+        self.run_in_parallel(view_vacancy)
+
+        self.vacancy.refresh_from_db()
+        self.assertEqual(self.vacancy.views_count, self.workers * self.requests_per_worker)
+
+    @override_settings(CAREERS_COUNTER_BATCHING=True, CAREERS_COUNTER_FLUSH_INTERVAL=None)
+    def test_parallel_batched_increments(self):
+        def apply_for_vacancy():
+            for _ in range(self.requests_per_worker):
+                increment_vacancy_counter(self.vacancy.pk, 'applications_count')
+
+        self.run_in_parallel(apply_for_vacancy)
+        self.vacancy.refresh_from_db()
+        self.assertEqual(self.vacancy.applications_count, 0)
+
+        self.assertEqual(flush_vacancy_counters(), 1)
+        self.vacancy.refresh_from_db()
+        self.assertEqual(self.vacancy.applications_count, self.workers * self.requests_per_worker)
+
+
+class VacancyCounterTests(TestCase):
+
+    def test_unknown_counter_is_rejected(self):
+        vacancy = create_vacancy(create_category(), create_department())
+        with self.assertRaises(ValueError):
+            increment_vacancy_counter(vacancy.pk, 'salary_min')
+
+    @override_settings(CAREERS_COUNTER_BATCHING=True, CAREERS_COUNTER_FLUSH_INTERVAL=None)
+    def test_batched_flush_uses_single_update_per_field(self):
+        category, department = create_category(), create_department()
+        vacancies = [create_vacancy(category, department, index) for index in range(3)]
+        for index, vacancy in enumerate(vacancies):
+            for _ in range(index + 1):
+                increment_vacancy_counter(vacancy.pk, 'views_count')
+
+        with self.assertNumQueries(1):
+            flush_vacancy_counters()
+
+        counts = dict(Vacancy.objects.values_list('pk', 'views_count'))
+        self.assertEqual([counts[vacancy.pk] for vacancy in vacancies], [1, 2, 3])
+
+
+class VacancyStatsTests(TestCase):
+    """Статистика вакансий считается за фиксированное число запросов"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.category = create_category()
+        create_category('technical', display_name_ru='Технические', display_name_en='Technical')
+
+    def create_departments(self, count, start=0):
+        for index in range(start, start + count):
+            department = create_department(index)
+            vacancy = create_vacancy(self.category, department, index)
+            create_vacancy(self.category, department, f'{index}-draft', status='draft')
+            VacancyApplication.objects.create(
+                vacancy=vacancy, first_name='Иван', last_name='Иванов',
+                email=f'ivan{index}@example.com', phone='+996555000000',
+                cover_letter='-', resume='careers/resumes/cv.pdf',
+            )
+
+    def test_stats_values(self):
+        self.create_departments(2)
+        create_department(99)  # без вакансий - не попадает в статистику
+
+        response = self.client.get('/api/careers/stats/', HTTP_ACCEPT_LANGUAGE='en')
+        data = response.json()
+        self.assertEqual(data['total_vacancies'], 4)
+        self.assertEqual(data['active_vacancies'], 2)
+        self.assertEqual(data['featured_vacancies'], 0)
+        self.assertEqual(data['total_applications'], 2)
+        self.assertEqual(data['categories_stats'][0], {
+            'category_name': 'academic', 'category_display': 'Academic', 'icon': '💼',
+            'vacancies_count': 2, 'applications_count': 2,
+        })
+        self.assertEqual(data['categories_stats'][1]['vacancies_count'], 0)
+        self.assertEqual(
+            [department['department_name'] for department in data['departments_stats']],
+            ['Department 0', 'Department 1']
+        )
+
+    def test_query_count_does_not_grow_with_departments(self):
+        self.create_departments(3)
+        with self.assertNumQueries(4):
+            self.client.get('/api/careers/stats/')
+
+        # После очистки кэша версии таблиц читаются из БД одним запросом
+        cache.clear()
+        self.create_departments(300, start=3)
+        with self.assertNumQueries(5):
+            response = self.client.get('/api/careers/stats/')
+        self.assertEqual(len(response.json()['departments_stats']), 303)
+
+        # Повторный запрос отдается из кэша
+        with self.assertNumQueries(0):
+            self.client.get('/api/careers/stats/')
@@ -1,10 +1,7 @@
+from django.conf import settings
+from django.core.cache import cache
 from django.shortcuts import render
 from django.db.models import Q, Count
-from django.utils import translation
-from django.utils.translation import activate
-import logging
-
-logger = logging.getLogger(__name__)
 from rest_framework import generics, filters, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
@@ -12,6 +9,12 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django_filters import rest_framework as django_filters
 
+from core.conditional import ConditionalGetMixin, conditional_get
+from core.language import get_request_language
+from core.localization import localized_values
+from core.versions import version_token
+
+from .counters import increment_vacancy_counter
 from .models import CareerCategory, Department, Vacancy, VacancyApplication
 from .serializers import (
     CareerCategorySerializer,
@@ -23,45 +26,25 @@ from .serializers import (
     VacancyStatsSerializer
 )
 
+# Таблицы, от которых зависят списки вакансий (ETag, см. core.conditional)
+VACANCY_CONTENT_MODELS = (Vacancy, CareerCategory, Department)
+VACANCY_STATS_MODELS = VACANCY_CONTENT_MODELS + (VacancyApplication,)
 
-class CareerCategoryListAPIView(generics.ListAPIView):
+
+class CareerCategoryListAPIView(ConditionalGetMixin, generics.ListAPIView):
     """API для получения списка категорий карьеры"""
     queryset = CareerCategory.objects.filter(is_active=True)
     serializer_class = CareerCategorySerializer
     permission_classes = [AllowAny]
-    
-    def get_queryset(self):
-        # Активация языка из заголовков
-        lang = self.request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-        logger.info(f"CareerCategoryListAPIView - Accept-Language: {lang}")
-        logger.info(f"CareerCategoryListAPIView - Current language before activation: {translation.get_language()}")
-        
-        if lang and lang in ['ru', 'en', 'ky']:
-            activate(lang)
-            logger.info(f"CareerCategoryListAPIView - Language activated: {lang}")
-        
-        logger.info(f"CareerCategoryListAPIView - Current language after activation: {translation.get_language()}")
-        return super().get_queryset()
+    conditional_models = (CareerCategory,)
 
 
-class DepartmentListAPIView(generics.ListAPIView):
+class DepartmentListAPIView(ConditionalGetMixin, generics.ListAPIView):
     """API для получения списка подразделений"""
     queryset = Department.objects.filter(is_active=True)
     serializer_class = DepartmentSerializer
     permission_classes = [AllowAny]
-    
-    def get_queryset(self):
-        # Активация языка из заголовков
-        lang = self.request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-        logger.info(f"DepartmentListAPIView - Accept-Language: {lang}")
-        logger.info(f"DepartmentListAPIView - Current language before activation: {translation.get_language()}")
-        
-        if lang and lang in ['ru', 'en', 'ky']:
-            activate(lang)
-            logger.info(f"DepartmentListAPIView - Language activated: {lang}")
-        
-        logger.info(f"DepartmentListAPIView - Current language after activation: {translation.get_language()}")
-        return super().get_queryset()
+    conditional_models = (Department,)
 
 
 class VacancyFilter(django_filters.FilterSet):
@@ -88,10 +71,11 @@ class VacancyFilter(django_filters.FilterSet):
         ]
 
 
-class VacancyListAPIView(generics.ListAPIView):
+class VacancyListAPIView(ConditionalGetMixin, generics.ListAPIView):
     """API для получения списка вакансий"""
     serializer_class = VacancyListSerializer
     permission_classes = [AllowAny]
+    conditional_models = VACANCY_CONTENT_MODELS
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
@@ -101,19 +85,10 @@ class VacancyListAPIView(generics.ListAPIView):
     search_fields = ['title', 'short_description', 'description', 'tags']
     ordering_fields = ['posted_date', 'deadline', 'title', 'views_count', 'applications_count']
     ordering = ['-is_featured', '-posted_date']
+    # Ключ курсорной пагинации (?pagination=cursor), см. core.pagination
+    cursor_ordering = ('-posted_date', '-id')
     
     def get_queryset(self):
-        # Активация языка из заголовков
-        lang = self.request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-        logger.info(f"VacancyListAPIView - Accept-Language: {lang}")
-        logger.info(f"VacancyListAPIView - Current language before activation: {translation.get_language()}")
-        
-        if lang and lang in ['ru', 'en', 'ky']:
-            activate(lang)
-            logger.info(f"VacancyListAPIView - Language activated: {lang}")
-        
-        logger.info(f"VacancyListAPIView - Current language after activation: {translation.get_language()}")
-            
         return Vacancy.objects.filter(
             status='published'
         ).select_related(
@@ -128,17 +103,6 @@ class VacancyDetailAPIView(generics.RetrieveAPIView):
     lookup_field = 'slug'
     
     def get_queryset(self):
-        # Активация языка из заголовков
-        lang = self.request.META.get('HTTP_ACCEPT_LANGUAGE', 'ru')
-        logger.info(f"VacancyDetailAPIView - Accept-Language: {lang}")
-        logger.info(f"VacancyDetailAPIView - Current language before activation: {translation.get_language()}")
-        
-        if lang and lang in ['ru', 'en', 'ky']:
-            activate(lang)
-            logger.info(f"VacancyDetailAPIView - Language activated: {lang}")
-        
-        logger.info(f"VacancyDetailAPIView - Current language after activation: {translation.get_language()}")
-            
         return Vacancy.objects.filter(
             status='published'
         ).select_related('category', 'department')
@@ -147,10 +111,9 @@ class VacancyDetailAPIView(generics.RetrieveAPIView):
         """Увеличиваем счетчик просмотров при получении деталей"""
         instance = self.get_object()
         
-        # Увеличиваем счетчик просмотров
-        Vacancy.objects.filter(pk=instance.pk).update(
-            views_count=instance.views_count + 1
-        )
+        # Увеличиваем счетчик просмотров атомарно
+        increment_vacancy_counter(instance.pk, 'views_count')
+        instance.views_count += 1
         
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -167,14 +130,12 @@ class VacancyApplicationCreateAPIView(generics.CreateAPIView):
         application = serializer.save()
         
         # Увеличиваем счетчик заявок в вакансии
-        Vacancy.objects.filter(pk=application.vacancy.pk).update(
-            applications_count=application.vacancy.applications_count + 1
-        )
+        increment_vacancy_counter(application.vacancy_id, 'applications_count')
 
 
 class VacancyApplicationListAPIView(generics.ListAPIView):
     """API для получения списка заявок (только для администраторов)"""
-    queryset = VacancyApplication.objects.all()
+    queryset = VacancyApplication.objects.select_related('vacancy')
     serializer_class = VacancyApplicationListSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -186,73 +147,91 @@ class VacancyApplicationListAPIView(generics.ListAPIView):
 
 class VacancyApplicationDetailAPIView(generics.RetrieveUpdateAPIView):
     """API для получения и обновления заявки (только для администраторов)"""
-    queryset = VacancyApplication.objects.all()
+    queryset = VacancyApplication.objects.select_related('vacancy')
     serializer_class = VacancyApplicationListSerializer
     permission_classes = [IsAuthenticated]
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get(*VACANCY_STATS_MODELS)
 def vacancy_stats_api(request):
     """API для получения статистики по вакансиям"""
+    language = get_request_language(request)
+    
+    # Версия данных в ключе: после изменения вакансий статистика строится заново
+    cache_key = f'careers:vacancy_stats:{language}:{version_token(VACANCY_STATS_MODELS)}'
+    data = cache.get(cache_key)
+    if data is None:
+        data = build_vacancy_stats(language)
+        cache.set(cache_key, data, getattr(settings, 'CAREERS_STATS_CACHE_TIMEOUT', 60))
+    
+    return Response(data)
+
+
+def build_vacancy_stats(language='ru'):
+    """Статистика по вакансиям: фиксированное число запросов независимо от числа категорий и подразделений"""
+    published = Q(vacancy__status='published')
     
-    # Основная статистика
-    total_vacancies = Vacancy.objects.count()
-    active_vacancies = Vacancy.objects.filter(status='published').count()
-    featured_vacancies = Vacancy.objects.filter(is_featured=True, status='published').count()
+    # Основная статистика одним запросом
+    totals = Vacancy.objects.aggregate(
+        total_vacancies=Count('id'),
+        active_vacancies=Count('id', filter=Q(status='published')),
+        featured_vacancies=Count('id', filter=Q(status='published', is_featured=True)),
+    )
     total_applications = VacancyApplication.objects.count()
     
     # Статистика по категориям
-    categories_stats = []
-    for category in CareerCategory.objects.filter(is_active=True):
-        vacancies_count = Vacancy.objects.filter(
-            category=category,
-            status='published'
-        ).count()
-        applications_count = VacancyApplication.objects.filter(
-            vacancy__category=category
-        ).count()
-        
-        categories_stats.append({
-            'category_name': category.name,
-            'category_display': category.display_name,
-            'icon': category.icon,
-            'vacancies_count': vacancies_count,
-            'applications_count': applications_count
-        })
+    categories = localized_values(
+        CareerCategory.objects.filter(is_active=True).annotate(
+            vacancies_count=Count('vacancy', filter=published, distinct=True),
+            applications_count=Count('vacancy__applications', distinct=True),
+        ),
+        language,
+        'name', 'icon', 'vacancies_count', 'applications_count',
+        category_display='display_name',
+    )
+    categories_stats = [
+        {
+            'category_name': category['name'],
+            'category_display': category['category_display'],
+            'icon': category['icon'],
+            'vacancies_count': category['vacancies_count'],
+            'applications_count': category['applications_count'],
+        }
+        for category in categories
+    ]
     
-    # Статистика по подразделениям
-    departments_stats = []
-    for department in Department.objects.filter(is_active=True):
-        vacancies_count = Vacancy.objects.filter(
-            department=department,
-            status='published'
-        ).count()
-        applications_count = VacancyApplication.objects.filter(
-            vacancy__department=department
-        ).count()
-        
-        if vacancies_count > 0:  # Показываем только подразделения с вакансиями
-            departments_stats.append({
-                'department_name': department.name,
-                'vacancies_count': vacancies_count,
-                'applications_count': applications_count
-            })
+    # Статистика по подразделениям (только подразделения с вакансиями)
+    departments = localized_values(
+        Department.objects.filter(is_active=True).annotate(
+            vacancies_count=Count('vacancy', filter=published, distinct=True),
+            applications_count=Count('vacancy__applications', distinct=True),
+        ).filter(vacancies_count__gt=0),
+        language,
+        'vacancies_count', 'applications_count',
+        department_name='name',
+    )
+    departments_stats = [
+        {
+            'department_name': department['department_name'],
+            'vacancies_count': department['vacancies_count'],
+            'applications_count': department['applications_count'],
+        }
+        for department in departments
+    ]
     
-    data = {
-        'total_vacancies': total_vacancies,
-        'active_vacancies': active_vacancies,
-        'featured_vacancies': featured_vacancies,
+    return {
+        **totals,
         'total_applications': total_applications,
         'categories_stats': categories_stats,
         'departments_stats': departments_stats
     }
-    
-    return Response(data)
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get(*VACANCY_CONTENT_MODELS)
 def featured_vacancies_api(request):
     """API для получения рекомендуемых вакансий"""
     
@@ -275,6 +254,7 @@ def featured_vacancies_api(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get(*VACANCY_CONTENT_MODELS)
 def latest_vacancies_api(request):
     """API для получения последних вакансий"""
     
@@ -296,6 +276,7 @@ def latest_vacancies_api(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@conditional_get(*VACANCY_CONTENT_MODELS)
 def expiring_soon_vacancies_api(request):
     """API для получения вакансий с истекающим скоро сроком"""
     from datetime import date, timedelta
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+    verbose_name = 'Общие компоненты'
+
+    def ready(self):
+        from . import renditions, versions
+        versions.track_models(versions.get_tracked_models())
+        renditions.track_models()
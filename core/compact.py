@@ -0,0 +1,117 @@
+"""
+Компактные списки на одном языке.
+
+Обычные списочные сериализаторы отдают все три перевода (title_ru, title_kg,
+title_en), и queryset читает их все. В компактном режиме (?lang=en или
+?compact=1 с языком из Accept-Language) view подменяет сериализатор на
+компактный с плоскими ключами (title, summary, ...) и ограничивает выборку
+через only(): в SQL попадают только обычные поля сериализатора и колонки
+активного языка с fallback.
+
+Колонки вычисляются по полям компактного сериализатора: LocalizedField дает
+колонки цепочки языков, поля модели - сами себя (в том числе через связь,
+для нее добавляется select_related). Свойства модели, которые читают другие
+колонки, перечисляются в Meta.extra_columns.
+"""
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+
+from .language import LANGUAGE_QUERY_PARAM, get_request_language
+from .localization import LocalizedField, localized_columns
+
+COMPACT_QUERY_PARAM = 'compact'
+TRUE_VALUES = ('1', 'true', 'yes')
+
+
+def is_compact_request(request):
+    return (
+        LANGUAGE_QUERY_PARAM in request.GET
+        or request.GET.get(COMPACT_QUERY_PARAM, '').lower() in TRUE_VALUES
+    )
+
+
+@lru_cache(maxsize=None)
+def compact_projection(serializer_class, language):
+    """(колонки для only(), связи для select_related) компактного сериализатора"""
+    model = serializer_class.Meta.model
+    columns = set(getattr(serializer_class.Meta, 'extra_columns', ()))
+    relations = set()
+
+    for field in serializer_class().fields.values():
+        if field.source == '*':
+            continue
+        *path, name = field.source_attrs
+        related = model
+        for attr in path:
+            related = related._meta.get_field(attr).related_model
+        if isinstance(field, LocalizedField):
+            names = localized_columns(related, name, language, field.fallbacks)
+        else:
+            try:
+                model_field = related._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue  # свойство модели: колонки указываются в Meta.extra_columns
+            if not model_field.concrete:
+                continue
+            names = (name,)
+
+        prefix = ''
+        for attr in path:
+            relation = f'{prefix}{attr}'
+            columns.add(relation)
+            relations.add(relation)
+            prefix = f'{relation}__'
+        columns.update(f'{prefix}{column}' for column in names)
+
+    return tuple(sorted(columns)), tuple(sorted(relations))
+
+
+def compact_queryset(queryset, serializer_class, language, extra_columns=()):
+    columns, relations = compact_projection(serializer_class, language)
+    if relations:
+        queryset = queryset.select_related(*relations)
+    return queryset.only(*columns, *extra_columns)
+
+
+class CompactListMixin:
+    """
+    Компактный режим для списков ViewSet: сериализатор compact_serializer_class
+    и only() по его полям для действий из compact_actions.
+    """
+    compact_serializer_class = None
+    compact_actions = ('list',)
+
+    def is_compact(self):
+        return (
+            self.compact_serializer_class is not None
+            and self.action in self.compact_actions
+            and is_compact_request(self.request)
+        )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not self.is_compact():
+            return queryset
+        # Курсорной пагинации нужны значения ключа у последнего объекта страницы
+        cursor_columns = [name.lstrip('-') for name in getattr(self, 'cursor_ordering', None) or ()]
+        return compact_queryset(
+            queryset, self.compact_serializer_class, get_request_language(self.request), cursor_columns
+        )
+
+    def get_serializer_class(self):
+        if self.is_compact():
+            return self.compact_serializer_class
+        return super().get_serializer_class()
+
+    def get_serializer(self, *args, **kwargs):
+        # ViewSet часто переопределяет get_serializer_class без super()
+        if self.is_compact():
+            kwargs.setdefault('context', self.get_serializer_context())
+            return self.compact_serializer_class(*args, **kwargs)
+        return super().get_serializer(*args, **kwargs)
+
+    def list_response(self, queryset, serializer_class=None):
+        if self.is_compact():
+            serializer_class = self.compact_serializer_class
+        return super().list_response(queryset, serializer_class)
@@ -0,0 +1,157 @@
+"""
+Условные GET-запросы: ETag, Last-Modified и 304 Not Modified.
+
+Валидаторы ответа строятся без чтения строк: ETag - хэш версий таблиц, от
+которых зависит ответ (core.versions), языка, формата, полного пути и
+текущей даты (ответы вроде «ближайшие события» меняются со сменой дня).
+Last-Modified - время последнего изменения этих таблиц, но не раньше начала
+дня. Если клиент прислал совпадающий If-None-Match (или, без него,
+If-Modified-Since не раньше Last-Modified), возвращается 304 до вызова
+обработчика: queryset не строится, сериализатор не запускается.
+
+Язык ответа выбирается по Accept-Language, а формат - по Accept, поэтому
+ответ содержит Vary по обоим заголовкам, и CDN хранит варианты раздельно.
+Валидаторы выдаются только анонимным запросам: ответы авторизованным
+пользователям помечаются Cache-Control: private.
+
+Счетчики просмотров (views_count) обновляются без сигналов и версию не
+меняют: они могут отставать, пока не изменится содержимое таблицы.
+"""
+import hashlib
+from datetime import datetime, time
+from functools import wraps
+
+from django.apps import apps
+from django.conf import settings
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from .language import get_request_language
+from .versions import get_versions
+
+SAFE_METHODS = ('GET', 'HEAD')
+VARY_HEADERS = ('Accept', 'Accept-Language')
+
+
+def get_max_age():
+    return getattr(settings, 'API_CACHE_MAX_AGE', 0)
+
+
+def resolve_models(models):
+    return tuple(apps.get_model(model) if isinstance(model, str) else model for model in models)
+
+
+def is_conditional_request(request):
+    return request.method in SAFE_METHODS and not request.user.is_authenticated
+
+
+def get_validators(request, models):
+    """(ETag, Last-Modified в секундах) ответа на запрос"""
+    versions = get_versions(models)
+    today = timezone.localdate()
+    renderer = getattr(request, 'accepted_renderer', None)
+    raw = ':'.join([
+        request.get_full_path(),
+        get_request_language(request),
+        getattr(renderer, 'format', ''),
+        today.isoformat(),
+        *(f'{model._meta.label_lower}={versions[model]}' for model in models),
+    ])
+    etag = f'W/"{hashlib.md5(raw.encode("utf-8")).hexdigest()}"'
+    day_started = timezone.make_aware(datetime.combine(today, time.min))
+    last_modified = int(max([day_started.timestamp(), *(version / 1_000_000 for version in versions.values())]))
+    return etag, last_modified
+
+
+def _strip_weak(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def is_not_modified(request, etag, last_modified):
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match:
+        # Для GET сравнение слабое (RFC 9110, 13.1.2)
+        tags = parse_etags(if_none_match)
+        return '*' in tags or _strip_weak(etag) in {_strip_weak(tag) for tag in tags}
+    if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    return if_modified_since is not None and last_modified <= if_modified_since
+
+
+def set_cache_headers(response, validators=None):
+    """Валидаторы, Cache-Control и Vary для ответа"""
+    patch_vary_headers(response, VARY_HEADERS)
+    if validators is None:
+        patch_cache_control(response, private=True)
+        return response
+    etag, last_modified = validators
+    if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        max_age = get_max_age()
+        patch_cache_control(response, public=True, max_age=max_age, must_revalidate=not max_age)
+    return response
+
+
+def not_modified_response():
+    return Response(status=status.HTTP_304_NOT_MODIFIED)
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+
+
+class ConditionalGetMixin:
+    """
+    Условные GET для APIView и ViewSet. conditional_models - модели (или
+    'app.Model'), от которых зависит ответ; действия из
+    conditional_exclude_actions (например, учитывающие просмотры) отдаются
+    без валидаторов.
+    """
+    conditional_models = ()
+    conditional_exclude_actions = ()
+
+    def get_conditional_models(self):
+        return resolve_models(self.conditional_models)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.cache_validators = None
+        if not self.conditional_models or not is_conditional_request(request):
+            return
+        if getattr(self, 'action', None) in self.conditional_exclude_actions:
+            return
+        self.cache_validators = get_validators(request, self.get_conditional_models())
+        if is_not_modified(request, *self.cache_validators):
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return not_modified_response()
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method in SAFE_METHODS:
+            set_cache_headers(response, getattr(self, 'cache_validators', None))
+        return response
+
+
+def conditional_get(*models):
+    """То же для функций с @api_view (декоратор под @api_view)"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not is_conditional_request(request):
+                return set_cache_headers(view(request, *args, **kwargs))
+            validators = get_validators(request, resolve_models(models))
+            if is_not_modified(request, *validators):
+                response = not_modified_response()
+            else:
+                response = view(request, *args, **kwargs)
+            return set_cache_headers(response, validators)
+        return wrapper
+    return decorator
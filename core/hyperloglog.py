@@ -0,0 +1,62 @@
+"""
+HyperLogLog - оценка числа уникальных значений в фиксированном объеме памяти.
+
+Скетч из 2 ** precision однобайтовых регистров хранится как bytes (в
+BinaryField) и объединяется поэлементным максимумом, поэтому уникальных
+посетителей за период можно оценить по дневным скетчам без сырых строк.
+При precision=10 скетч занимает 1 КБ, стандартная ошибка ~3%.
+"""
+import hashlib
+import math
+
+DEFAULT_PRECISION = 10
+
+
+class HyperLogLog:
+    def __init__(self, precision=DEFAULT_PRECISION, registers=None):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.size)
+        if len(self.registers) != self.size:
+            raise ValueError(f'Скетч должен содержать {self.size} регистров, получено {len(self.registers)}')
+
+    @classmethod
+    def from_bytes(cls, data, precision=DEFAULT_PRECISION):
+        return cls(precision, data)
+
+    def to_bytes(self):
+        return bytes(self.registers)
+
+    def add(self, value):
+        digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest()
+        hashed = int.from_bytes(digest, 'big')
+        index = hashed >> (64 - self.precision)
+        rest = hashed & ((1 << (64 - self.precision)) - 1)
+        # Позиция первой единицы в оставшихся битах
+        rank = (64 - self.precision) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other):
+        if other.precision != self.precision:
+            raise ValueError('Нельзя объединить скетчи разной точности')
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self):
+        size = self.size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * size and zeros:
+            # Малые множества: линейный подсчет по пустым регистрам точнее
+            estimate = size * math.log(size / zeros)
+        return round(estimate)
+
+    def __len__(self):
+        return self.count()
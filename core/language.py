@@ -0,0 +1,102 @@
+"""
+Язык запроса в терминах суффиксов мультиязычных полей моделей (ru/kg/en).
+
+Язык выбирается один раз на запрос в порядке LocaleMiddleware: параметр
+?lang=, затем cookie LANGUAGE_COOKIE_NAME (явный выбор пользователя, как
+у set_language), затем заголовок Accept-Language с учетом q-весов, затем
+язык LocaleMiddleware (настройки). Разбор заголовка мемоизирован: браузеры присылают небольшое
+число разных значений, поэтому LRU по строке заголовка почти всегда
+попадает. LanguageMiddleware подставляет результат в LocaleMiddleware,
+чтобы translation.get_language() и LANGUAGE_CODE совпадали с языком полей.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from django.middleware.locale import LocaleMiddleware
+from django.utils import translation
+
+SUPPORTED_LANGUAGES = ('ru', 'kg', 'en')
+
+# Коды языков Django, отличающиеся от суффиксов полей
+LANGUAGE_ALIASES = {'ky': 'kg'}
+DJANGO_LANGUAGES = {suffix: code for code, suffix in LANGUAGE_ALIASES.items()}
+
+DEFAULT_LANGUAGE = 'ru'
+
+# Явный выбор языка в query string, приоритетнее заголовка
+LANGUAGE_QUERY_PARAM = 'lang'
+
+REQUEST_LANGUAGE_ATTRIBUTE = '_field_language'
+
+ACCEPT_LANGUAGE_CACHE_SIZE = 512
+
+
+def normalize_language(language):
+    """Суффикс полей для кода языка или None, если язык не поддерживается"""
+    if not language:
+        return None
+    language = language.split('-')[0].lower()
+    language = LANGUAGE_ALIASES.get(language, language)
+    return language if language in SUPPORTED_LANGUAGES else None
+
+
+def to_django_language(language):
+    """Код языка Django (LANGUAGES) для суффикса полей"""
+    return DJANGO_LANGUAGES.get(language, language)
+
+
+@lru_cache(maxsize=ACCEPT_LANGUAGE_CACHE_SIZE)
+def negotiate_language(header):
+    """
+    Поддерживаемый язык с наибольшим q из Accept-Language или None.
+    При равных весах побеждает указанный раньше; q=0 означает отказ.
+    """
+    if not header:
+        return None
+    best = None
+    for position, item in enumerate(header.split(',')):
+        tag, *params = item.split(';')
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        language = normalize_language(tag.strip())
+        if language is None or quality <= 0:
+            continue
+        if best is None or (-quality, position) < best[0]:
+            best = ((-quality, position), language)
+    return best[1] if best else None
+
+
+def get_request_language(request):
+    """
+    Язык запроса в виде суффикса полей модели (ru/kg/en). Вычисляется один
+    раз и запоминается на запросе; без запроса - активный язык Django.
+    """
+    if request is None:
+        return normalize_language(translation.get_language()) or DEFAULT_LANGUAGE
+    language = getattr(request, REQUEST_LANGUAGE_ATTRIBUTE, None)
+    if language is None:
+        language = (
+            normalize_language(request.GET.get(LANGUAGE_QUERY_PARAM))
+            or normalize_language(request.COOKIES.get(settings.LANGUAGE_COOKIE_NAME))
+            or negotiate_language(request.headers.get('Accept-Language'))
+            or normalize_language(getattr(request, 'LANGUAGE_CODE', None) or translation.get_language())
+            or DEFAULT_LANGUAGE
+        )
+        setattr(request, REQUEST_LANGUAGE_ATTRIBUTE, language)
+    return language
+
+
+class LanguageMiddleware(LocaleMiddleware):
+    """LocaleMiddleware, активирующий язык, выбранный get_request_language"""
+
+    def process_request(self, request):
+        super().process_request(request)
+        language = to_django_language(get_request_language(request))
+        translation.activate(language)
+        request.LANGUAGE_CODE = language
@@ -0,0 +1,122 @@
+"""
+Локализация мультиязычных полей (title_ru/title_kg/title_en) в API.
+
+Язык запроса определяется один раз (core.language.get_request_language) и
+запоминается на объекте запроса. Для каждой модели один раз строится таблица колонок по
+языкам, а для пары (поле, язык) - функция доступа через operator.attrgetter,
+которая читает колонки в порядке fallback. Поэтому сериализатор на каждое
+значение делает только поиск в кэше, без форматирования имен и hasattr.
+
+LocalizedField - поле сериализатора для news, careers, research и banner.
+localized_values - проекция values(), в которой SQL выбирает только колонки
+активного языка и fallback (COALESCE), а не все три перевода.
+"""
+import operator
+from functools import lru_cache
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import F, TextField, Value
+from django.db.models.functions import Coalesce, NullIf
+from rest_framework import serializers
+from rest_framework.fields import get_attribute
+
+from .language import SUPPORTED_LANGUAGES, get_request_language
+
+# Порядок запасных языков, если перевода на языке запроса нет
+DEFAULT_FALLBACKS = ('ru', 'en')
+
+@lru_cache(maxsize=None)
+def localized_fields(model):
+    """Мультиязычные поля модели: базовое имя -> {язык: колонка}"""
+    table = {}
+    for field in model._meta.concrete_fields:
+        name, _, language = field.name.rpartition('_')
+        if name and language in SUPPORTED_LANGUAGES:
+            table.setdefault(name, {})[language] = field.attname
+    return table
+
+
+@lru_cache(maxsize=None)
+def localized_columns(model, name, language, fallbacks=DEFAULT_FALLBACKS):
+    """Колонки поля name в порядке: язык запроса, затем fallbacks"""
+    columns = localized_fields(model).get(name)
+    if not columns:
+        raise ImproperlyConfigured(f'{model.__name__} не содержит мультиязычного поля "{name}"')
+    order = (language,) + tuple(fallback for fallback in fallbacks if fallback != language)
+    return tuple(columns[code] for code in order if code in columns)
+
+
+@lru_cache(maxsize=None)
+def get_localizer(model, name, language, fallbacks=DEFAULT_FALLBACKS, placeholder=''):
+    """Функция obj -> первое непустое значение поля name по цепочке языков"""
+    columns = localized_columns(model, name, language, fallbacks)
+    getter = operator.attrgetter(*columns)
+    if len(columns) == 1:
+        return lambda obj: getter(obj) or placeholder
+
+    def first_value(obj):
+        for value in getter(obj):
+            if value:
+                return value
+        return placeholder
+
+    return first_value
+
+
+def localize(instance, name, language, fallbacks=DEFAULT_FALLBACKS, placeholder=''):
+    return get_localizer(type(instance), name, language, tuple(fallbacks), placeholder)(instance)
+
+
+def localized_expression(model, name, language, fallbacks=DEFAULT_FALLBACKS, placeholder=''):
+    """SQL-выражение с тем же fallback: COALESCE(NULLIF(колонка, ''), ..., placeholder)"""
+    columns = localized_columns(model, name, language, tuple(fallbacks))
+    expressions = [NullIf(F(column), Value('')) for column in columns]
+    return Coalesce(*expressions, Value(placeholder), output_field=TextField())
+
+
+def localized_values(queryset, language, *fields, **localized):
+    """
+    queryset.values(*fields) с локализованными значениями:
+    localized_values(qs, 'en', 'icon', category_display='display_name')
+    """
+    model = queryset.model
+    expressions = {key: localized_expression(model, name, language) for key, name in localized.items()}
+    return queryset.values(*fields, **expressions)
+
+
+class LocalizedField(serializers.Field):
+    """
+    Значение мультиязычного поля на языке запроса (только чтение).
+    source - базовое имя поля, в том числе через связь: source='news.title'.
+    """
+
+    def __init__(self, fallbacks=DEFAULT_FALLBACKS, placeholder='', **kwargs):
+        kwargs['read_only'] = True
+        self.fallbacks = tuple(fallbacks)
+        self.placeholder = placeholder
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        *path, name = self.source_attrs
+        if path:
+            instance = get_attribute(instance, path)
+            if instance is None:
+                return None
+        language = get_request_language(self.context.get('request'))
+        return localize(instance, name, language, self.fallbacks, self.placeholder)
+
+    def to_representation(self, value):
+        return value
+
+
+class LocalizedSerializerMixin:
+    """Язык запроса и локализация полей для сериализаторов с SerializerMethodField"""
+    localized_fallbacks = DEFAULT_FALLBACKS
+    localized_placeholder = ''
+
+    @property
+    def language(self):
+        return get_request_language(self.context.get('request'))
+
+    def get_localized_field(self, instance, field_name):
+        return localize(instance, field_name, self.language, self.localized_fallbacks, self.localized_placeholder)
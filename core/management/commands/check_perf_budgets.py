@@ -0,0 +1,49 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from core import perf
+
+
+class Command(BaseCommand):
+    help = (
+        'Проверяет бюджеты производительности API (число SQL-запросов и p95) на синтетических данных '
+        'и сохраняет JSON-отчет. Данные создаются в транзакции, которая откатывается после замера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=1.0, help='Множитель объема данных (1 = 10 000 новостей)')
+        parser.add_argument('--repeat', type=int, default=20, help='Повторов каждого запроса для p95')
+        parser.add_argument('--output', help='Файл для JSON-отчета')
+        parser.add_argument('--baseline', help='Прошлый JSON-отчет для сравнения')
+        parser.add_argument('--no-latency', action='store_true', help='Проверять только число запросов')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            started = time.perf_counter()
+            dataset = perf.seed_dataset(options['scale'])
+            self.stdout.write(f'Данные созданы за {time.perf_counter() - started:.1f} с')
+            report = perf.run_budgets(dataset, repeat=options['repeat'], check_latency=not options['no_latency'])
+            transaction.set_rollback(True)
+
+        for name, result in report['endpoints'].items():
+            line = (
+                f'{name:<45} {result["queries"]:>3}/{result["max_queries"]:<3} запросов  '
+                f'p95 {result["p95_ms"]:>8.2f}/{result["budget_p95_ms"]:<6} мс'
+            )
+            self.stdout.write(self.style.ERROR(line) if result['failures'] else line)
+
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as baseline:
+                for line in perf.compare_reports(json.load(baseline), report):
+                    self.stdout.write(line)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                json.dump(report, output, ensure_ascii=False, indent=2, sort_keys=True)
+            self.stdout.write(f'Отчет сохранен: {options["output"]}')
+
+        if report['failures']:
+            raise CommandError('Бюджеты нарушены:\n' + '\n'.join(report['failures']))
+        self.stdout.write(self.style.SUCCESS(f'Все бюджеты соблюдены ({len(report["endpoints"])} маршрутов)'))
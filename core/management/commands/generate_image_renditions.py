@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from core.renditions import RENDITION_MODELS, generate_missing
+
+
+class Command(BaseCommand):
+    help = 'Строит WebP/AVIF-варианты загруженных изображений, для которых их еще нет'
+
+    def add_arguments(self, parser):
+        parser.add_argument('labels', nargs='*', help='Модели, например banner.banner (по умолчанию все)')
+        parser.add_argument('--force', action='store_true', help='Пересобрать и уже построенные варианты')
+
+    def handle(self, *args, **options):
+        labels = options['labels'] or list(RENDITION_MODELS)
+        unknown = [label for label in labels if label not in RENDITION_MODELS]
+        for label in unknown:
+            self.stderr.write(self.style.ERROR(f'Модель без вариантов изображений: {label}'))
+        labels = [label for label in labels if label in RENDITION_MODELS]
+
+        counts = generate_missing(labels, force=options['force'])
+        for label, count in counts.items():
+            self.stdout.write(self.style.SUCCESS(f'{label}: обработано изображений {count}'))
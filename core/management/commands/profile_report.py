@@ -0,0 +1,66 @@
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from core import profiling
+
+
+class Command(BaseCommand):
+    help = (
+        'Выводит самые медленные view и повторяющиеся (N+1) SQL-запросы по данным '
+        'профилирования (REQUEST_PROFILING). С --url сначала выполняет указанные '
+        'запросы в текущем процессе.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', action='append', default=[], help='Путь для запроса (можно несколько раз)')
+        parser.add_argument('--repeat', type=int, default=1, help='Повторов каждого --url')
+        parser.add_argument('--limit', type=int, default=10, help='Сколько строк выводить в каждом разделе')
+        parser.add_argument('--reset', action='store_true', help='Очистить накопленную статистику после вывода')
+
+    def handle(self, *args, **options):
+        if options['url']:
+            self.profile_urls(options['url'], options['repeat'])
+
+        data = profiling.collect_snapshots()
+        self.write_views(data['views'], options['limit'])
+        self.write_repeated(data['repeated'], options['limit'])
+
+        if options['reset']:
+            profiling.clear_snapshots()
+            self.stdout.write('Статистика очищена')
+
+    def profile_urls(self, urls, repeat):
+        with override_settings(REQUEST_PROFILING=True):
+            client = Client()
+            for url in urls:
+                for _ in range(repeat):
+                    response = client.get(url)
+                    self.stdout.write(f'{url}: {response.status_code}, Server-Timing: {response.get("Server-Timing")}')
+
+    def write_views(self, views, limit):
+        self.stdout.write(self.style.MIGRATE_HEADING('Самые медленные view (по среднему времени)'))
+        if not views:
+            self.stdout.write('  нет данных: включите REQUEST_PROFILING или передайте --url')
+            return
+        rows = sorted(views.items(), key=lambda item: item[1]['total_ms'] / item[1]['requests'], reverse=True)
+        for name, stats in rows[:limit]:
+            requests = stats['requests']
+            p95 = profiling.histogram_percentile(stats['histogram'], 95)
+            self.stdout.write(
+                f'  {name}: {requests} запр., среднее {stats["total_ms"] / requests:.1f} мс, '
+                f'p95 <= {p95 if p95 is not None else ">" + str(profiling.HISTOGRAM_BUCKETS[-1])} мс, '
+                f'макс {stats["max_ms"]:.1f} мс, SQL {stats["db_queries"] / requests:.1f} шт / '
+                f'{stats["db_ms"] / requests:.1f} мс, сериализация {stats["serializer_ms"] / requests:.1f} мс, '
+                f'ответ {stats["response_bytes"] // requests} Б'
+            )
+
+    def write_repeated(self, repeated, limit):
+        self.stdout.write(self.style.MIGRATE_HEADING('Повторяющиеся SQL-запросы (форма N+1)'))
+        if not repeated:
+            self.stdout.write('  не найдено')
+            return
+        rows = sorted(repeated, key=lambda item: item['total_ms'], reverse=True)
+        for item in rows[:limit]:
+            self.stdout.write(
+                f'  {item["view"]}: до {item["max_repeats"]} раз за запрос, '
+                f'в {item["requests"]} запр., {item["total_ms"]:.1f} мс\n    {item["sql"][:300]}'
+            )
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from core.search import rebuild_index, registry
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый поисковый индекс'
+
+    def add_arguments(self, parser):
+        parser.add_argument('labels', nargs='*', help='Типы контента, например news.news (по умолчанию все)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Размер пачки при записи')
+
+    def handle(self, *args, **options):
+        labels = options['labels'] or sorted(registry)
+        unknown = [label for label in labels if label not in registry]
+        for label in unknown:
+            self.stderr.write(self.style.ERROR(f'Неизвестный тип контента: {label}'))
+        labels = [label for label in labels if label in registry]
+
+        counts = rebuild_index(labels, batch_size=options['batch_size'])
+        for label, count in counts.items():
+            self.stdout.write(self.style.SUCCESS(f'{label}: проиндексировано {count}'))
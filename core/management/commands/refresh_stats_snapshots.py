@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from core.stats import registry
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает снимки статистики (для запуска по расписанию)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='Имена снимков (по умолчанию все)')
+
+    def handle(self, *args, **options):
+        names = options['names'] or sorted(registry)
+        for name in names:
+            if name not in registry:
+                self.stderr.write(self.style.ERROR(f'Неизвестный снимок: {name}'))
+                continue
+            registry[name].refresh()
+            self.stdout.write(self.style.SUCCESS(f'Снимок обновлен: {name}'))
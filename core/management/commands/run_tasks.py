@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core import tasks
+
+
+class Command(BaseCommand):
+    help = 'Воркер фоновых задач: выполняет задачи из очереди QueuedTask'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Выполнить готовые задачи и завершиться')
+        parser.add_argument('--batch-size', type=int, default=10, help='Сколько задач захватывать за проход')
+        parser.add_argument('--interval', type=float, default=1.0, help='Пауза при пустой очереди (секунды)')
+
+    def handle(self, *args, **options):
+        succeeded = failed = 0
+        try:
+            while True:
+                done, errors = tasks.run_pending(options['batch_size'])
+                succeeded += done
+                failed += errors
+                if done or errors:
+                    continue
+                if options['once']:
+                    break
+                # Долго работающий процесс: соединение с БД не должно устаревать
+                close_old_connections()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f'Выполнено задач: {succeeded}, с ошибкой: {failed}'))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_type', models.CharField(max_length=100, verbose_name='Тип контента')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='ID объекта')),
+                ('is_public', models.BooleanField(default=True, verbose_name='Доступно в поиске')),
+                ('published_at', models.DateTimeField(blank=True, null=True, verbose_name='Дата публикации')),
+                ('title_ru', models.TextField(blank=True, verbose_name='Заголовок (русский)')),
+                ('title_kg', models.TextField(blank=True, verbose_name='Заголовок (кыргызский)')),
+                ('title_en', models.TextField(blank=True, verbose_name='Заголовок (английский)')),
+                ('body_ru', models.TextField(blank=True, verbose_name='Текст (русский)')),
+                ('body_kg', models.TextField(blank=True, verbose_name='Текст (кыргызский)')),
+                ('body_en', models.TextField(blank=True, verbose_name='Текст (английский)')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата индексации')),
+            ],
+            options={
+                'verbose_name': 'Запись поискового индекса',
+                'verbose_name_plural': 'Поисковый индекс',
+                'indexes': [models.Index(fields=['content_type', 'is_public'], name='core_search_content_4a2c9e_idx')],
+                'unique_together': {('content_type', 'object_id')},
+            },
+        ),
+    ]
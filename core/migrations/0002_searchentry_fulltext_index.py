@@ -0,0 +1,97 @@
+from django.db import migrations
+
+LANGUAGE_COLUMNS = ['title_ru', 'title_kg', 'title_en', 'body_ru', 'body_kg', 'body_en']
+
+# Конфигурации PostgreSQL по языкам: для кыргызского нет словаря, используем simple
+POSTGRES_CONFIGS = {'ru': 'russian', 'kg': 'simple', 'en': 'english'}
+
+
+def _columns(prefix=''):
+    return ', '.join(f'{prefix}{column}' for column in LANGUAGE_COLUMNS)
+
+
+SQLITE_FORWARD = [
+    f"""
+    CREATE VIRTUAL TABLE core_searchentry_fts USING fts5(
+        {_columns()},
+        content='core_searchentry', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER core_searchentry_fts_ai AFTER INSERT ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts(rowid, {_columns()})
+        VALUES (new.id, {_columns('new.')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER core_searchentry_fts_ad AFTER DELETE ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, {_columns()})
+        VALUES ('delete', old.id, {_columns('old.')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER core_searchentry_fts_au AFTER UPDATE ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, {_columns()})
+        VALUES ('delete', old.id, {_columns('old.')});
+        INSERT INTO core_searchentry_fts(rowid, {_columns()})
+        VALUES (new.id, {_columns('new.')});
+    END
+    """,
+    "INSERT INTO core_searchentry_fts(core_searchentry_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS core_searchentry_fts_au',
+    'DROP TRIGGER IF EXISTS core_searchentry_fts_ad',
+    'DROP TRIGGER IF EXISTS core_searchentry_fts_ai',
+    'DROP TABLE IF EXISTS core_searchentry_fts',
+]
+
+
+def postgres_vector(languages):
+    """Выражение tsvector; должно совпадать с core.search.postgres_vector"""
+    parts = []
+    for language in languages:
+        config = POSTGRES_CONFIGS[language]
+        parts.append(f"setweight(to_tsvector('{config}', coalesce(title_{language}, '')), 'A')")
+        parts.append(f"setweight(to_tsvector('{config}', coalesce(body_{language}, '')), 'B')")
+    return ' || '.join(parts)
+
+
+POSTGRES_FORWARD = [
+    f'CREATE INDEX core_searchentry_tsv_all ON core_searchentry USING GIN (({postgres_vector(["ru", "kg", "en"])}))',
+] + [
+    f'CREATE INDEX core_searchentry_tsv_{language} ON core_searchentry USING GIN (({postgres_vector([language])}))'
+    for language in POSTGRES_CONFIGS
+]
+
+POSTGRES_BACKWARD = [
+    f'DROP INDEX IF EXISTS core_searchentry_tsv_{suffix}'
+    for suffix in ['all', *POSTGRES_CONFIGS]
+]
+
+
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
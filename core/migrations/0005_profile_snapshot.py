@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_queued_task'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('process', models.CharField(max_length=200, unique=True, verbose_name='Процесс')),
+                ('data', models.JSONField(default=dict, verbose_name='Статистика')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата публикации')),
+            ],
+            options={
+                'verbose_name': 'Снимок профилирования',
+                'verbose_name_plural': 'Снимки профилирования',
+            },
+        ),
+    ]
@@ -0,0 +1,105 @@
+from django.db import models
+from django.utils import timezone
+
+
+class SearchEntry(models.Model):
+    """
+    Запись полнотекстового поискового индекса (одна на индексируемый объект).
+    Текст хранится по языкам; сам индекс (FTS5 в SQLite, tsvector в PostgreSQL)
+    создается миграцией поверх этой таблицы.
+    """
+    content_type = models.CharField(max_length=100, verbose_name='Тип контента')
+    object_id = models.PositiveBigIntegerField(verbose_name='ID объекта')
+    is_public = models.BooleanField(default=True, verbose_name='Доступно в поиске')
+    published_at = models.DateTimeField(blank=True, null=True, verbose_name='Дата публикации')
+
+    title_ru = models.TextField(blank=True, verbose_name='Заголовок (русский)')
+    title_kg = models.TextField(blank=True, verbose_name='Заголовок (кыргызский)')
+    title_en = models.TextField(blank=True, verbose_name='Заголовок (английский)')
+    body_ru = models.TextField(blank=True, verbose_name='Текст (русский)')
+    body_kg = models.TextField(blank=True, verbose_name='Текст (кыргызский)')
+    body_en = models.TextField(blank=True, verbose_name='Текст (английский)')
+
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Дата индексации')
+
+    class Meta:
+        verbose_name = 'Запись поискового индекса'
+        verbose_name_plural = 'Поисковый индекс'
+        unique_together = ['content_type', 'object_id']
+        indexes = [
+            models.Index(fields=['content_type', 'is_public']),
+        ]
+
+    def __str__(self):
+        return f'{self.content_type}:{self.object_id}'
+
+
+class ContentVersion(models.Model):
+    """
+    Версия содержимого таблицы (core.versions) - время последнего изменения.
+    Основное хранилище - кэш, таблица - источник истины, если ключей в кэше нет.
+    """
+    label = models.CharField(max_length=100, unique=True, verbose_name='Модель')
+    changed_at = models.DateTimeField(default=timezone.now, verbose_name='Дата изменения')
+
+    class Meta:
+        verbose_name = 'Версия содержимого'
+        verbose_name_plural = 'Версии содержимого'
+
+    def __str__(self):
+        return f'{self.label}@{self.changed_at:%Y-%m-%d %H:%M:%S}'
+
+
+class QueuedTask(models.Model):
+    """
+    Задача фоновой очереди (core.tasks). Выполненные задачи удаляются,
+    исчерпавшие попытки остаются со статусом failed и текстом ошибки.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Ожидает'),
+        (STATUS_RUNNING, 'Выполняется'),
+        (STATUS_FAILED, 'Ошибка'),
+    ]
+
+    name = models.CharField(max_length=200, verbose_name='Задача')
+    args = models.JSONField(default=list, blank=True, verbose_name='Аргументы')
+    kwargs = models.JSONField(default=dict, blank=True, verbose_name='Именованные аргументы')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING, verbose_name='Статус')
+    attempts = models.PositiveIntegerField(default=0, verbose_name='Попыток')
+    max_attempts = models.PositiveIntegerField(default=3, verbose_name='Максимум попыток')
+    run_at = models.DateTimeField(default=timezone.now, verbose_name='Выполнить после')
+    locked_until = models.DateTimeField(blank=True, null=True, verbose_name='Занята до')
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата создания')
+
+    class Meta:
+        verbose_name = 'Фоновая задача'
+        verbose_name_plural = 'Фоновые задачи'
+        indexes = [
+            # Выборка воркера: WHERE status = ... AND run_at/locked_until <= now
+            models.Index(fields=['status', 'run_at'], name='queued_task_status_run_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.get_status_display()})'
+
+
+class ProfileSnapshot(models.Model):
+    """
+    Статистика профилирования одного процесса (core.profiling). Хранится в БД,
+    а не в кэше: локальный кэш у каждого процесса свой, а таблицу видят все
+    процессы и команда profile_report.
+    """
+    process = models.CharField(max_length=200, unique=True, verbose_name='Процесс')
+    data = models.JSONField(default=dict, verbose_name='Статистика')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Дата публикации')
+
+    class Meta:
+        verbose_name = 'Снимок профилирования'
+        verbose_name_plural = 'Снимки профилирования'
+
+    def __str__(self):
+        return f'{self.process}@{self.updated_at:%Y-%m-%d %H:%M:%S}'
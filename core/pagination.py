@@ -0,0 +1,168 @@
+"""
+Пагинация списков с выбором режима в запросе.
+
+По умолчанию работает обычная постраничная пагинация (?page=N), чтобы
+существующие клиенты не заметили изменений. Режим курсора включается
+параметром ?pagination=cursor или передачей ?cursor=...; в нем выборка идет
+по ключу (keyset): WHERE (поле, id) < (значение, id) ORDER BY поле, id -
+без COUNT(*) и без OFFSET, поэтому глубокие страницы архива не медленнее первых.
+
+Порядок курсора задается атрибутом view cursor_ordering, например
+('-published_at', '-id'); для него нужен составной индекс в модели.
+
+ListActionMixin применяет ту же пагинацию к дополнительным @action-спискам.
+"""
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .streaming import is_ndjson_request, stream_ndjson
+
+
+class KeysetPagination(BasePagination):
+    """Курсорная пагинация по паре (поле сортировки, id), только вперед"""
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Некорректный курсор'
+
+    def __init__(self, ordering, page_size):
+        field, tiebreaker = ordering
+        self.ordering = ordering
+        self.field = field.lstrip('-')
+        self.tiebreaker = tiebreaker.lstrip('-')
+        self.descending = field.startswith('-')
+        self.page_size = page_size
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(1, page_size), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        # Фильтры запроса сохраняются, сортировка заменяется ключом курсора
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            value, pk = position
+            lookup = 'lt' if self.descending else 'gt'
+            # Условие <= по полю сортировки дает диапазонный проход по индексу,
+            # OR уточняет позицию внутри записей с одинаковым значением
+            queryset = queryset.filter(
+                Q(**{f'{self.field}__{lookup}e': value}),
+                Q(**{f'{self.field}__{lookup}': value}) | Q(**{f'{self.tiebreaker}__{lookup}': pk})
+            )
+
+        page = list(queryset[:page_size + 1])
+        self.has_next = len(page) > page_size
+        self.page = page[:page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': None,
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, PaginationModeMixin.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(last))
+
+    def encode_cursor(self, obj):
+        value = getattr(obj, self.field)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        payload = json.dumps([value, getattr(obj, self.tiebreaker)])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            value, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            value = model._meta.get_field(self.field).to_python(value)
+            pk = model._meta.get_field(self.tiebreaker).to_python(pk)
+        except (TypeError, ValueError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return value, pk
+
+
+class PaginationModeMixin:
+    """Выбор между постраничной и курсорной пагинацией по параметрам запроса"""
+    mode_query_param = 'pagination'
+    cursor_mode = 'cursor'
+
+    def use_cursor(self, request, view):
+        if getattr(view, 'cursor_ordering', None) is None:
+            return False
+        return (
+            request.query_params.get(self.mode_query_param) == self.cursor_mode
+            or KeysetPagination.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_cursor(request, view):
+            self.keyset = KeysetPagination(view.cursor_ordering, self.page_size)
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class SelectablePagination(PaginationModeMixin, PageNumberPagination):
+    """PageNumberPagination по умолчанию, keyset-курсор по запросу"""
+
+
+class ListActionMixin:
+    """
+    Ответ для @action-списков ViewSet: страница через пагинатор view
+    (обычная или курсорная), а при запросе NDJSON - полная выгрузка потоком.
+    """
+    stream_chunk_size = 500
+
+    def list_response(self, queryset, serializer_class=None):
+        serializer_class = serializer_class or self.get_serializer_class()
+        context = self.get_serializer_context()
+
+        if is_ndjson_request(self.request):
+            filename = f'{self.basename}-{self.action}.ndjson'
+            return stream_ndjson(queryset, serializer_class, context, self.stream_chunk_size, filename)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer_class(page, many=True, context=context).data)
+        return Response(serializer_class(queryset, many=True, context=context).data)
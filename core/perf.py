@@ -0,0 +1,586 @@
+"""
+Бюджеты производительности публичных API: число SQL-запросов и p95 времени ответа.
+
+seed_dataset() наполняет БД реалистичным объемом данных через bulk_create
+(по умолчанию 10 000 новостей, 2 000 вакансий, 5 000 публикаций), ENDPOINTS
+описывает запрос к каждому маршруту news, careers, research и banner вместе с
+потолком запросов и бюджетом p95, run_budgets() прогоняет их тестовым клиентом.
+
+Число запросов снимается на холодном кэше (худший случай, с чтением версий
+таблиц из core.versions для ETag и ключей кэша, а у POST - с их обновлением),
+время - по серии повторов с включенным кэшем, как в работе сайта. Отчет -
+словарь, пригодный для json.dumps(sort_keys=True): команда check_perf_budgets
+сохраняет его в файл, и отчеты разных релизов сравниваются обычным diff или
+параметром --baseline.
+"""
+import gc
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import time as day_time, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, reset_queries
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, resolve
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from banner.models import Banner
+from careers.models import CareerCategory, Department, Vacancy, VacancyApplication
+from news import related, trending
+from news.models import Announcement, Event, News, NewsCategory, NewsTag, NewsTagRelation, NewsView
+from research.models import Conference, Grant, GrantApplication, Publication, ResearchArea, ResearchCenter
+
+from . import search, versions
+
+# Объем данных при scale=1
+DATASET = {
+    'news': 10000,
+    'events': 1000,
+    'announcements': 1000,
+    'tags': 40,
+    'news_views': 20000,
+    'vacancies': 2000,
+    'vacancy_applications': 200,
+    'publications': 5000,
+    'grants': 500,
+    'grant_applications': 200,
+    'conferences': 200,
+    'areas': 12,
+    'centers': 8,
+    'banners': 8,
+}
+
+# Маршруты, которые обязан покрывать ENDPOINTS
+BUDGETED_URLCONFS = ('news.urls', 'careers.urls', 'research.urls', 'banner.urls')
+
+BATCH_SIZE = 1000
+SEARCH_QUERY = 'университет'
+WORDS = (
+    'университет студент наука конференция стипендия лекция семинар экзамен '
+    'факультет исследование грант проект лаборатория кафедра выпускник олимпиада'
+).split()
+
+
+@dataclass
+class Endpoint:
+    """Запрос к маршруту API и его бюджет"""
+    name: str
+    path: str
+    max_queries: int
+    p95_ms: float
+    params: dict = field(default_factory=dict)
+    method: str = 'get'
+    # Тело POST-запроса: функция от номера повтора (данные должны различаться)
+    data: object = None
+    auth: bool = False
+    status: int = 200
+
+    def get_path(self, dataset):
+        return self.path.format(**dataset)
+
+    def get_params(self, dataset):
+        return {key: str(value).format(**dataset) for key, value in self.params.items()}
+
+
+ENDPOINTS = [
+    # news.urls
+    Endpoint('news.api_root', '/api/', 0, 30),
+    Endpoint('news.categories', '/api/categories/', 3, 30),
+    Endpoint('news.category_detail', '/api/categories/{news_category}/', 2, 30),
+    Endpoint('news.tags', '/api/tags/', 3, 30),
+    Endpoint('news.tag_detail', '/api/tags/{tag}/', 2, 30),
+    Endpoint('news.list', '/api/news/', 4, 30),
+    Endpoint('news.list_cursor', '/api/news/', 3, 30, params={'pagination': 'cursor'}),
+    Endpoint('news.list_compact', '/api/news/', 4, 30, params={'lang': 'en'}),
+    Endpoint('news.detail', '/api/news/{news}/', 7, 70),
+    Endpoint('news.featured', '/api/news/featured/', 4, 30),
+    Endpoint('news.pinned', '/api/news/pinned/', 4, 30),
+    Endpoint('news.popular', '/api/news/popular/', 3, 30),
+    Endpoint('news.popular_24h', '/api/news/popular/', 3, 30, params={'window': '24h'}),
+    Endpoint('news.by_category', '/api/news/by_category/', 5, 150, params={'category': '{news_category}'}),
+    Endpoint('events.list', '/api/events/', 3, 100),
+    Endpoint('events.detail', '/api/events/{event}/', 2, 30),
+    Endpoint('events.upcoming', '/api/events/upcoming/', 3, 60),
+    Endpoint('events.past', '/api/events/past/', 3, 60),
+    Endpoint('events.this_month', '/api/events/this_month/', 3, 50),
+    Endpoint('announcements.list', '/api/announcements/', 3, 150),
+    Endpoint('announcements.detail', '/api/announcements/{announcement}/', 2, 30),
+    Endpoint('announcements.pinned', '/api/announcements/pinned/', 3, 30),
+    Endpoint('announcements.urgent', '/api/announcements/urgent/', 3, 60),
+    Endpoint('announcements.by_type', '/api/announcements/by_type/', 3, 60, params={'type': 'academic'}),
+    Endpoint('announcements.for_students', '/api/announcements/for_students/', 3, 60),
+    Endpoint('news.stats', '/api/stats/', 4, 30),
+    Endpoint('news.search', '/api/search/', 9, 550, params={'q': SEARCH_QUERY}),
+
+    # careers.urls
+    Endpoint('careers.categories', '/api/careers/categories/', 3, 30),
+    Endpoint('careers.departments', '/api/careers/departments/', 3, 30),
+    Endpoint('careers.vacancies', '/api/careers/vacancies/', 3, 100),
+    Endpoint('careers.vacancies_cursor', '/api/careers/vacancies/', 2, 70, params={'pagination': 'cursor'}),
+    Endpoint('careers.vacancy_detail', '/api/careers/vacancies/{vacancy}/', 2, 40),
+    Endpoint(
+        'careers.application_create', '/api/careers/applications/', 6, 40, method='post', status=201,
+        data=lambda index: {
+            'vacancy': '{vacancy_id}', 'first_name': 'Бюджет', 'last_name': 'Проверка',
+            'email': f'perf-{index}@example.com', 'phone': '+996555000000',
+            'cover_letter': 'Сопроводительное письмо',
+            'resume': SimpleUploadedFile('resume.pdf', b'%PDF-1.4', content_type='application/pdf'),
+        },
+    ),
+    Endpoint('careers.applications', '/api/careers/applications/list/', 2, 50, auth=True),
+    Endpoint('careers.application_detail', '/api/careers/applications/{vacancy_application}/', 1, 30, auth=True),
+    Endpoint('careers.stats', '/api/careers/stats/', 5, 30),
+    Endpoint('careers.featured', '/api/careers/featured/', 2, 40),
+    Endpoint('careers.latest', '/api/careers/latest/', 2, 40),
+    Endpoint('careers.expiring_soon', '/api/careers/expiring-soon/', 2, 40),
+
+    # research.urls
+    Endpoint('research.api_root', '/research/api/', 0, 30),
+    Endpoint('research.areas', '/research/api/areas/', 3, 30),
+    Endpoint('research.area_detail', '/research/api/areas/{area}/', 2, 30),
+    Endpoint('research.centers', '/research/api/centers/', 3, 30),
+    Endpoint('research.center_detail', '/research/api/centers/{center}/', 2, 30),
+    Endpoint('research.grants', '/research/api/grants/', 3, 30),
+    Endpoint('research.grant_detail', '/research/api/grants/{grant}/', 2, 30),
+    Endpoint('research.grants_active', '/research/api/grants/active/', 3, 30),
+    Endpoint('research.grants_upcoming', '/research/api/grants/upcoming/', 3, 30),
+    Endpoint('research.grants_deadline_soon', '/research/api/grants/deadline_soon/', 3, 40),
+    Endpoint('research.conferences', '/research/api/conferences/', 3, 30),
+    Endpoint('research.conference_detail', '/research/api/conferences/{conference}/', 2, 30),
+    Endpoint('research.conferences_upcoming', '/research/api/conferences/upcoming/', 3, 30),
+    Endpoint('research.conferences_registration_open', '/research/api/conferences/registration_open/', 3, 30),
+    Endpoint('research.publications', '/research/api/publications/', 3, 60),
+    Endpoint('research.publications_cursor', '/research/api/publications/', 2, 50, params={'pagination': 'cursor'}),
+    Endpoint('research.publications_compact', '/research/api/publications/', 3, 50, params={'lang': 'en'}),
+    Endpoint('research.publication_detail', '/research/api/publications/{publication}/', 2, 40),
+    Endpoint('research.publications_featured', '/research/api/publications/featured/', 3, 40),
+    Endpoint('research.publications_recent', '/research/api/publications/recent/', 3, 50),
+    Endpoint(
+        'research.publications_by_area', '/research/api/publications/by_research_area/', 3, 50,
+        params={'area_id': '{area}'},
+    ),
+    Endpoint(
+        'research.grant_application_create', '/research/api/grant-applications/', 3, 30, method='post', status=201,
+        data=lambda index: {
+            'grant': '{grant}', 'project_title': f'Проект {index}', 'principal_investigator': 'Бюджет',
+            'email': 'perf@example.com', 'department': 'Кафедра', 'project_description': 'Описание',
+            'budget': 1000, 'timeline': 12, 'expected_results': 'Результаты',
+        },
+    ),
+    Endpoint('research.grant_applications', '/research/api/grant-applications/list/', 2, 40, auth=True),
+    Endpoint('research.stats', '/research/api/stats/', 7, 30),
+    Endpoint('research.stats_grants', '/research/api/stats/grants/', 2, 30),
+    Endpoint('research.stats_publications', '/research/api/stats/publications/', 2, 40),
+    Endpoint('research.search', '/research/api/search/', 12, 650, params={'q': SEARCH_QUERY}),
+
+    # banner.urls
+    Endpoint('banners.list', '/api/banners/', 2, 30),
+]
+
+
+def scaled(name, scale):
+    return max(1, round(DATASET[name] * scale))
+
+
+def text(rng, size):
+    return ' '.join(rng.choice(WORDS) for _ in range(size))
+
+
+def seed_dataset(scale=1.0, seed=0):
+    """
+    Создает данные для замеров и возвращает идентификаторы объектов,
+    подставляемые в пути ENDPOINTS ({news}, {vacancy} и т.д.).
+    Сигналы при bulk_create не срабатывают, поэтому поисковый индекс
+    перестраивается, а версии таблиц (core.versions) обновляются в конце.
+    """
+    rng = random.Random(seed)
+    now = timezone.now()
+    today = now.date()
+
+    categories = {}
+    for name, label in NewsCategory.CATEGORY_CHOICES:
+        categories[name], _ = NewsCategory.objects.get_or_create(
+            name=name, defaults={'slug': name, 'name_ru': label, 'name_kg': label, 'name_en': name}
+        )
+
+    tags = NewsTag.objects.bulk_create([
+        NewsTag(name_ru=f'Тег {index}', name_kg=f'Тег {index}', name_en=f'Tag {index}', slug=f'perf-tag-{index}')
+        for index in range(scaled('tags', scale))
+    ])
+
+    news_count = scaled('news', scale)
+    events_count = scaled('events', scale)
+    announcements_count = scaled('announcements', scale)
+    for start in range(0, news_count, BATCH_SIZE):
+        batch = []
+        for index in range(start, min(start + BATCH_SIZE, news_count)):
+            if index < events_count:
+                category = categories[NewsCategory.EVENTS]
+            elif index < events_count + announcements_count:
+                category = categories[NewsCategory.ANNOUNCEMENTS]
+            else:
+                category = categories[NewsCategory.NEWS]
+            news = News(
+                title_ru=f'{text(rng, 5)} {index}', title_kg=text(rng, 5), title_en=f'News {index}',
+                slug=f'perf-news-{index}',
+                summary_ru=text(rng, 25), summary_kg=text(rng, 25), summary_en=text(rng, 25),
+                content_ru=text(rng, 400), content_kg=text(rng, 100), content_en=text(rng, 100),
+                category=category,
+                published_at=now - timedelta(hours=index),
+                is_featured=index % 50 == 0,
+                # Первое объявление закреплено при любом масштабе: иначе pinned объявлений пуст
+                is_pinned=index % 200 == 0 or index == events_count,
+                views_count=rng.randint(0, 5000),
+            )
+            news.update_text_metrics()
+            batch.append(news)
+        News.objects.bulk_create(batch)
+
+    news_ids = list(
+        News.objects.filter(slug__startswith='perf-news-').order_by('published_at').values_list('id', flat=True)
+    )
+    news_ids.reverse()
+    NewsTagRelation.objects.bulk_create([
+        NewsTagRelation(news_id=news_id, tag=tag)
+        for news_id in news_ids
+        for tag in rng.sample(tags, min(3, len(tags)))
+    ], batch_size=BATCH_SIZE)
+
+    # Просмотры за 30 дней для рейтинга популярных: уникальный IP на просмотр
+    NewsView.objects.bulk_create([
+        NewsView(
+            news_id=rng.choice(news_ids[:1000]),
+            ip_address=f'10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}',
+            viewed_at=now - timedelta(minutes=rng.randint(0, 30 * 24 * 60)),
+        )
+        for index in range(scaled('news_views', scale))
+    ], batch_size=BATCH_SIZE)
+
+    event_statuses = [status for status, _ in Event.EVENT_STATUS]
+    event_categories = [category for category, _ in Event.EVENT_CATEGORIES]
+    Event.objects.bulk_create([
+        Event(
+            news_id=news_id,
+            # Первые события приходятся на текущий месяц: this_month не пуст на малом масштабе
+            event_date=today + timedelta(days=(index + 60) % 120 - 60),
+            event_time=day_time(10 + index % 8),
+            location_ru='Бишкек', location_kg='Бишкек', location_en='Bishkek',
+            event_category=event_categories[index % len(event_categories)],
+            status=event_statuses[index % len(event_statuses)],
+        )
+        for index, news_id in enumerate(news_ids[:events_count])
+    ], batch_size=BATCH_SIZE)
+
+    announcement_types = [kind for kind, _ in Announcement.ANNOUNCEMENT_TYPES]
+    priorities = [priority for priority, _ in Announcement.PRIORITY_LEVELS]
+    Announcement.objects.bulk_create([
+        Announcement(
+            news_id=news_id,
+            announcement_type=announcement_types[index % len(announcement_types)],
+            priority=priorities[index % len(priorities)],
+            deadline=now + timedelta(days=index % 30),
+            is_deadline_approaching=index % 30 <= 7,
+            target_students=index % 3 != 0,
+        )
+        for index, news_id in enumerate(news_ids[events_count:events_count + announcements_count])
+    ], batch_size=BATCH_SIZE)
+
+    career_categories = []
+    for name, label in CareerCategory.CATEGORY_CHOICES:
+        category, _ = CareerCategory.objects.get_or_create(
+            name=name, defaults={'display_name_ru': label, 'display_name_kg': label, 'display_name_en': name}
+        )
+        career_categories.append(category)
+    departments = Department.objects.bulk_create([
+        Department(name_ru=f'Подразделение {index}', name_kg=f'Бөлүм {index}', name_en=f'Department {index}')
+        for index in range(10)
+    ])
+    Vacancy.objects.bulk_create([
+        Vacancy(
+            title_ru=f'{text(rng, 3)} {index}', title_kg=f'Вакансия {index}', title_en=f'Vacancy {index}',
+            slug=f'perf-vacancy-{index}',
+            category=career_categories[index % len(career_categories)],
+            department=departments[index % len(departments)],
+            short_description_ru=text(rng, 20), short_description_kg=text(rng, 20), short_description_en=text(rng, 20),
+            description_ru=text(rng, 150), description_kg=text(rng, 50), description_en=text(rng, 50),
+            responsibilities_ru=text(rng, 40), responsibilities_kg=text(rng, 20), responsibilities_en=text(rng, 20),
+            requirements_ru=text(rng, 40), requirements_kg=text(rng, 20), requirements_en=text(rng, 20),
+            status='published' if index % 10 else 'closed',
+            is_featured=index % 25 == 0,
+            deadline=today + timedelta(days=index % 60 - 10),
+        )
+        for index in range(scaled('vacancies', scale))
+    ], batch_size=BATCH_SIZE)
+    vacancy = Vacancy.objects.filter(slug__startswith='perf-vacancy-', status='published').first()
+    applications = VacancyApplication.objects.bulk_create([
+        VacancyApplication(
+            vacancy=vacancy, first_name='Имя', last_name=f'Фамилия {index}',
+            email=f'applicant-{index}@example.com', phone='+996555000000',
+            cover_letter=text(rng, 50), resume='careers/resumes/perf.pdf',
+        )
+        for index in range(scaled('vacancy_applications', scale))
+    ])
+
+    areas = ResearchArea.objects.bulk_create([
+        ResearchArea(
+            title_ru=f'Область {index}', title_en=f'Area {index}', title_kg=f'Тармак {index}',
+            description_ru=text(rng, 30), description_en=text(rng, 30), description_kg=text(rng, 30),
+        )
+        for index in range(scaled('areas', scale))
+    ])
+    centers = ResearchCenter.objects.bulk_create([
+        ResearchCenter(
+            name_ru=f'Центр {index}', name_en=f'Center {index}', name_kg=f'Борбор {index}',
+            description_ru=text(rng, 30), description_en=text(rng, 30), description_kg=text(rng, 30),
+            director_ru='Директор', director_en='Director', director_kg='Директор',
+            established_year=1990 + index,
+        )
+        for index in range(scaled('centers', scale))
+    ])
+
+    grant_categories = [category for category, _ in Grant.CATEGORY_CHOICES]
+    grant_statuses = [status for status, _ in Grant.STATUS_CHOICES]
+    grants = Grant.objects.bulk_create([
+        Grant(
+            title_ru=f'{text(rng, 4)} {index}', title_en=f'Grant {index}', title_kg=f'Грант {index}',
+            organization_ru='Фонд', organization_en='Fund', organization_kg='Фонд',
+            # Первый активный грант с дедлайном через 5 дней попадает в deadline_soon
+            amount='100000', deadline=today + timedelta(days=(index + 20) % 90 - 15),
+            category=grant_categories[index % len(grant_categories)],
+            status=grant_statuses[index % len(grant_statuses)],
+            duration_ru='1 год', duration_en='1 year', duration_kg='1 жыл',
+            requirements_ru=text(rng, 30), requirements_en=text(rng, 30), requirements_kg=text(rng, 30),
+            description_ru=text(rng, 80), description_en=text(rng, 80), description_kg=text(rng, 80),
+            contact='grant@example.com', website='https://example.com',
+            is_active=index % 10 != 9,
+        )
+        for index in range(scaled('grants', scale))
+    ], batch_size=BATCH_SIZE)
+    GrantApplication.objects.bulk_create([
+        GrantApplication(
+            grant=grants[index % len(grants)], project_title=f'Проект {index}',
+            principal_investigator='Руководитель', email=f'pi-{index}@example.com',
+            department='Кафедра', project_description=text(rng, 60),
+            budget=1000 * (index + 1), timeline=12, expected_results=text(rng, 20),
+        )
+        for index in range(scaled('grant_applications', scale))
+    ], batch_size=BATCH_SIZE)
+
+    conference_statuses = [status for status, _ in Conference.STATUS_CHOICES]
+    conferences = []
+    for index in range(scaled('conferences', scale)):
+        # Отсчет от будущих дат: первая конференция с открытой регистрацией
+        # попадает в upcoming и registration_open даже на малом масштабе
+        start_date = today + timedelta(days=120 - index % 240)
+        conferences.append(Conference(
+            title_ru=f'{text(rng, 4)} {index}', title_en=f'Conference {index}', title_kg=f'Конференция {index}',
+            start_date=start_date, end_date=start_date + timedelta(days=2),
+            location_ru='Бишкек', location_en='Bishkek', location_kg='Бишкек',
+            deadline=start_date - timedelta(days=14), website='https://example.com',
+            description_ru=text(rng, 60), description_en=text(rng, 60), description_kg=text(rng, 60),
+            status=conference_statuses[index % len(conference_statuses)],
+        ))
+    conferences = Conference.objects.bulk_create(conferences, batch_size=BATCH_SIZE)
+
+    publication_types = [kind for kind, _ in Publication.PUBLICATION_TYPE_CHOICES]
+    publications = Publication.objects.bulk_create([
+        Publication(
+            title_ru=f'{text(rng, 6)} {index}', title_en=f'Publication {index}', title_kg=f'Басылма {index}',
+            authors_ru='Иванов И.', authors_en='Ivanov I.', authors_kg='Иванов И.',
+            journal='Вестник', publication_date=today - timedelta(days=index % 2000),
+            publication_type=publication_types[index % len(publication_types)],
+            citations_count=rng.randint(0, 200),
+            abstract_ru=text(rng, 80), abstract_en=text(rng, 80), abstract_kg=text(rng, 40),
+            research_area=areas[index % len(areas)],
+            research_center=centers[index % len(centers)],
+            is_featured=index % 40 == 0,
+        )
+        for index in range(scaled('publications', scale))
+    ], batch_size=BATCH_SIZE)
+
+    Banner.objects.bulk_create([
+        Banner(
+            image=f'banners/perf-{index}.jpg', order=index,
+            title_ru=f'Баннер {index}', title_kg=f'Баннер {index}', title_en=f'Banner {index}',
+            subtitle_ru='Подзаголовок', subtitle_kg='Подзаголовок', subtitle_en='Subtitle',
+        )
+        for index in range(scaled('banners', scale))
+    ])
+
+    search.rebuild_index()
+    related.rebuild_related_news()
+    trending.rebuild_trending(now)
+    versions.bump_versions(versions.get_tracked_models())
+
+    return {
+        'news': 'perf-news-0',
+        'news_category': NewsCategory.NEWS,
+        'tag': tags[0].slug,
+        'event': News.objects.get(pk=news_ids[0]).slug,
+        'announcement': News.objects.get(pk=news_ids[events_count]).slug,
+        'vacancy': vacancy.slug,
+        'vacancy_id': vacancy.pk,
+        'vacancy_application': applications[0].pk,
+        'area': areas[0].pk,
+        'center': centers[0].pk,
+        'grant': grants[0].pk,
+        'conference': conferences[0].pk,
+        'publication': publications[0].pk,
+    }
+
+
+def dataset_counts():
+    models = {
+        'news': News, 'events': Event, 'announcements': Announcement, 'tags': NewsTag, 'news_views': NewsView,
+        'vacancies': Vacancy, 'vacancy_applications': VacancyApplication,
+        'publications': Publication, 'grants': Grant, 'grant_applications': GrantApplication,
+        'conferences': Conference, 'areas': ResearchArea, 'centers': ResearchCenter, 'banners': Banner,
+    }
+    return {name: model.objects.count() for name, model in models.items()}
+
+
+def iter_routes(patterns, prefix=''):
+    """Маршруты (строка шаблона, view) без вариантов с суффиксом формата"""
+    for pattern in patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern.url_patterns, route)
+        elif isinstance(pattern, URLPattern) and 'format' not in pattern.pattern.regex.groupindex:
+            yield route, pattern.callback
+
+
+def budgeted_routes():
+    routes = []
+    for pattern in get_resolver().url_patterns:
+        module = getattr(pattern, 'urlconf_name', None)
+        if getattr(module, '__name__', module) in BUDGETED_URLCONFS:
+            routes.extend(iter_routes(pattern.url_patterns, str(pattern.pattern)))
+    return routes
+
+
+def uncovered_routes(endpoints, dataset):
+    """Маршруты BUDGETED_URLCONFS, к которым нет ни одного запроса в endpoints"""
+    covered = {resolve(endpoint.get_path(dataset)).func for endpoint in endpoints}
+    return sorted(route for route, callback in budgeted_routes() if callback not in covered)
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(len(ordered) * percent / 100) - 1)]
+
+
+def fill(value, dataset):
+    if isinstance(value, str):
+        return value.format(**dataset)
+    return value
+
+
+def measure(endpoint, dataset, repeat, user=None):
+    """Запросы на холодном кэше и время ответа по repeat повторам"""
+    client = APIClient()
+    if endpoint.auth:
+        client.force_authenticate(user)
+    path = endpoint.get_path(dataset)
+    params = endpoint.get_params(dataset)
+    calls = iter(range(repeat + 1))
+
+    def request():
+        if endpoint.method == 'post':
+            data = {key: fill(value, dataset) for key, value in endpoint.data(next(calls)).items()}
+            return client.post(path, data, format='multipart')
+        return client.get(path, params)
+
+    cache.clear()
+    # Мусор от генерации данных и прошлых маршрутов собирается заранее:
+    # иначе пауза сборщика попадает в замеры случайного маршрута и завышает p95
+    gc.collect()
+    # При DEBUG журнал запросов ограничен 9000 записями: заполненный журнал
+    # не растет, и CaptureQueriesContext насчитал бы ноль
+    reset_queries()
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        response = request()
+        cold_ms = (time.perf_counter() - started) * 1000
+    # Следующий запрос очистит журнал (сигнал request_started), считаем сразу
+    query_count = len(queries)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        request()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    return {
+        'path': path,
+        'method': endpoint.method.upper(),
+        'status': response.status_code,
+        'queries': query_count,
+        'max_queries': endpoint.max_queries,
+        'cold_ms': round(cold_ms, 2),
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'budget_p95_ms': endpoint.p95_ms,
+    }
+
+
+def check(endpoint, result, check_latency=True):
+    failures = []
+    if result['status'] != endpoint.status:
+        failures.append(f'{endpoint.name}: статус {result["status"]}, ожидался {endpoint.status}')
+    if result['queries'] > endpoint.max_queries:
+        failures.append(f'{endpoint.name}: {result["queries"]} SQL-запросов при потолке {endpoint.max_queries}')
+    if check_latency and result['p95_ms'] > endpoint.p95_ms:
+        failures.append(f'{endpoint.name}: p95 {result["p95_ms"]} мс при бюджете {endpoint.p95_ms} мс')
+    return failures
+
+
+def run_budgets(dataset, endpoints=ENDPOINTS, repeat=20, check_latency=True):
+    """Прогоняет endpoints и возвращает отчет с результатами и нарушениями бюджетов"""
+    # Загруженные при замерах файлы (резюме) не должны попадать в MEDIA_ROOT
+    storages = {**settings.STORAGES, 'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'}}
+    with override_settings(STORAGES=storages):
+        return _run_budgets(dataset, endpoints, repeat, check_latency)
+
+
+def _run_budgets(dataset, endpoints, repeat, check_latency):
+    user, _ = User.objects.get_or_create(username='perf-budget', defaults={'is_staff': True})
+    report = {
+        'database': connection.vendor,
+        'dataset': dataset_counts(),
+        'repeat': repeat,
+        'endpoints': {},
+        'failures': [],
+        'uncovered_routes': uncovered_routes(endpoints, dataset),
+    }
+    for route in report['uncovered_routes']:
+        report['failures'].append(f'маршрут без бюджета: {route}')
+    for endpoint in endpoints:
+        result = measure(endpoint, dataset, repeat, user)
+        result['failures'] = check(endpoint, result, check_latency)
+        report['endpoints'][endpoint.name] = result
+        report['failures'].extend(result['failures'])
+    return report
+
+
+def compare_reports(baseline, report):
+    """Строки с изменениями числа запросов и p95 относительно прошлого отчета"""
+    lines = []
+    for name, result in sorted(report['endpoints'].items()):
+        previous = baseline.get('endpoints', {}).get(name)
+        if previous is None:
+            lines.append(f'{name}: новый маршрут')
+            continue
+        query_delta = result['queries'] - previous['queries']
+        p95_delta = result['p95_ms'] - previous['p95_ms']
+        lines.append(
+            f'{name}: запросов {previous["queries"]} -> {result["queries"]} ({query_delta:+d}), '
+            f'p95 {previous["p95_ms"]} -> {result["p95_ms"]} мс ({p95_delta:+.2f})'
+        )
+    return lines
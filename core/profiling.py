@@ -0,0 +1,310 @@
+"""
+Профилирование запросов: SQL, сериализация и размер ответа по каждому view.
+
+ProfilingMiddleware включается настройкой REQUEST_PROFILING. Для каждого
+запроса она считает число и суммарное время SQL-запросов (execute_wrapper на
+всех соединениях), время сериализации DRF (свойство serializer.data без SQL,
+выполненного внутри) и размер ответа. Значения отдаются клиенту заголовком
+Server-Timing и копятся в гистограммах процесса (ProfileStore) по имени view.
+
+Повторяющиеся в одном запросе SQL-шаблоны (форма N+1) записываются отдельно.
+Процесс периодически публикует свою статистику в таблицу ProfileSnapshot,
+откуда ее собирает команда profile_report. Кэш для этого не подходит:
+локальный кэш у каждого процесса свой, и команда не увидела бы снимки
+процессов сервера.
+"""
+import contextvars
+import os
+import re
+import socket
+import threading
+import time
+from contextlib import ExitStack
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils import timezone
+from rest_framework.serializers import BaseSerializer
+
+from .models import ProfileSnapshot
+
+# Снимки процессов, не публиковавшихся дольше этого срока, не учитываются
+SNAPSHOT_TIMEOUT = 60 * 60 * 24
+
+# Верхние границы корзин гистограммы времени ответа, мс (последняя корзина - все, что выше)
+HISTOGRAM_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_current = contextvars.ContextVar('request_profile', default=None)
+_serializer_timing_installed = False
+
+IN_LIST = re.compile(r'\bIN \((?:%s, )*%s\)')
+
+
+def is_profiling_enabled():
+    return getattr(settings, 'REQUEST_PROFILING', False)
+
+
+def get_repeat_threshold():
+    return getattr(settings, 'REQUEST_PROFILING_REPEAT_THRESHOLD', 5)
+
+
+def normalize_sql(sql):
+    """Шаблон запроса: списки IN разной длины сводятся к одному виду"""
+    return IN_LIST.sub('IN (%s, ...)', sql)
+
+
+class RequestProfile:
+    """Замеры одного запроса"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.view = None
+        self.total_ms = 0.0
+        self.db_queries = 0
+        self.db_ms = 0.0
+        self.serializer_ms = 0.0
+        self.serializer_depth = 0
+        self.serializer_db_ms = 0.0
+        self.response_size = None
+        self.statements = {}
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - started) * 1000
+            self.db_queries += 1
+            self.db_ms += duration
+            if self.serializer_depth:
+                self.serializer_db_ms += duration
+            template = normalize_sql(sql)
+            count, total = self.statements.get(template, (0, 0.0))
+            self.statements[template] = (count + 1, total + duration)
+
+    def finish(self, response):
+        self.total_ms = (time.perf_counter() - self.started) * 1000
+        if not response.streaming:
+            self.response_size = len(response.content)
+
+    @property
+    def serializer_own_ms(self):
+        """Время сериализации без SQL, выполненного внутри нее (ленивые queryset)"""
+        return max(0.0, self.serializer_ms - self.serializer_db_ms)
+
+    def repeated_statements(self, threshold):
+        return {
+            sql: (count, total)
+            for sql, (count, total) in self.statements.items()
+            if count >= threshold
+        }
+
+    def server_timing(self):
+        metrics = [
+            f'db;dur={self.db_ms:.2f};desc="{self.db_queries} SQL"',
+            f'serializer;dur={self.serializer_own_ms:.2f}',
+            f'total;dur={self.total_ms:.2f}',
+        ]
+        if self.response_size is not None:
+            metrics.append(f'size;desc="{self.response_size} B"')
+        return ', '.join(metrics)
+
+
+def install_serializer_timing():
+    """
+    Оборачивает BaseSerializer.data замером времени. Учитывается только внешний
+    вызов: вложенный .data (например, в SerializerMethodField) входит в него.
+    """
+    global _serializer_timing_installed
+    if _serializer_timing_installed:
+        return
+    original = BaseSerializer.data.fget
+
+    def timed_data(self):
+        profile = _current.get()
+        if profile is None or profile.serializer_depth:
+            return original(self)
+        profile.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return original(self)
+        finally:
+            profile.serializer_depth -= 1
+            profile.serializer_ms += (time.perf_counter() - started) * 1000
+
+    BaseSerializer.data = property(timed_data)
+    _serializer_timing_installed = True
+
+
+def get_view_name(view_func, request):
+    """Имя view для агрегации: модуль.класс[.действие ViewSet]"""
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    if view_class is None:
+        return f'{view_func.__module__}.{view_func.__name__}'
+    name = f'{view_class.__module__}.{view_class.__name__}'
+    actions = getattr(view_func, 'actions', None)
+    if actions and request.method.lower() in actions:
+        name = f'{name}.{actions[request.method.lower()]}'
+    return name
+
+
+def empty_view_stats():
+    return {
+        'requests': 0,
+        'total_ms': 0.0,
+        'max_ms': 0.0,
+        'histogram': [0] * (len(HISTOGRAM_BUCKETS) + 1),
+        'db_queries': 0,
+        'db_ms': 0.0,
+        'serializer_ms': 0.0,
+        'response_bytes': 0,
+    }
+
+
+class ProfileStore:
+    """Агрегированная статистика процесса по view и повторяющимся SQL"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.views = {}
+            self.repeated = {}
+            self.published = time.monotonic()
+
+    def add(self, profile):
+        bucket = len(HISTOGRAM_BUCKETS)
+        for index, bound in enumerate(HISTOGRAM_BUCKETS):
+            if profile.total_ms <= bound:
+                bucket = index
+                break
+
+        with self.lock:
+            stats = self.views.setdefault(profile.view, empty_view_stats())
+            stats['requests'] += 1
+            stats['total_ms'] += profile.total_ms
+            stats['max_ms'] = max(stats['max_ms'], profile.total_ms)
+            stats['histogram'][bucket] += 1
+            stats['db_queries'] += profile.db_queries
+            stats['db_ms'] += profile.db_ms
+            stats['serializer_ms'] += profile.serializer_own_ms
+            stats['response_bytes'] += profile.response_size or 0
+
+            for sql, (count, duration) in profile.repeated_statements(get_repeat_threshold()).items():
+                key = (profile.view, sql)
+                repeated = self.repeated.setdefault(
+                    key, {'view': profile.view, 'sql': sql, 'requests': 0, 'max_repeats': 0, 'total_ms': 0.0}
+                )
+                repeated['requests'] += 1
+                repeated['max_repeats'] = max(repeated['max_repeats'], count)
+                repeated['total_ms'] += duration
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'views': {name: {**stats, 'histogram': list(stats['histogram'])} for name, stats in self.views.items()},
+                'repeated': [dict(item) for item in self.repeated.values()],
+            }
+
+    def publish(self, force=False):
+        """Сохраняет статистику процесса в БД (не чаще REQUEST_PROFILING_PUBLISH_INTERVAL)"""
+        interval = getattr(settings, 'REQUEST_PROFILING_PUBLISH_INTERVAL', 10)
+        now = time.monotonic()
+        if not force and now - self.published < interval:
+            return
+        self.published = now
+        ProfileSnapshot.objects.update_or_create(process=process_key(), defaults={'data': self.snapshot()})
+
+
+store = ProfileStore()
+
+
+def process_key():
+    # PID уникален только в пределах хоста, а таблицу могут делить несколько серверов
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def collect_snapshots():
+    """Статистика всех процессов, опубликованная в БД, и текущего процесса"""
+    # Текущий процесс берется из памяти, его снимок в БД может отставать
+    fresh_since = timezone.now() - timedelta(seconds=SNAPSHOT_TIMEOUT)
+    snapshots = list(
+        ProfileSnapshot.objects.filter(updated_at__gte=fresh_since)
+        .exclude(process=process_key()).values_list('data', flat=True)
+    )
+    snapshots.append(store.snapshot())
+    return merge_snapshots(snapshots)
+
+
+def merge_snapshots(snapshots):
+    views, repeated = {}, {}
+    for snapshot in snapshots:
+        for name, stats in snapshot['views'].items():
+            merged = views.setdefault(name, empty_view_stats())
+            for field in ('requests', 'total_ms', 'db_queries', 'db_ms', 'serializer_ms', 'response_bytes'):
+                merged[field] += stats[field]
+            merged['max_ms'] = max(merged['max_ms'], stats['max_ms'])
+            merged['histogram'] = [a + b for a, b in zip(merged['histogram'], stats['histogram'])]
+        for item in snapshot['repeated']:
+            merged = repeated.setdefault(
+                (item['view'], item['sql']), {**item, 'requests': 0, 'max_repeats': 0, 'total_ms': 0.0}
+            )
+            merged['requests'] += item['requests']
+            merged['max_repeats'] = max(merged['max_repeats'], item['max_repeats'])
+            merged['total_ms'] += item['total_ms']
+    return {'views': views, 'repeated': list(repeated.values())}
+
+
+def clear_snapshots():
+    ProfileSnapshot.objects.all().delete()
+    store.reset()
+
+
+def histogram_percentile(histogram, percent):
+    """Верхняя граница корзины, в которую попадает перцентиль (None - выше последней)"""
+    total = sum(histogram)
+    if not total:
+        return 0
+    threshold = total * percent / 100
+    seen = 0
+    for index, count in enumerate(histogram):
+        seen += count
+        if seen >= threshold:
+            return HISTOGRAM_BUCKETS[index] if index < len(HISTOGRAM_BUCKETS) else None
+    return None
+
+
+class ProfilingMiddleware:
+    """Замеры запроса и заголовок Server-Timing; включается REQUEST_PROFILING = True"""
+
+    def __init__(self, get_response):
+        if not is_profiling_enabled():
+            raise MiddlewareNotUsed
+        install_serializer_timing()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        request.profile = profile
+        token = _current.set(profile)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile.record_query))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+
+        profile.finish(response)
+        response['Server-Timing'] = profile.server_timing()
+        if profile.view is not None:
+            store.add(profile)
+            store.publish()
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.profile.view = get_view_name(view_func, request)
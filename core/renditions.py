@@ -0,0 +1,234 @@
+"""
+Адаптивные варианты изображений (renditions).
+
+Загруженные изображения баннеров, новостей, исследовательских центров и
+конференций отдаются в исходном размере, а мобильным клиентам и превью в
+админке достаточно уменьшенных копий. После сохранения объекта с новым
+изображением в очередь ставится фоновая задача (core.tasks), и воркер
+строит варианты в форматах
+RENDITION_FORMATS шириной RENDITION_WIDTHS (только меньше исходной, без
+увеличения) и кладет их рядом с оригиналом: banners/a.jpg ->
+banners/a.640w.webp. Форматы, которые не поддерживает установленный
+Pillow, пропускаются.
+
+Карта вариантов хранится в JSON-поле модели <поле>_renditions:
+{'source': 'banners/a.jpg', 'formats': {'webp': [[320, 'banners/a.320w.webp'], ...]}}.
+Сериализаторы читают ее из уже загруженной строки (ImageSrcsetField) и
+отдают строки srcset по форматам, без дополнительных запросов. Пока
+варианты не построены, карта пуста и клиент использует оригинал.
+
+Для уже загруженных изображений варианты строит команда
+generate_image_renditions.
+"""
+import io
+import logging
+import os
+
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models.signals import post_delete, post_save
+from PIL import Image, ImageOps, features
+from rest_framework import serializers
+
+from .tasks import task
+
+logger = logging.getLogger(__name__)
+
+RENDITION_WIDTHS = (320, 640, 1024, 1600)
+# Формат: параметры сохранения Pillow; порядок - от более сжатого
+RENDITION_FORMATS = {
+    'avif': {'quality': 50},
+    'webp': {'quality': 80, 'method': 4},
+}
+# Модель -> поле изображения; карта вариантов - в поле <поле>_renditions
+RENDITION_MODELS = {
+    'banner.banner': 'image',
+    'news.news': 'image',
+    'research.researchcenter': 'image',
+    'research.conference': 'image',
+}
+
+
+def get_map_field(field_name):
+    return f'{field_name}_renditions'
+
+
+def get_formats():
+    """Форматы, которые умеет записывать установленный Pillow"""
+    return [name for name in RENDITION_FORMATS if features.check(name)]
+
+
+def rendition_name(source, width, image_format):
+    root, _ = os.path.splitext(source)
+    return f'{root}.{width}w.{image_format}'
+
+
+def rendition_names(renditions):
+    return [name for variants in (renditions or {}).get('formats', {}).values() for _, name in variants]
+
+
+def _prepare(image):
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ('RGB', 'RGBA'):
+        return image
+    has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+    return image.convert('RGBA' if has_alpha else 'RGB')
+
+
+def build_renditions(file):
+    """Строит и сохраняет варианты файла изображения; возвращает карту вариантов"""
+    storage = file.storage
+    with file.open('rb'):
+        image = _prepare(Image.open(file))
+        image.load()
+
+    formats = {}
+    for image_format in get_formats():
+        variants = []
+        for width in RENDITION_WIDTHS:
+            if width >= image.width:
+                break
+            height = max(1, round(image.height * width / image.width))
+            buffer = io.BytesIO()
+            image.resize((width, height), Image.LANCZOS).save(
+                buffer, image_format.upper(), **RENDITION_FORMATS[image_format]
+            )
+            name = rendition_name(file.name, width, image_format)
+            if storage.exists(name):
+                storage.delete(name)
+            variants.append([width, storage.save(name, ContentFile(buffer.getvalue()))])
+        if variants:
+            formats[image_format] = variants
+    return {'source': file.name, 'formats': formats}
+
+
+def delete_renditions(storage, names):
+    for name in names:
+        if storage.exists(name):
+            storage.delete(name)
+
+
+@task()
+def delete_rendition_files(names):
+    """Задача: удаление вариантов удаленного объекта"""
+    delete_renditions(default_storage, names)
+
+
+def needs_renditions(instance, field_name):
+    source = getattr(instance, field_name).name or ''
+    return source != (getattr(instance, get_map_field(field_name)) or {}).get('source', '')
+
+
+def update_renditions(instance, field_name='image'):
+    """
+    Пересобирает варианты изображения объекта и сохраняет карту
+    (save(update_fields=...) - сигналы сбрасывают кэши ответов).
+    """
+    file = getattr(instance, field_name)
+    map_field = get_map_field(field_name)
+    old = getattr(instance, map_field) or {}
+
+    if not file:
+        renditions = {}
+    elif not file.storage.exists(file.name):
+        logger.info('Нет файла %s для вариантов изображения', file.name)
+        return False
+    else:
+        renditions = build_renditions(file)
+
+    stale = set(rendition_names(old)) - set(rendition_names(renditions))
+    delete_renditions(file.storage, stale)
+    setattr(instance, map_field, renditions)
+    instance.save(update_fields=[map_field])
+    return True
+
+
+@task()
+def generate_renditions(label, pk):
+    """Задача: варианты изображения объекта label/pk (повторный запуск безопасен)"""
+    model = apps.get_model(label)
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return False
+    field_name = RENDITION_MODELS[model._meta.label_lower]
+    if not needs_renditions(instance, field_name):
+        return False
+    return update_renditions(instance, field_name)
+
+
+def generate_missing(labels=None, force=False):
+    """Синхронно строит недостающие варианты: {label: число объектов}"""
+    counts = {}
+    for label in labels or RENDITION_MODELS:
+        model = apps.get_model(label)
+        field_name = RENDITION_MODELS[label]
+        counts[label] = 0
+        for instance in model.objects.exclude(**{field_name: ''}).exclude(**{f'{field_name}__isnull': True}).iterator():
+            if (force or needs_renditions(instance, field_name)) and update_renditions(instance, field_name):
+                counts[label] += 1
+    return counts
+
+
+def _schedule_renditions(sender, instance, raw=False, update_fields=None, **kwargs):
+    field_name = RENDITION_MODELS[sender._meta.label_lower]
+    if raw or (update_fields is not None and field_name not in update_fields):
+        return
+    if needs_renditions(instance, field_name):
+        generate_renditions.enqueue(sender._meta.label_lower, instance.pk)
+
+
+def _schedule_cleanup(sender, instance, **kwargs):
+    field_name = RENDITION_MODELS[sender._meta.label_lower]
+    names = rendition_names(getattr(instance, get_map_field(field_name)))
+    if names:
+        delete_rendition_files.enqueue(names)
+
+
+def track_models():
+    """Подписывает модели RENDITION_MODELS на построение и удаление вариантов"""
+    for label in RENDITION_MODELS:
+        model = apps.get_model(label)
+        uid = f'renditions:{label}'
+        post_save.connect(_schedule_renditions, sender=model, dispatch_uid=uid)
+        post_delete.connect(_schedule_cleanup, sender=model, dispatch_uid=uid)
+
+
+def srcset(renditions, build_url=None):
+    """{формат: 'url 320w, url 640w'} по карте вариантов; build_url делает URL абсолютным"""
+    if not renditions:
+        return {}
+    result = {}
+    for image_format, variants in renditions.get('formats', {}).items():
+        urls = [(default_storage.url(name), width) for width, name in variants]
+        if build_url is not None:
+            urls = [(build_url(url), width) for url, width in urls]
+        result[image_format] = ', '.join(f'{url} {width}w' for url, width in urls)
+    return result
+
+
+def thumbnail_url(renditions, max_width=RENDITION_WIDTHS[0]):
+    """URL наименьшего варианта не шире max_width (превью в админке) или None"""
+    for image_format in reversed(list(RENDITION_FORMATS)):
+        variants = (renditions or {}).get('formats', {}).get(image_format)
+        if variants and variants[0][0] <= max_width:
+            return default_storage.url(variants[0][1])
+    return None
+
+
+class ImageSrcsetField(serializers.Field):
+    """
+    srcset вариантов изображения по форматам (только чтение).
+    source - поле карты вариантов, например source='image_renditions';
+    absolute=True - URL с хостом запроса, как у ImageField сериализатора.
+    """
+
+    def __init__(self, absolute=False, **kwargs):
+        kwargs['read_only'] = True
+        self.absolute = absolute
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        request = self.context.get('request')
+        build_url = request.build_absolute_uri if self.absolute and request is not None else None
+        return srcset(value, build_url)
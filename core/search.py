@@ -0,0 +1,432 @@
+"""
+Полнотекстовый поиск по контенту всех приложений.
+
+Каждое приложение описывает свои индексируемые модели подклассами SearchIndex
+и регистрирует их через register(). Документы хранятся в core.SearchEntry
+(по одному на объект, текст по языкам ru/kg/en) и обновляются по сигналам
+post_save/post_delete; массовые изменения через queryset.update выполняются
+функцией update_indexed. Поиск выполняется средствами БД: FTS5 в SQLite,
+tsvector/GIN в PostgreSQL; на остальных бэкендах используется LIKE.
+"""
+import base64
+import binascii
+import json
+import re
+from dataclasses import dataclass
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection, transaction
+from django.db.models.signals import post_save, post_delete
+from django.utils.html import strip_tags
+
+from .models import SearchEntry
+
+LANGUAGES = ('ru', 'kg', 'en')
+
+# Конфигурации PostgreSQL по языкам (см. миграцию core.0002)
+POSTGRES_CONFIGS = {'ru': 'russian', 'kg': 'simple', 'en': 'english'}
+
+# Вес заголовка относительно текста при ранжировании
+TITLE_WEIGHT = 10.0
+BODY_WEIGHT = 1.0
+# Множитель веса совпадений на языке пользователя
+LANGUAGE_BOOST = 2.0
+
+# Посимвольная нормализация текста по языкам. Кыргызские буквы сводятся к
+# русским, т.к. без кыргызской раскладки их набирают как н/о/у.
+LANGUAGE_FOLDING = {
+    'ru': str.maketrans('ёЁ', 'еЕ'),
+    'kg': str.maketrans('ёЁңҢөӨүҮ', 'еЕнНоОуУ'),
+    'en': {},
+}
+QUERY_FOLDING = str.maketrans('ёЁңҢөӨүҮ', 'еЕнНоОуУ')
+
+MAX_QUERY_TERMS = 10
+
+registry = {}
+
+
+class SearchIndex:
+    """Описание индексируемой модели"""
+    model = None
+    # Уникальное имя типа контента в индексе, например 'news.news'
+    label = None
+
+    def get_queryset(self):
+        return self.model._default_manager.all()
+
+    def get_title(self, obj, language):
+        raise NotImplementedError
+
+    def get_body(self, obj, language):
+        return ''
+
+    def is_public(self, obj):
+        return True
+
+    def get_published_at(self, obj):
+        return None
+
+    def get_related_objects(self, obj):
+        """Объекты, документы которых зависят от obj и должны переиндексироваться"""
+        return []
+
+    @property
+    def verbose_name(self):
+        return str(self.model._meta.verbose_name_plural)
+
+    def get_result_queryset(self):
+        """Queryset для загрузки найденных объектов при выдаче результатов"""
+        return self.get_queryset()
+
+    def serialize(self, obj, language):
+        """Краткое представление объекта в общей выдаче"""
+        return {'title': self.get_title(obj, language) or self.get_title(obj, 'ru')}
+
+    def build_entry(self, obj):
+        entry = SearchEntry(
+            content_type=self.label,
+            object_id=obj.pk,
+            is_public=self.is_public(obj),
+            published_at=self.get_published_at(obj),
+        )
+        for language in LANGUAGES:
+            setattr(entry, f'title_{language}', normalize_text(self.get_title(obj, language), language))
+            setattr(entry, f'body_{language}', normalize_text(self.get_body(obj, language), language))
+        return entry
+
+
+def register(index_class):
+    """Регистрирует индекс и подписывает его на сигналы модели"""
+    index = index_class()
+    registry[index.label] = index
+    post_save.connect(_handle_save, sender=index.model, dispatch_uid=f'search:save:{index.label}')
+    post_delete.connect(_handle_delete, sender=index.model, dispatch_uid=f'search:delete:{index.label}')
+    return index_class
+
+
+def get_index(model):
+    for index in registry.values():
+        if index.model is model:
+            return index
+    return None
+
+
+def _handle_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    index_object(instance)
+
+
+def _handle_delete(sender, instance, **kwargs):
+    remove_object(instance)
+
+
+def normalize_text(value, language):
+    """Текст для индекса: без HTML, с нормализацией букв языка"""
+    return strip_tags(_join_text(value)).translate(LANGUAGE_FOLDING[language])
+
+
+def _join_text(value):
+    """Строка из значения поля; списки (в т.ч. JSON-поля) склеиваются через пробел"""
+    if not value:
+        return ''
+    if isinstance(value, (list, tuple)):
+        return ' '.join(_join_text(item) for item in value)
+    return str(value)
+
+
+def fold_query(query):
+    """Запрос нормализуется для всех языков сразу: язык ввода неизвестен"""
+    return strip_tags(query or '').translate(QUERY_FOLDING)
+
+
+def index_object(obj):
+    """Обновляет документ объекта и зависимых от него объектов"""
+    index = get_index(type(obj))
+    if index is None:
+        return
+    entry = index.build_entry(obj)
+    values = {
+        name: getattr(entry, name)
+        for name in ['is_public', 'published_at'] + [
+            f'{kind}_{language}' for kind in ('title', 'body') for language in LANGUAGES
+        ]
+    }
+    SearchEntry.objects.update_or_create(
+        content_type=index.label, object_id=obj.pk, defaults=values
+    )
+    for related in index.get_related_objects(obj):
+        index_object(related)
+
+
+def index_objects(model, pks):
+    """Переиндексирует объекты модели по первичным ключам (изменения без сигналов)"""
+    index = get_index(model)
+    if index is None:
+        return
+    for obj in index.get_queryset().filter(pk__in=pks):
+        index_object(obj)
+
+
+def update_indexed(queryset, **values):
+    """
+    queryset.update(**values) с обновлением документов измененных объектов:
+    update() не отправляет post_save, и без этого индекс отстает от данных
+    (например, снятые с публикации новости остаются в поиске).
+    """
+    pks = list(queryset.values_list('pk', flat=True))
+    updated = queryset.model._default_manager.filter(pk__in=pks).update(**values)
+    index_objects(queryset.model, pks)
+    return updated
+
+
+def remove_object(obj):
+    index = get_index(type(obj))
+    if index is not None:
+        SearchEntry.objects.filter(content_type=index.label, object_id=obj.pk).delete()
+
+
+def rebuild_index(labels=None, batch_size=1000):
+    """Полностью перестраивает документы указанных типов; возвращает {тип: количество}"""
+    counts = {}
+    for label in labels or list(registry):
+        index = registry[label]
+        created = 0
+        with transaction.atomic():
+            SearchEntry.objects.filter(content_type=label).delete()
+            batch = []
+            for obj in index.get_queryset().iterator(chunk_size=batch_size):
+                batch.append(index.build_entry(obj))
+                if len(batch) >= batch_size:
+                    SearchEntry.objects.bulk_create(batch)
+                    created += len(batch)
+                    batch = []
+            if batch:
+                SearchEntry.objects.bulk_create(batch)
+                created += len(batch)
+        counts[label] = created
+    return counts
+
+
+def related_or_none(obj, attribute):
+    """Обратная OneToOne-связь или None, если объекта нет"""
+    try:
+        return getattr(obj, attribute)
+    except ObjectDoesNotExist:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Выполнение запросов
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SearchHit:
+    content_type: str
+    object_id: int
+    score: float
+    entry_id: int
+
+
+@dataclass
+class MatchClause:
+    """Части SQL-запроса поиска для текущего бэкенда"""
+    from_where: str
+    params: list
+    rank: str
+    rank_params: list
+
+
+def tokenize_query(query):
+    """Термы запроса в нижнем регистре, без служебных символов"""
+    terms = re.findall(r'\w+', fold_query(query).lower())
+    return terms[:MAX_QUERY_TERMS]
+
+
+def _columns(languages):
+    return [f'{kind}_{language}' for kind in ('title', 'body') for language in languages]
+
+
+def _sqlite_match(terms, languages):
+    expression = ' '.join(f'"{term}"*' for term in terms)
+    if tuple(languages) == LANGUAGES:
+        return expression
+    return '{%s} : (%s)' % (' '.join(_columns(languages)), expression)
+
+
+def _sqlite_weights(boost_language):
+    """Веса колонок FTS-таблицы для bm25 (порядок как в миграции: title_*, body_*)"""
+    weights = []
+    for weight in (TITLE_WEIGHT, BODY_WEIGHT):
+        for language in LANGUAGES:
+            weights.append(weight * LANGUAGE_BOOST if language == boost_language else weight)
+    return ', '.join(str(weight) for weight in weights)
+
+
+def postgres_vector(languages):
+    """Выражение tsvector; должно совпадать с индексами миграции core.0002"""
+    parts = []
+    for language in languages:
+        config = POSTGRES_CONFIGS[language]
+        parts.append(f"setweight(to_tsvector('{config}', coalesce(title_{language}, '')), 'A')")
+        parts.append(f"setweight(to_tsvector('{config}', coalesce(body_{language}, '')), 'B')")
+    return ' || '.join(parts)
+
+
+def _postgres_query(languages):
+    return ' || '.join(f"to_tsquery('{POSTGRES_CONFIGS[language]}', %s)" for language in languages)
+
+
+def _match_clause(terms, languages, boost_language=None):
+    vendor = connection.vendor
+    if vendor == 'sqlite':
+        # CROSS JOIN фиксирует порядок: сначала FTS, затем строки по первичному ключу.
+        # Иначе планировщик может обходить core_searchentry по индексу типа контента
+        # и выполнять MATCH для каждой строки.
+        return MatchClause(
+            'FROM core_searchentry_fts CROSS JOIN core_searchentry e ON e.id = core_searchentry_fts.rowid '
+            'WHERE core_searchentry_fts MATCH %s',
+            [_sqlite_match(terms, languages)],
+            f'bm25(core_searchentry_fts, {_sqlite_weights(boost_language)})',
+            [],
+        )
+
+    if vendor == 'postgresql':
+        tsquery_text = ' & '.join(f'{term}:*' for term in terms)
+        vector, query = postgres_vector(languages), _postgres_query(languages)
+        # ts_rank растет с релевантностью, а сортировка идет по возрастанию - берем с минусом
+        rank = f'ts_rank(({vector}), ({query}))'
+        rank_params = [tsquery_text] * len(languages)
+        if boost_language in languages and len(languages) > 1:
+            rank += (
+                f' + {LANGUAGE_BOOST - 1} * ts_rank(({postgres_vector([boost_language])}), '
+                f'({_postgres_query([boost_language])}))'
+            )
+            rank_params.append(tsquery_text)
+        return MatchClause(
+            f'FROM core_searchentry e WHERE ({vector}) @@ ({query})',
+            [tsquery_text] * len(languages),
+            f'-({rank})',
+            rank_params,
+        )
+
+    # Запасной вариант для других БД: LIKE по всем термам, без ранжирования
+    conditions, params = [], []
+    for term in terms:
+        columns = ' OR '.join(f'LOWER(e.{column}) LIKE %s' for column in _columns(languages))
+        conditions.append(f'({columns})')
+        params.extend([f'%{term}%'] * len(_columns(languages)))
+    return MatchClause(f'FROM core_searchentry e WHERE {" AND ".join(conditions)}', params, '0', [])
+
+
+def _content_type_filter(content_types, params):
+    if not content_types:
+        return ''
+    params.extend(content_types)
+    return ' AND e.content_type IN (%s)' % ', '.join(['%s'] * len(content_types))
+
+
+def search(query, content_types=None, languages=LANGUAGES, limit=20, offset=0,
+           boost_language=None, after=None):
+    """
+    Ранжированная страница результатов: список SearchHit.
+    Порядок - по релевантности, при равенстве новые записи индекса выше.
+    boost_language - язык, совпадения в котором весят больше;
+    after - позиция (score, entry_id) последнего результата предыдущей страницы.
+    """
+    terms = tokenize_query(query)
+    if not terms:
+        return []
+
+    clause = _match_clause(terms, languages, boost_language)
+    params = clause.rank_params + clause.params
+    filters = ' AND e.is_public' + _content_type_filter(content_types, params)
+    if after is not None:
+        score, entry_id = after
+        filters += f' AND ({clause.rank} > %s OR ({clause.rank} = %s AND e.id < %s))'
+        params += clause.rank_params + [score] + clause.rank_params + [score, entry_id]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT e.content_type, e.object_id, {clause.rank} AS score, e.id '
+            f'{clause.from_where}{filters} ORDER BY score, e.id DESC LIMIT %s OFFSET %s',
+            params + [limit, offset]
+        )
+        return [SearchHit(*row) for row in cursor.fetchall()]
+
+
+def count(query, content_types=None, languages=LANGUAGES):
+    """Количество совпадений по типам контента одним запросом"""
+    terms = tokenize_query(query)
+    if not terms:
+        return {'total': 0}
+
+    clause = _match_clause(terms, languages)
+    params = list(clause.params)
+    filters = ' AND e.is_public' + _content_type_filter(content_types, params)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT e.content_type, COUNT(*) {clause.from_where}{filters} GROUP BY e.content_type',
+            params
+        )
+        counts = dict(cursor.fetchall())
+    counts['total'] = sum(counts.values())
+    return counts
+
+
+def load_objects(hits, querysets):
+    """
+    Загружает объекты для результатов поиска, сохраняя порядок ранжирования.
+    querysets: {тип контента: queryset} - по одному запросу на тип.
+    Возвращает пары (hit, объект); удаленные из БД объекты пропускаются.
+    """
+    ids_by_type = {}
+    for hit in hits:
+        ids_by_type.setdefault(hit.content_type, []).append(hit.object_id)
+
+    loaded = {}
+    for content_type, ids in ids_by_type.items():
+        queryset = querysets.get(content_type)
+        if queryset is None:
+            continue
+        for obj in queryset.filter(pk__in=ids):
+            loaded[(content_type, obj.pk)] = obj
+
+    return [
+        (hit, loaded[(hit.content_type, hit.object_id)])
+        for hit in hits
+        if (hit.content_type, hit.object_id) in loaded
+    ]
+
+
+def search_by_type(query, querysets, languages=LANGUAGES, limit=5, offset=0):
+    """
+    Первые результаты отдельно по каждому типу контента.
+    Возвращает ({тип: [объекты]}, {тип: количество, 'total': всего});
+    типы без совпадений не запрашиваются.
+    """
+    counts = count(query, list(querysets), languages)
+    found = {}
+    for content_type in querysets:
+        hits = []
+        if counts.get(content_type):
+            hits = search(query, [content_type], languages, limit=limit, offset=offset)
+        found[content_type] = [obj for _, obj in load_objects(hits, querysets)]
+    return found, counts
+
+
+def encode_cursor(hit):
+    """Непрозрачный курсор для продолжения выдачи после hit"""
+    payload = json.dumps([hit.score, hit.entry_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(value):
+    """Позиция (score, entry_id) из курсора; ValueError для некорректного значения"""
+    try:
+        padded = value + '=' * (-len(value) % 4)
+        score, entry_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(score), int(entry_id)
+    except (TypeError, ValueError, binascii.Error):
+        raise ValueError('Некорректный курсор')
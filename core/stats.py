@@ -0,0 +1,49 @@
+"""
+Материализованные снимки статистики.
+
+Снимок хранится в кэше и отдается без обращения к БД. Ключ содержит версии
+моделей, от которых зависит статистика (core.versions): после их изменения,
+в том числе без сигналов (массовые действия админки), прежний снимок
+перестает читаться и строится заново при следующем запросе; по расписанию
+его обновляет команда refresh_stats_snapshots. Таймаут ограничивает
+устаревание значений, зависящих от текущей даты.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from .versions import version_token
+
+CACHE_PREFIX = 'stats:snapshot'
+
+registry = {}
+
+
+class StatsSnapshot:
+    """Снимок статистики, построенный функцией builder"""
+
+    def __init__(self, name, builder, models):
+        self.name = name
+        self.builder = builder
+        self.models = models
+        registry[name] = self
+
+    def get_cache_key(self):
+        return f'{CACHE_PREFIX}:{self.name}:{version_token(self.models)}'
+
+    @property
+    def timeout(self):
+        return getattr(settings, 'STATS_SNAPSHOT_TIMEOUT', 600)
+
+    def get(self):
+        data = cache.get(self.get_cache_key())
+        if data is None:
+            data = self.refresh()
+        return data
+
+    def refresh(self):
+        data = self.builder()
+        cache.set(self.get_cache_key(), data, self.timeout)
+        return data
+
+    def invalidate(self):
+        cache.delete(self.get_cache_key())
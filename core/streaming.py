@@ -0,0 +1,60 @@
+"""
+Выдача списков в формате NDJSON: по одному JSON-объекту на строку.
+
+Формат выбирается обычным для DRF способом: ?format=ndjson или заголовком
+Accept: application/x-ndjson. Для полной выгрузки списков используется
+stream_ndjson(): объекты читаются из БД пачками и сериализуются по мере
+отправки, поэтому память процесса не зависит от размера выборки.
+"""
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+NDJSON_FORMAT = 'ndjson'
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+def encode_line(item):
+    return json.dumps(item, cls=encoders.JSONEncoder, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+class NDJSONRenderer(renderers.BaseRenderer):
+    """Рендерер NDJSON для обычных (не потоковых) ответов"""
+    media_type = NDJSON_MEDIA_TYPE
+    format = NDJSON_FORMAT
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, dict) and 'results' in data:
+            data = data['results']
+        if not isinstance(data, list):
+            data = [data]
+        return b''.join(encode_line(item) for item in data)
+
+
+def is_ndjson_request(request):
+    renderer = getattr(request, 'accepted_renderer', None)
+    return renderer is not None and renderer.format == NDJSON_FORMAT
+
+
+def stream_ndjson(queryset, serializer_class, context=None, chunk_size=500, filename=None):
+    """Потоковый ответ со всеми объектами queryset"""
+    def lines():
+        batch = []
+        # iterator(chunk_size) сохраняет prefetch_related для каждой пачки
+        for obj in queryset.iterator(chunk_size=chunk_size):
+            batch.append(encode_line(serializer_class(obj, context=context).data))
+            if len(batch) >= chunk_size:
+                yield b''.join(batch)
+                batch = []
+        if batch:
+            yield b''.join(batch)
+
+    response = StreamingHttpResponse(lines(), content_type=f'{NDJSON_MEDIA_TYPE}; charset=utf-8')
+    if filename:
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
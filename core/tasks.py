@@ -0,0 +1,177 @@
+"""
+Фоновые задачи в очереди на таблице БД.
+
+Функция объявляется задачей декоратором @task() и ставится в очередь
+вызовом func.enqueue(*args, **kwargs): в запросе выполняется только INSERT
+в QueuedTask, и view сразу возвращает ответ. Строка пишется в той же
+транзакции, что и данные, поэтому воркер не увидит задачу, пока данные не
+закоммичены, а при откате задача исчезает вместе с ними. Аргументы должны
+сериализоваться в JSON (идентификаторы, строки), а не объекты моделей.
+
+Воркер (команда run_tasks) выбирает задачи с наступившим run_at и
+захватывает каждую условным UPDATE, без SELECT ... FOR UPDATE: это работает
+и в SQLite, и в PostgreSQL при нескольких воркерах. Захваченная задача
+получает таймаут видимости (locked_until): если воркер упал, не закончив
+ее, после таймаута задачу забирает другой воркер. Поэтому задачи должны
+быть идемпотентными. Выполненная задача удаляется. При ошибке задача
+повторяется с экспоненциальной задержкой, после max_attempts попыток
+остается со статусом failed и текстом ошибки.
+
+При TASKS_EAGER = True (тесты) задачи не записываются в БД, а выполняются в
+процессе сразу после коммита транзакции; исключения не перехватываются.
+"""
+import logging
+import traceback
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import QueuedTask
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ATTEMPTS = 3
+# Задержка перед первым повтором (секунды); далее удваивается
+DEFAULT_RETRY_DELAY = 30
+
+registry = {}
+
+
+def get_visibility_timeout():
+    return getattr(settings, 'TASKS_VISIBILITY_TIMEOUT', 300)
+
+
+def is_eager():
+    return getattr(settings, 'TASKS_EAGER', False)
+
+
+class Task:
+    """Функция, зарегистрированная как фоновая задача"""
+
+    def __init__(self, func, name, max_attempts, retry_delay, visibility_timeout):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.visibility_timeout = visibility_timeout
+        self.__doc__ = func.__doc__
+        registry[name] = self
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def __repr__(self):
+        return f'<Task {self.name}>'
+
+    def get_visibility_timeout(self):
+        return self.visibility_timeout or get_visibility_timeout()
+
+    def enqueue(self, *args, **kwargs):
+        """Ставит вызов в очередь; возвращает QueuedTask (None в режиме TASKS_EAGER)"""
+        if is_eager():
+            transaction.on_commit(partial(self.func, *args, **kwargs))
+            return None
+        return QueuedTask.objects.create(
+            name=self.name, args=list(args), kwargs=kwargs, max_attempts=self.max_attempts
+        )
+
+
+def task(name=None, max_attempts=DEFAULT_MAX_ATTEMPTS, retry_delay=DEFAULT_RETRY_DELAY, visibility_timeout=None):
+    """Декоратор задачи; имя по умолчанию - путь импорта функции"""
+    def decorator(func):
+        return Task(
+            func, name or f'{func.__module__}.{func.__qualname__}',
+            max_attempts, retry_delay, visibility_timeout
+        )
+    return decorator
+
+
+def get_task(name):
+    """Задача по имени; модуль с ней импортируется, если воркер его еще не загрузил"""
+    if name not in registry:
+        import_string(name)
+    return registry[name]
+
+
+def claim_tasks(limit, now=None):
+    """Захватывает до limit задач, готовых к выполнению; возвращает захваченные"""
+    now = now or timezone.now()
+    fail_exhausted(now)
+    ready = QueuedTask.objects.filter(
+        Q(status=QueuedTask.STATUS_PENDING, run_at__lte=now)
+        | Q(status=QueuedTask.STATUS_RUNNING, locked_until__lt=now)
+    ).order_by('run_at', 'id')[:limit]
+
+    claimed = []
+    for queued in ready:
+        try:
+            timeout = get_task(queued.name).get_visibility_timeout()
+        except (ImportError, KeyError):
+            timeout = get_visibility_timeout()
+        # Условие на статус и число попыток: задачу получает только один воркер
+        updated = QueuedTask.objects.filter(
+            pk=queued.pk, status=queued.status, attempts=queued.attempts
+        ).update(
+            status=QueuedTask.STATUS_RUNNING, attempts=F('attempts') + 1,
+            locked_until=now + timedelta(seconds=timeout)
+        )
+        if updated:
+            queued.status = QueuedTask.STATUS_RUNNING
+            queued.attempts += 1
+            claimed.append(queued)
+    return claimed
+
+
+def _finish(queued, **changes):
+    """Сохраняет результат, если задачу не перехватил другой воркер по таймауту"""
+    owned = QueuedTask.objects.filter(pk=queued.pk, attempts=queued.attempts)
+    if changes:
+        return owned.update(locked_until=None, **changes)
+    return owned.delete()[0]
+
+
+def run_task(queued, now=None):
+    """Выполняет захваченную задачу; True - успешно"""
+    try:
+        definition = get_task(queued.name)
+        definition(*queued.args, **queued.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('Фоновая задача %s (попытка %s) завершилась ошибкой', queued.name, queued.attempts)
+        definition = registry.get(queued.name)
+        retry_delay = definition.retry_delay if definition else DEFAULT_RETRY_DELAY
+        if queued.attempts >= queued.max_attempts:
+            _finish(queued, status=QueuedTask.STATUS_FAILED, last_error=error)
+        else:
+            delay = timedelta(seconds=retry_delay * 2 ** (queued.attempts - 1))
+            _finish(
+                queued, status=QueuedTask.STATUS_PENDING, last_error=error,
+                run_at=(now or timezone.now()) + delay
+            )
+        return False
+    _finish(queued)
+    return True
+
+
+def run_pending(limit=10, now=None):
+    """Один проход воркера: (выполнено, с ошибкой)"""
+    succeeded = failed = 0
+    for queued in claim_tasks(limit, now):
+        if run_task(queued, now):
+            succeeded += 1
+        else:
+            failed += 1
+    return succeeded, failed
+
+
+def fail_exhausted(now=None):
+    """Задачи, превысившие таймаут видимости на последней попытке, помечаются failed"""
+    now = now or timezone.now()
+    return QueuedTask.objects.filter(
+        status=QueuedTask.STATUS_RUNNING, locked_until__lt=now, attempts__gte=F('max_attempts')
+    ).update(status=QueuedTask.STATUS_FAILED, locked_until=None, last_error='Превышен таймаут видимости')
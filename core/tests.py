@@ -0,0 +1,798 @@
+import json
+import re
+import tempfile
+from io import BytesIO, StringIO
+from datetime import timedelta
+from pathlib import Path
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, reset_queries
+from django.db.models import Q
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+from rest_framework.test import APIClient
+
+from banner.models import Banner
+from core_admin import image_preview
+from careers.models import CareerCategory, Vacancy
+from careers.tests import create_category as create_career_category, create_department, create_vacancy
+from news.models import News, NewsCategory
+from news.serializers import NewsCompactSerializer
+from news.tests import create_category, create_news
+from news.views import AnnouncementViewSet, EventViewSet, NewsViewSet
+from research.models import ResearchArea
+from research.tests import create_area, create_grant, create_publication
+from research.views import ConferenceViewSet, GrantViewSet, PublicationViewSet
+
+from . import compact, localization, perf, profiling, renditions, search, tasks, versions
+from .language import get_request_language, negotiate_language
+from .models import ContentVersion, ProfileSnapshot, QueuedTask
+
+
+class UnifiedSearchTests(TestCase):
+    """Единый поиск по всем приложениям: фасеты, язык и курсорная пагинация"""
+
+    def setUp(self):
+        self.client = APIClient()
+        category = create_category()
+        create_news(category, 1, title_ru='Медицинский грант для студентов')
+        create_grant(1, title_ru='Медицинский грант', title_en='Medical grant')
+        create_grant(2, title_ru='Закрытый медицинский грант', is_active=False)
+        create_publication(1, title_ru='Медицинская этика', title_kg='Медициналык этика')
+        create_vacancy(
+            create_career_category(), create_department(), 1,
+            title_ru='Преподаватель', description_ru='Кафедра медицинской физики',
+        )
+
+    def get(self, **params):
+        response = self.client.get('/api/core/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_results_and_facets_span_all_apps(self):
+        data = self.get(q='медицин')
+        self.assertEqual(data['total'], 4)
+        self.assertEqual(
+            sorted(result['type'] for result in data['results']),
+            ['careers.vacancy', 'news.news', 'research.grant', 'research.publication']
+        )
+        facets = {facet['value']: facet['count'] for facet in data['facets']['type']}
+        self.assertEqual(facets['research.grant'], 1)
+        self.assertEqual(facets['careers.vacancy'], 1)
+        self.assertEqual(facets['news.event'], 0)
+
+    def test_type_filter_keeps_facets_for_all_types(self):
+        data = self.get(q='медицин', type='research')
+        self.assertEqual(
+            sorted(result['type'] for result in data['results']),
+            ['research.grant', 'research.publication']
+        )
+        self.assertEqual(data['total'], 2)
+        facets = {facet['value']: facet for facet in data['facets']['type']}
+        self.assertEqual(facets['news.news']['count'], 1)
+        self.assertFalse(facets['news.news']['selected'])
+
+        response = self.client.get('/api/core/search/', {'q': 'медицин', 'type': 'unknown'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_language_boost_and_localized_output(self):
+        russian = create_grant(3, title_ru='COVID исследования', title_en='Grant')
+        english = create_grant(4, title_ru='Грант', title_en='COVID research')
+
+        data = self.get(q='covid', lang='en')
+        self.assertEqual(data['language'], 'en')
+        self.assertEqual([result['id'] for result in data['results']], [english.id, russian.id])
+        self.assertEqual(data['results'][1]['title'], 'Grant')
+
+        data = self.get(q='covid', lang='ru')
+        self.assertEqual([result['id'] for result in data['results']], [russian.id, english.id])
+
+        # Кыргызские буквы находятся и при наборе русскими
+        data = self.get(q='медициналык', lang='ky')
+        self.assertEqual(data['language'], 'kg')
+        self.assertEqual(data['results'][0]['title'], 'Медициналык этика')
+
+    def test_cursor_pagination_walks_all_results(self):
+        seen = []
+        params = {'q': 'медицин', 'page_size': 1}
+        while True:
+            data = self.get(**params)
+            seen.extend((result['type'], result['id']) for result in data['results'])
+            if not data['next_cursor']:
+                break
+            params['cursor'] = data['next_cursor']
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(len(set(seen)), 4)
+
+        response = self.client.get('/api/core/search/', {'q': 'медицин', 'cursor': '!!!'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_admin_bulk_draft_hides_vacancy(self):
+        vacancy = Vacancy.objects.get()
+        admin = APIClient()
+        admin.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        admin.post('/admin/careers/vacancy/', {'action': 'make_draft', '_selected_action': [vacancy.pk]})
+        data = self.get(q='медицин', type='careers')
+        self.assertEqual(data['total'], 0)
+        self.assertEqual(data['results'], [])
+
+        admin.post('/admin/careers/vacancy/', {'action': 'make_published', '_selected_action': [vacancy.pk]})
+        self.assertEqual(self.get(q='медицин', type='careers')['total'], 1)
+
+        # Устаревший документ индекса не раскрывает черновик
+        Vacancy.objects.update(status='draft')
+        self.assertEqual(self.get(q='медицин', type='careers')['results'], [])
+
+    def test_query_count_is_bounded_by_types_on_page(self):
+        # Поиск + подсчет фасетов + загрузка объектов по каждому типу на странице
+        with self.assertNumQueries(2 + 4):
+            self.get(q='медицин')
+
+    def test_query_folding(self):
+        self.assertEqual(search.tokenize_query('Өнөр-жай, ЁЛКА'), ['онор', 'жай', 'елка'])
+
+
+class SelectablePaginationTests(TestCase):
+    """Курсорная пагинация включается параметром запроса, по умолчанию - номера страниц"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        category = create_category()
+        published_at = timezone.now()
+        # Пары новостей с одинаковой датой проверяют сортировку по id внутри даты
+        self.news = [
+            create_news(category, index, published_at=published_at - timedelta(days=index // 2))
+            for index in range(45)
+        ]
+
+    def walk(self, url, params):
+        ids, pages = [], 0
+        while url:
+            data = self.client.get(url, params).json()
+            ids.extend(item['id'] for item in data['results'])
+            url, params, pages = data['next'], None, pages + 1
+        return ids, pages
+
+    def test_page_number_mode_is_default(self):
+        data = self.client.get('/api/news/').json()
+        self.assertEqual(data['count'], 45)
+        self.assertEqual(len(data['results']), 20)
+
+    def test_cursor_mode_walks_archive_in_key_order(self):
+        ids, pages = self.walk('/api/news/', {'pagination': 'cursor', 'page_size': 10})
+        expected = [news.id for news in sorted(
+            self.news, key=lambda news: (news.published_at, news.id), reverse=True
+        )]
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 5)
+
+    def test_cursor_page_has_no_count_query(self):
+        first = self.client.get('/api/news/', {'pagination': 'cursor'}).json()
+        self.assertNotIn('count', first)
+        cache.clear()
+        # Версии таблиц + страница новостей с категорией + теги, без COUNT(*)
+        with self.assertNumQueries(3):
+            self.client.get(first['next'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/news/', {'cursor': 'broken'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_publications_and_vacancies(self):
+        for index in range(5):
+            create_publication(index)
+        ids, _ = self.walk('/research/api/publications/', {'pagination': 'cursor', 'page_size': 2})
+        self.assertEqual(len(set(ids)), 5)
+
+        category, department = create_career_category(), create_department()
+        for index in range(5):
+            create_vacancy(category, department, index)
+        ids, pages = self.walk('/api/careers/vacancies/', {'pagination': 'cursor', 'page_size': 2})
+        self.assertEqual(len(set(ids)), 5)
+        self.assertEqual(pages, 3)
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Проверяется план запроса SQLite (EXPLAIN QUERY PLAN)')
+class QueryPlanTests(TestCase):
+    """Горячие запросы API идут по индексам, без полного просмотра таблиц"""
+
+    # SCAN без USING INDEX - полный просмотр таблицы
+    full_scan = re.compile(r'\bSCAN \S+$', re.MULTILINE)
+    # Списки с пагинацией должны получать порядок из индекса, без сортировки
+    # всей выборки; узким диапазонам (deadline_soon и т.п.) сортировка допустима
+    index_ordered = [
+        'news.list', 'news.featured', 'news.pinned', 'news.by_category',
+        'event.list', 'event.upcoming', 'event.this_month',
+        'announcement.list', 'announcement.by_type', 'announcement.for_students',
+        'grant.list', 'grant.active', 'conference.list', 'conference.upcoming',
+        'publication.list', 'publication.featured', 'publication.by_research_area',
+        'vacancy.list', 'vacancy.latest', 'vacancy.expiring_soon',
+    ]
+
+    def hot_queries(self):
+        today = timezone.now().date()
+        news = NewsViewSet.queryset.select_related('category')
+        events = EventViewSet.queryset
+        announcements = AnnouncementViewSet.queryset
+        grants = GrantViewSet.queryset
+        conferences = ConferenceViewSet.queryset
+        publications = PublicationViewSet.queryset
+        vacancies = Vacancy.objects.filter(status='published').select_related('category', 'department')
+        return {
+            'news.list': news,
+            'news.featured': news.filter(is_featured=True),
+            'news.pinned': news.filter(is_pinned=True),
+            'news.popular': news.filter(published_at__gte=timezone.now() - timedelta(days=30)),
+            'news.by_category': news.filter(category_id=1),
+            'event.list': events,
+            'event.upcoming': events.filter(status='upcoming'),
+            'event.this_month': events.filter(
+                event_date__gte=today.replace(day=1), event_date__lte=today + timedelta(days=31),
+            ),
+            'announcement.list': announcements,
+            'announcement.pinned': announcements.filter(news__is_pinned=True),
+            'announcement.urgent': announcements.filter(
+                Q(priority='high') | Q(priority='urgent') | Q(is_deadline_approaching=True)
+            ),
+            'announcement.by_type': announcements.filter(announcement_type='academic'),
+            'announcement.for_students': announcements.filter(target_students=True),
+            'grant.list': grants,
+            'grant.active': grants.filter(status='active'),
+            'grant.deadline_soon': grants.filter(
+                status='active', deadline__gte=today, deadline__lte=today + timedelta(days=30),
+            ),
+            'conference.list': conferences,
+            'conference.upcoming': conferences.filter(start_date__gte=today),
+            'conference.registration_open': conferences.filter(
+                status__in=['registration-open', 'early-bird'], deadline__gte=today,
+            ),
+            'publication.list': publications,
+            'publication.featured': publications.filter(is_featured=True),
+            'publication.recent': publications.filter(publication_date__gte=today - timedelta(days=365)),
+            'publication.by_research_area': publications.filter(research_area_id=1),
+            'vacancy.list': vacancies.order_by('-posted_date', '-id'),
+            'vacancy.featured': vacancies.filter(is_featured=True),
+            'vacancy.latest': vacancies.order_by('-posted_date'),
+            'vacancy.expiring_soon': vacancies.filter(
+                deadline__gt=today, deadline__lte=today + timedelta(days=7),
+            ).order_by('deadline'),
+        }
+
+    def test_hot_queries_use_indexes(self):
+        for name, queryset in self.hot_queries().items():
+            with self.subTest(query=name):
+                plan = queryset[:20].explain()
+                self.assertIsNone(self.full_scan.search(plan), f'{name}: полный просмотр таблицы\n{plan}')
+                if name in self.index_ordered:
+                    self.assertNotIn('TEMP B-TREE', plan, f'{name}: сортировка без индекса\n{plan}')
+
+
+class PerfBudgetTests(TestCase):
+    """
+    Потолки SQL-запросов всех публичных маршрутов на малом объеме данных.
+    Время ответа на полном объеме проверяет команда check_perf_budgets.
+    """
+
+    def setUp(self):
+        cache.clear()
+
+    def test_every_route_has_budget(self):
+        dataset = perf.seed_dataset(scale=0.005)
+        self.assertEqual(perf.uncovered_routes(perf.ENDPOINTS, dataset), [])
+
+    def test_query_budgets(self):
+        dataset = perf.seed_dataset(scale=0.005)
+        report = perf.run_budgets(dataset, repeat=1, check_latency=False)
+        self.assertEqual(report['failures'], [])
+        self.assertEqual(set(report['endpoints']), {endpoint.name for endpoint in perf.ENDPOINTS})
+        # Отчет сохраняется в JSON для сравнения между релизами
+        self.assertEqual(json.loads(json.dumps(report)), report)
+
+    def test_seed_reaches_filtered_branches(self):
+        # Пустая выборка не выполняет запрос страницы и занижает число запросов
+        perf.seed_dataset(scale=0.005)
+        for path in (
+            '/api/events/this_month/',
+            '/api/announcements/pinned/',
+            '/research/api/grants/deadline_soon/',
+            '/research/api/conferences/upcoming/',
+            '/research/api/conferences/registration_open/',
+        ):
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertGreater(len(response.json()['results']), 0)
+
+
+class ProfilingMiddlewareTests(TestCase):
+    """Server-Timing и статистика по view при включенном REQUEST_PROFILING"""
+
+    def setUp(self):
+        cache.clear()
+        profiling.clear_snapshots()
+        category = create_category()
+        for index in range(3):
+            create_news(category, index)
+
+    def test_disabled_by_default(self):
+        response = APIClient().get('/api/news/')
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(REQUEST_PROFILING=True)
+    def test_server_timing_and_view_stats(self):
+        response = APIClient().get('/api/news/')
+        timing = response['Server-Timing']
+        # Список новостей: версии таблиц, COUNT, страница и теги
+        self.assertIn('desc="4 SQL"', timing)
+        self.assertIn('serializer;dur=', timing)
+        self.assertIn(f'size;desc="{len(response.content)} B"', timing)
+
+        stats = profiling.store.snapshot()['views']['news.views.NewsViewSet.list']
+        self.assertEqual(stats['requests'], 1)
+        self.assertEqual(stats['db_queries'], 4)
+        self.assertEqual(sum(stats['histogram']), 1)
+        self.assertGreater(stats['serializer_ms'], 0)
+
+    @override_settings(REQUEST_PROFILING_REPEAT_THRESHOLD=3)
+    def test_repeated_statements(self):
+        profile = profiling.RequestProfile()
+        profile.view = 'news.views.NewsViewSet.list'
+
+        def execute(sql, params, many, context):
+            return None
+
+        for size in range(1, 5):
+            sql = 'SELECT * FROM news_news WHERE id IN (' + ', '.join(['%s'] * size) + ')'
+            profile.record_query(execute, sql, [1] * size, False, {})
+        profile.record_query(execute, 'SELECT COUNT(*) FROM news_news', [], False, {})
+        profiling.store.add(profile)
+
+        [repeated] = profiling.store.snapshot()['repeated']
+        self.assertEqual(repeated['sql'], 'SELECT * FROM news_news WHERE id IN (%s, ...)')
+        self.assertEqual(repeated['max_repeats'], 4)
+
+    def test_report_command(self):
+        out = StringIO()
+        call_command('profile_report', url=['/api/news/'], stdout=out)
+        self.assertIn('news.views.NewsViewSet.list: 1 запр.', out.getvalue())
+
+    @override_settings(REQUEST_PROFILING=True, REQUEST_PROFILING_PUBLISH_INTERVAL=0)
+    def test_report_merges_snapshots_of_other_processes(self):
+        APIClient().get('/api/news/')
+        [snapshot] = ProfileSnapshot.objects.all()
+        self.assertEqual(snapshot.process, profiling.process_key())
+        # Снимок из БД виден без общего кэша: так его получает команда в другом процессе
+        ProfileSnapshot.objects.create(process='worker:1', data=snapshot.data)
+        cache.clear()
+
+        stats = profiling.collect_snapshots()['views']['news.views.NewsViewSet.list']
+        self.assertEqual(stats['requests'], 2)
+
+        out = StringIO()
+        call_command('profile_report', reset=True, stdout=out)
+        self.assertIn('news.views.NewsViewSet.list: 2 запр.', out.getvalue())
+        self.assertFalse(ProfileSnapshot.objects.exists())
+
+
+class LocalizationTests(TestCase):
+    """Локализация полей по таблицам колонок и языку, определенному один раз на запрос"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.category = create_career_category()
+        self.vacancy = create_vacancy(
+            self.category, create_department(), 1, title_kg='', responsibilities_en='Duty\nReport',
+        )
+
+    def get_vacancy(self, language):
+        return self.client.get(f'/api/careers/vacancies/{self.vacancy.slug}/', HTTP_ACCEPT_LANGUAGE=language).json()
+
+    def test_columns_follow_fallback_order(self):
+        self.assertEqual(
+            localization.localized_columns(Vacancy, 'title', 'kg'), ('title_kg', 'title_ru', 'title_en')
+        )
+        self.assertEqual(localization.localized_columns(Vacancy, 'title', 'en', ('ru',)), ('title_en', 'title_ru'))
+        with self.assertRaises(ImproperlyConfigured):
+            localization.localized_columns(Vacancy, 'slug', 'ru')
+
+    def test_serializers_use_request_language(self):
+        data = self.get_vacancy('en-US,en;q=0.9')
+        self.assertEqual(data['title'], 'Vacancy 1')
+        self.assertEqual(data['category']['display_name'], 'Academic')
+        self.assertEqual(data['responsibilities_list'], ['Duty', 'Report'])
+
+        # Пустой кыргызский перевод заменяется русским
+        data = self.get_vacancy('ky')
+        self.assertEqual(data['title'], 'Вакансия 1')
+        self.assertEqual(data['short_description'], 'Кыскача')
+
+    def test_language_is_resolved_once_per_request(self):
+        request = RequestFactory().get('/', HTTP_ACCEPT_LANGUAGE='kg')
+        self.assertEqual(get_request_language(request), 'kg')
+        request.META['HTTP_ACCEPT_LANGUAGE'] = 'en'
+        self.assertEqual(get_request_language(request), 'kg')
+
+    def test_values_projection_selects_active_language(self):
+        queryset = CareerCategory.objects.filter(pk=self.category.pk)
+        with CaptureQueriesContext(connection) as queries:
+            rows = list(localization.localized_values(queryset, 'en', 'name', display='display_name'))
+        self.assertEqual(rows, [{'name': 'academic', 'display': 'Academic'}])
+        sql = queries[0]['sql']
+        self.assertIn('display_name_en', sql)
+        self.assertNotIn('display_name_kg', sql)
+
+    def test_related_names_in_research(self):
+        create_publication(1, research_area=create_area(1))
+        create_publication(2)
+        response = self.client.get('/research/api/publications/', HTTP_ACCEPT_LANGUAGE='en')
+        results = {item['title_ru']: item for item in response.json()['results']}
+        # Полный список отдает названия связей на русском, как и раньше
+        self.assertEqual(results['Публикация 1']['research_area_name'], 'Область 1')
+        self.assertNotIn('research_area_name', results['Публикация 2'])
+
+
+class CompactModeTests(TestCase):
+    """Компактные списки: плоские ключи одного языка и only() в SQL"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        category = create_category()
+        for index in range(3):
+            create_news(category, index, title_en='', title_kg=f'Жаңылык {index}')
+        create_publication(1, research_area=create_area(1))
+
+    def get(self, path, **extra):
+        reset_queries()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path, **extra)
+        return response, queries
+
+    def test_news_compact_list(self):
+        full, full_queries = self.get('/api/news/')
+        response, queries = self.get('/api/news/?lang=kg')
+        item = response.json()['results'][0]
+        self.assertEqual(item['title'], 'Жаңылык 2')
+        self.assertEqual(item['summary'], 'Кыскача')
+        self.assertNotIn('title_ru', item)
+        self.assertEqual(len(queries), len(full_queries))
+        self.assertLess(len(response.content), len(full.content))
+
+        sql = next(query['sql'] for query in queries if 'FROM "news_news"' in query['sql'] and 'COUNT' not in query['sql'])
+        self.assertIn('"title_kg"', sql)
+        self.assertIn('"title_ru"', sql)
+        self.assertNotIn('"title_en"', sql)
+        self.assertNotIn('"content_ru"', sql)
+
+    def test_fallback_and_accept_language(self):
+        response, _ = self.get('/api/news/?compact=1', HTTP_ACCEPT_LANGUAGE='en')
+        self.assertEqual(response.json()['results'][0]['title'], 'Новость 2')
+
+        response, _ = self.get('/research/api/publications/?compact=1', HTTP_ACCEPT_LANGUAGE='en')
+        item = response.json()['results'][0]
+        self.assertEqual(item['title'], 'Publication 1')
+        self.assertEqual(item['research_area_name'], 'Area 1')
+
+    def test_compact_cursor_pagination(self):
+        response, queries = self.get('/api/news/?lang=en&pagination=cursor&page_size=2')
+        data = response.json()
+        self.assertEqual(len(data['results']), 2)
+        # Версии таблиц + страница + теги
+        self.assertEqual(len(queries), 3)
+        response = self.client.get(data['next'])
+        self.assertEqual(len(response.json()['results']), 1)
+
+    def test_projection_columns(self):
+        columns, relations = compact.compact_projection(NewsCompactSerializer, 'en')
+        self.assertEqual(relations, ('category',))
+        self.assertIn('category__name_en', columns)
+        self.assertIn('image', columns)
+        self.assertNotIn('title_kg', columns)
+
+
+class LanguageNegotiationTests(TestCase):
+    """Выбор языка по Accept-Language с q-весами и его передача в LocaleMiddleware"""
+
+    def test_negotiate_language(self):
+        cases = {
+            'ru-RU,ru;q=0.9,en;q=0.8': 'ru',
+            'en;q=0.5, ky;q=0.9': 'kg',
+            'fr-FR, de;q=0.9, en-US;q=0.3': 'en',
+            'kg': 'kg',
+            'en;q=0, ru;q=0.1': 'ru',
+            'en;q=abc, ru;q=0.2': 'ru',
+            'fr, *;q=0.5': None,
+            '': None,
+        }
+        for header, language in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(negotiate_language(header), language)
+
+    def test_negotiation_is_memoized(self):
+        negotiate_language.cache_clear()
+        for _ in range(3):
+            negotiate_language('en-GB,en;q=0.9')
+        self.assertEqual(negotiate_language.cache_info().hits, 2)
+
+    def test_middleware_activates_field_language(self):
+        create_career_category()
+        with self.assertNoLogs('careers', level='INFO'):
+            response = self.client.get('/api/careers/categories/', HTTP_ACCEPT_LANGUAGE='ky-KG,ru;q=0.5')
+        self.assertEqual(response['Content-Language'], 'ky')
+        self.assertEqual(response.json()['results'][0]['display_name'], 'Окутуучулук')
+
+        response = self.client.get('/api/careers/categories/?lang=en', HTTP_ACCEPT_LANGUAGE='ru')
+        self.assertEqual(response['Content-Language'], 'en')
+        self.assertEqual(response.json()['results'][0]['display_name'], 'Academic')
+
+    def test_cookie_takes_precedence_over_accept_language(self):
+        create_career_category()
+        self.client.cookies[settings.LANGUAGE_COOKIE_NAME] = 'en'
+        response = self.client.get('/api/careers/categories/', HTTP_ACCEPT_LANGUAGE='ky-KG,ru;q=0.5')
+        self.assertEqual(response['Content-Language'], 'en')
+        self.assertEqual(response.json()['results'][0]['display_name'], 'Academic')
+
+        response = self.client.get('/api/careers/categories/?lang=kg', HTTP_ACCEPT_LANGUAGE='ru')
+        self.assertEqual(response['Content-Language'], 'ky')
+
+        # Неподдерживаемый язык в cookie не мешает заголовку
+        self.client.cookies[settings.LANGUAGE_COOKIE_NAME] = 'fr'
+        response = self.client.get('/api/careers/categories/', HTTP_ACCEPT_LANGUAGE='ky')
+        self.assertEqual(response['Content-Language'], 'ky')
+
+
+class ConditionalGetTests(TestCase):
+    """ETag/Last-Modified по версиям таблиц и 304 без обращения к БД"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.category = create_category()
+        self.news = create_news(self.category, 1)
+
+    def test_matching_etag_returns_304_without_queries(self):
+        response = self.client.get('/api/news/')
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertIn('Accept-Language', response['Vary'])
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('Last-Modified', response)
+
+        reset_queries()
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/news/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+        response = self.client.get('/api/news/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_changes_with_content_and_language(self):
+        etag = self.client.get('/api/news/')['ETag']
+        self.assertNotEqual(self.client.get('/api/news/', HTTP_ACCEPT_LANGUAGE='en')['ETag'], etag)
+
+        self.news.title_ru = 'Новый заголовок'
+        self.news.save()
+        response = self.client.get('/api/news/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_function_views_and_other_apps(self):
+        create_vacancy(create_career_category(), create_department(), 1)
+        for path in ['/api/careers/stats/', '/api/careers/vacancies/', '/research/api/stats/', '/api/banners/']:
+            etag = self.client.get(path)['ETag']
+            self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=etag).status_code, 304, path)
+
+    def test_detail_with_view_counting_and_authenticated_requests_are_private(self):
+        response = self.client.get(f'/api/news/{self.news.slug}/')
+        self.assertNotIn('ETag', response)
+        self.assertIn('private', response['Cache-Control'])
+
+        self.client.force_authenticate(User.objects.create_user('editor'))
+        response = self.client.get('/api/news/')
+        self.assertNotIn('ETag', response)
+        self.assertIn('private', response['Cache-Control'])
+
+
+class ContentVersionTests(TestCase):
+    """Реестр версий таблиц: сигналы, кэш и чтение из БД при промахе"""
+
+    def setUp(self):
+        cache.clear()
+        self.category = create_category()
+
+    def test_save_and_delete_bump_version_in_cache(self):
+        before = versions.get_version(News)
+        news = create_news(self.category, 1)
+        with self.assertNumQueries(0):
+            created = versions.get_version(News)
+        self.assertGreater(created, before)
+
+        news.delete()
+        self.assertGreater(versions.get_version(News), created)
+
+    def test_database_fallback_after_cache_loss(self):
+        create_news(self.category, 1)
+        token = versions.version_token([News, NewsCategory])
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.assertEqual(versions.version_token([News, NewsCategory]), token)
+        with self.assertNumQueries(0):
+            versions.version_token([News, NewsCategory])
+
+    def test_models_without_updated_at_and_bulk_updates(self):
+        area = create_area(1)
+        token = versions.version_token([ResearchArea])
+        ResearchArea.objects.filter(pk=area.pk).update(is_active=False)
+        self.assertEqual(versions.version_token([ResearchArea]), token)
+        versions.bump_version(ResearchArea)
+        self.assertNotEqual(versions.version_token([ResearchArea]), token)
+
+        # Таблица без изменений: версия 0 из БД, без записи
+        self.assertEqual(versions.get_version(Banner), 0)
+        self.assertFalse(ContentVersion.objects.filter(label='banner.banner').exists())
+
+    def test_admin_bulk_action_refreshes_cached_responses(self):
+        news = create_news(self.category, 1, is_featured=True)
+        client = APIClient()
+        response = client.get('/api/news/')
+        etag = response['ETag']
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(client.get('/api/stats/').json()['total_news'], 1)
+
+        admin = APIClient()
+        admin.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        admin.post('/admin/news/news/', {'action': 'make_unpublished', '_selected_action': [news.pk]})
+
+        response = client.get('/api/news/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 0)
+        self.assertEqual(client.get('/api/stats/').json()['total_news'], 0)
+
+
+@override_settings(TASKS_EAGER=True)
+class ImageRenditionsTests(TestCase):
+    """WebP/AVIF-варианты изображений рядом с оригиналом и srcset в API"""
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.media_root = Path(media_root.name)
+
+    def upload(self, name, width, height=400):
+        buffer = BytesIO()
+        Image.new('RGB', (width, height), 'navy').save(buffer, 'JPEG')
+        return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/jpeg')
+
+    def create_banner(self, width):
+        with self.captureOnCommitCallbacks(execute=True):
+            banner = Banner.objects.create(
+                image=self.upload('promo.jpg', width), title_ru='Баннер', title_kg='Баннер', title_en='Banner',
+                subtitle_ru='', subtitle_kg='', subtitle_en='',
+            )
+        banner.refresh_from_db()
+        return banner
+
+    def test_renditions_are_built_after_upload(self):
+        banner = self.create_banner(1200)
+        formats = banner.image_renditions['formats']
+        self.assertEqual(set(formats), set(renditions.get_formats()))
+        self.assertEqual([width for width, _ in formats['webp']], [320, 640, 1024])
+        name = formats['webp'][0][1]
+        self.assertEqual(name, 'banners/promo.320w.webp')
+        with Image.open(self.media_root / name) as image:
+            self.assertEqual(image.size, (320, 107))
+
+        data = APIClient().get('/api/banners/').json()['results'][0]
+        self.assertTrue(data['image_srcset']['webp'].startswith('http://testserver/media/banners/promo.320w.webp 320w, '))
+        self.assertIn('promo.320w.webp', image_preview(banner))
+
+    def test_small_images_and_replacement(self):
+        banner = self.create_banner(800)
+        old_names = renditions.rendition_names(banner.image_renditions)
+        self.assertEqual(len(old_names), 2 * len(renditions.get_formats()))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            banner.image = self.upload('small.jpg', 300)
+            banner.save()
+        banner.refresh_from_db()
+        self.assertEqual(banner.image_renditions, {'source': banner.image.name, 'formats': {}})
+        self.assertFalse(any((self.media_root / name).exists() for name in old_names))
+
+    def test_command_builds_missing_renditions(self):
+        banner = self.create_banner(700)
+        Banner.objects.filter(pk=banner.pk).update(image_renditions={})
+        output = StringIO()
+        call_command('generate_image_renditions', 'banner.banner', stdout=output)
+        self.assertIn('banner.banner: обработано изображений 1', output.getvalue())
+        banner.refresh_from_db()
+        self.assertEqual(banner.image_renditions['formats']['webp'][0][0], 320)
+
+
+TASK_CALLS = []
+
+
+@tasks.task(retry_delay=10)
+def record_call(value):
+    TASK_CALLS.append(value)
+
+
+@tasks.task(max_attempts=2, retry_delay=10)
+def fail_always():
+    raise RuntimeError('сбой задачи')
+
+
+class TaskQueueTests(TestCase):
+    """Очередь фоновых задач: воркер, повторы, таймаут видимости и синхронный режим"""
+
+    def setUp(self):
+        TASK_CALLS.clear()
+
+    def test_enqueue_is_one_insert_and_worker_runs_task(self):
+        with self.assertNumQueries(1):
+            queued = record_call.enqueue('a')
+        self.assertEqual(queued.name, 'core.tests.record_call')
+        self.assertEqual(TASK_CALLS, [])
+
+        self.assertEqual(tasks.run_pending(), (1, 0))
+        self.assertEqual(TASK_CALLS, ['a'])
+        self.assertFalse(QueuedTask.objects.exists())
+
+    def test_retries_with_backoff_then_fails(self):
+        queued = fail_always.enqueue()
+        now = timezone.now()
+        with self.assertLogs('core.tasks', 'ERROR'):
+            self.assertEqual(tasks.run_pending(now=now), (0, 1))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (QueuedTask.STATUS_PENDING, 1))
+        self.assertEqual(queued.run_at, now + timedelta(seconds=10))
+
+        self.assertEqual(tasks.run_pending(now=now + timedelta(seconds=5)), (0, 0))
+        with self.assertLogs('core.tasks', 'ERROR'):
+            self.assertEqual(tasks.run_pending(now=now + timedelta(seconds=11)), (0, 1))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (QueuedTask.STATUS_FAILED, 2))
+        self.assertIn('RuntimeError: сбой задачи', queued.last_error)
+
+    @override_settings(TASKS_VISIBILITY_TIMEOUT=60)
+    def test_task_of_lost_worker_is_retaken_after_visibility_timeout(self):
+        record_call.enqueue('b')
+        now = timezone.now()
+        lost = tasks.claim_tasks(10, now=now)
+        self.assertEqual(len(lost), 1)
+        self.assertEqual(tasks.run_pending(now=now + timedelta(seconds=30)), (0, 0))
+
+        self.assertEqual(tasks.run_pending(now=now + timedelta(seconds=61)), (1, 0))
+        self.assertEqual(TASK_CALLS, ['b'])
+        # Опоздавший воркер не меняет чужой результат
+        self.assertEqual(tasks._finish(lost[0], status=QueuedTask.STATUS_FAILED), 0)
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_mode_runs_after_commit_without_queue(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNone(record_call.enqueue('c'))
+            self.assertEqual(TASK_CALLS, [])
+        self.assertEqual(TASK_CALLS, ['c'])
+        self.assertFalse(QueuedTask.objects.exists())
+
+    def test_worker_command(self):
+        record_call.enqueue('d')
+        record_call.enqueue('e')
+        output = StringIO()
+        call_command('run_tasks', '--once', stdout=output)
+        self.assertIn('Выполнено задач: 2, с ошибкой: 0', output.getvalue())
+        self.assertEqual(TASK_CALLS, ['d', 'e'])
@@ -0,0 +1,12 @@
+from django.urls import path
+
+from .views import UnifiedSearchView
+
+app_name = 'core'
+
+urlpatterns = [
+    path('search/', UnifiedSearchView.as_view(), name='unified-search'),
+]
+
+# GET /api/core/search/?q={query}&type=news,careers.vacancy&lang=ru&page_size=10&cursor={cursor}
+# - единый поиск по новостям, событиям, объявлениям, вакансиям и научному разделу
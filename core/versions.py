@@ -0,0 +1,147 @@
+"""
+Реестр версий содержимого таблиц.
+
+Версия модели - время последнего изменения ее строк в микросекундах. Она
+меняется по сигналам post_save, post_delete и m2m_changed, поэтому
+проверка «изменилось ли содержимое» не требует max(updated_at), которого у
+части моделей нет (Publication, ResearchArea, Banner). Читатели получают
+версии всех нужных моделей одним get_many из кэша; ключи, которых в кэше
+нет, читаются из таблицы ContentVersion одним запросом.
+
+bump_version записывает время изменения в ContentVersion (один UPDATE) и
+сразу в кэш - как и сброс кэша ответов новостей, в момент сигнала. Ключи
+живут VERSION_CACHE_TIMEOUT, после чего перечитываются из БД, так что
+версия не теряется и не откатывается при вытеснении или очистке кэша.
+
+API:
+    get_version(model) -> int
+    get_versions(models) -> {model: int}
+    version_token(models) - строка для ключа кэша, меняется при изменении любой модели
+    last_modified(models) - время последнего изменения (timestamp)
+    bump_version(model) / bump_versions(models) - для изменений без сигналов
+        (queryset.update, bulk_create)
+    get_tracked_models() - модели, версии которых ведет реестр
+
+Отслеживаются модели приложений VERSIONED_APPS, кроме журналов просмотров
+и производных таблиц (UNVERSIONED_MODELS): они меняются на каждый просмотр
+или пересчитываются без сигналов.
+"""
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils import timezone
+
+CACHE_PREFIX = 'versions'
+VERSION_CACHE_TIMEOUT = 60 * 60
+
+VERSIONED_APPS = ('news', 'careers', 'research', 'banner')
+UNVERSIONED_MODELS = (
+    'news.newsview', 'news.pendingnewsview', 'news.newsviewbucket', 'news.newsdailyviews', 'news.trendingnews',
+    'news.trendingstate', 'news.relatednews',
+)
+
+
+def version_key(label):
+    return f'{CACHE_PREFIX}:{label}'
+
+
+def _label(model):
+    return model._meta.label_lower
+
+
+def _timestamp(moment):
+    return round(moment.timestamp() * 1_000_000)
+
+
+def _load(labels):
+    """Версии из БД; таблица без строки не менялась с появления реестра - версия 0"""
+    from .models import ContentVersion
+
+    versions = dict.fromkeys(labels, 0)
+    for label, changed_at in ContentVersion.objects.filter(label__in=labels).values_list('label', 'changed_at'):
+        versions[label] = _timestamp(changed_at)
+    return versions
+
+
+def get_versions(models):
+    """{модель: версия}: один get_many, при промахе - один запрос к БД"""
+    labels = {_label(model): model for model in models}
+    found = cache.get_many([version_key(label) for label in labels])
+    versions = {}
+    missing = []
+    for label, model in labels.items():
+        value = found.get(version_key(label))
+        if value is None:
+            missing.append(label)
+        else:
+            versions[model] = value
+    if missing:
+        loaded = _load(missing)
+        cache.set_many({version_key(label): version for label, version in loaded.items()}, VERSION_CACHE_TIMEOUT)
+        versions.update((labels[label], version) for label, version in loaded.items())
+    return versions
+
+
+def get_version(model):
+    return get_versions([model])[model]
+
+
+def version_token(models):
+    """Короткая строка, меняющаяся при изменении любой из моделей (для ключей кэша)"""
+    versions = get_versions(models)
+    return format(max(versions.values()), 'x') if len(models) == 1 else '.'.join(
+        format(versions[model], 'x') for model in models
+    )
+
+
+def last_modified(models):
+    """Время последнего изменения моделей (timestamp, секунды)"""
+    return max(get_versions(models).values()) / 1_000_000
+
+
+def bump_versions(models):
+    from .models import ContentVersion
+
+    labels = {_label(model) for model in models}
+    now = timezone.now()
+    if ContentVersion.objects.filter(label__in=labels).update(changed_at=now) < len(labels):
+        ContentVersion.objects.bulk_create(
+            [ContentVersion(label=label, changed_at=now) for label in labels], ignore_conflicts=True
+        )
+    # Новая версия сразу в кэше: читатели не обращаются к БД после изменения
+    cache.set_many({version_key(label): _timestamp(now) for label in labels}, VERSION_CACHE_TIMEOUT)
+
+
+def bump_version(model):
+    bump_versions([model])
+
+
+def _bump_sender(sender, **kwargs):
+    bump_version(sender)
+
+
+def _bump_m2m(sender, instance, action, model, **kwargs):
+    if action.startswith('post_'):
+        bump_versions([type(instance), model, sender])
+
+
+def get_tracked_models():
+    """Модели, версии которых ведет реестр"""
+    return [
+        model
+        for app_label in VERSIONED_APPS
+        for model in apps.get_app_config(app_label).get_models()
+        if _label(model) not in UNVERSIONED_MODELS
+    ]
+
+
+def track_models(models):
+    """Подписывает модели на сигналы изменения; связи many-to-many - через промежуточные таблицы"""
+    for model in models:
+        if _label(model) in UNVERSIONED_MODELS:
+            continue
+        uid = f'{CACHE_PREFIX}:{_label(model)}'
+        post_save.connect(_bump_sender, sender=model, dispatch_uid=uid)
+        post_delete.connect(_bump_sender, sender=model, dispatch_uid=uid)
+        for field in model._meta.local_many_to_many:
+            m2m_changed.connect(_bump_m2m, sender=field.remote_field.through, dispatch_uid=f'{uid}:{field.name}')
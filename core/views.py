@@ -0,0 +1,116 @@
+from rest_framework import generics, status
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from . import search
+from .language import get_request_language
+
+
+class UnifiedSearchView(generics.GenericAPIView):
+    """
+    Единый поиск по всем зарегистрированным типам контента.
+
+    Параметры:
+    - q - запрос (минимум 2 символа);
+    - type - типы через запятую: метка индекса (news.event) или приложение (research);
+    - lang - язык выдачи; совпадения на этом языке ранжируются выше
+      (по умолчанию - язык запроса);
+    - page_size - размер страницы (по умолчанию 10, максимум 50);
+    - cursor - курсор следующей страницы из поля next_cursor.
+
+    Фасеты по типам считаются без учета фильтра type, чтобы клиент мог
+    показать количество результатов в каждой вкладке одним запросом.
+    """
+    default_page_size = 10
+    max_page_size = 50
+    cursor_query_param = 'cursor'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get('page_size', self.default_page_size))
+        except ValueError:
+            return self.default_page_size
+        return min(max(1, page_size), self.max_page_size)
+
+    def get_content_types(self, request):
+        """Выбранные типы контента; ValueError для неизвестного типа"""
+        value = request.query_params.get('type', '')
+        if not value:
+            return list(search.registry)
+
+        content_types = []
+        for item in filter(None, (part.strip() for part in value.split(','))):
+            matched = [
+                label for label in search.registry
+                if label == item or label.split('.')[0] == item
+            ]
+            if not matched:
+                raise ValueError(f'Неизвестный тип контента: {item}')
+            content_types.extend(label for label in matched if label not in content_types)
+        return content_types
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        if len(query) < 2:
+            return Response(
+                {'error': 'Поисковый запрос должен содержать минимум 2 символа'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            content_types = self.get_content_types(request)
+            cursor = request.query_params.get(self.cursor_query_param)
+            after = search.decode_cursor(cursor) if cursor else None
+        except ValueError as exc:
+            return Response({'error': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        language = get_request_language(request)
+        page_size = self.get_page_size(request)
+
+        hits = search.search(
+            query, content_types, limit=page_size + 1, boost_language=language, after=after
+        )
+        has_next = len(hits) > page_size
+        hits = hits[:page_size]
+
+        querysets = {label: search.registry[label].get_result_queryset() for label in content_types}
+        results = []
+        for hit, obj in search.load_objects(hits, querysets):
+            results.append({
+                'type': hit.content_type,
+                'id': obj.pk,
+                **search.registry[hit.content_type].serialize(obj, language),
+            })
+
+        # Количество по всем типам одним запросом - и для фасетов, и для total
+        counts = search.count(query)
+        next_cursor = search.encode_cursor(hits[-1]) if has_next else None
+        return Response({
+            'query': query,
+            'language': language,
+            'results': results,
+            'facets': self.get_facets(counts, content_types),
+            'total': sum(counts.get(label, 0) for label in content_types),
+            'next_cursor': next_cursor,
+            'next': self.get_next_link(request, next_cursor),
+        })
+
+    def get_facets(self, counts, content_types):
+        return {
+            'type': [
+                {
+                    'value': label,
+                    'label': index.verbose_name,
+                    'count': counts.get(label, 0),
+                    'selected': label in content_types,
+                }
+                for label, index in search.registry.items()
+            ],
+        }
+
+    def get_next_link(self, request, next_cursor):
+        if next_cursor is None:
+            return None
+        url = request.build_absolute_uri()
+        url = remove_query_param(url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, next_cursor)
@@ -5,6 +5,8 @@ from django.urls import reverse
 from django.utils.safestring import mark_safe
 from django.utils import timezone
 
+from core import renditions, versions
+
 class SalymbekovAdminSite(AdminSite):
     site_header = "🎓 Университет Салымбекова"
     site_title = "Админ-панель"
@@ -60,6 +62,12 @@ class BaseModelAdmin(admin.ModelAdmin):
         return '-'
     colored_status.short_description = 'Статус'
     
+    def response_action(self, request, queryset):
+        """Массовые действия меняют строки через queryset.update без сигналов"""
+        response = super().response_action(request, queryset)
+        versions.bump_version(self.model)
+        return response
+    
     class Media:
         css = {
             'all': ('admin/css/custom_admin.css',)
@@ -71,6 +79,11 @@ class TranslationAdminMixin:
     pass
 
 # Утилитные функции
+def preview_url(obj, field_name='image'):
+    """URL превью: наименьший вариант изображения (core.renditions), иначе оригинал"""
+    thumbnail = renditions.thumbnail_url(getattr(obj, renditions.get_map_field(field_name), None))
+    return thumbnail or getattr(obj, field_name).url
+
 def image_preview(obj, field_name='image', max_height=100):
     """Безопасное отображение превью изображения"""
     if not obj or not hasattr(obj, field_name):
@@ -85,7 +98,7 @@ def image_preview(obj, field_name='image', max_height=100):
             '<img src="{}" style="max-height: {}px; max-width: 150px; '
             'border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); '
             'object-fit: cover;" />',
-            image_field.url, max_height
+            preview_url(obj, field_name), max_height
         )
     except:
         return mark_safe('<span style="color: #ef4444;">Ошибка загрузки</span>')
@@ -3,7 +3,8 @@ from django.utils.html import format_html
 from django.utils import timezone
 from django.db import models
 from django.forms import Textarea
-from core_admin import BaseModelAdmin, TranslationAdminMixin, image_preview, format_date_field
+from core import search
+from core_admin import BaseModelAdmin, TranslationAdminMixin, image_preview, format_date_field, preview_url
 from .models import (
     News, NewsCategory, Event, Announcement, 
     NewsTag, NewsTagRelation, NewsView
@@ -143,7 +144,7 @@ class NewsAdmin(BaseModelAdmin, TranslationAdminMixin):
                 '<img src="{}" style="max-height: 80px; max-width: 120px; '
                 'border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1); '
                 'object-fit: cover;" />',
-                obj.image.url
+                preview_url(obj)
             )
         elif obj.image_url:
             return format_html(
@@ -179,12 +180,13 @@ class NewsAdmin(BaseModelAdmin, TranslationAdminMixin):
     actions = ['make_published', 'make_unpublished', 'make_featured', 'make_pinned']
     
     def make_published(self, request, queryset):
-        updated = queryset.update(is_published=True)
+        # Публикация меняет видимость в поиске: документы индекса обновляются
+        updated = search.update_indexed(queryset, is_published=True)
         self.message_user(request, f'✅ Опубликовано {updated} новостей.')
     make_published.short_description = "📢 Опубликовать выбранные новости"
     
     def make_unpublished(self, request, queryset):
-        updated = queryset.update(is_published=False)
+        updated = search.update_indexed(queryset, is_published=False)
         self.message_user(request, f'⏸️ Сняты с публикации {updated} новостей.')
     make_unpublished.short_description = "⏸️ Снять с публикации выбранные новости"
     
@@ -0,0 +1,114 @@
+"""
+Кэш ответов публичных эндпоинтов новостей.
+
+Ключ строится из пути, query string и языка запроса. Инвалидация выполняется
+сменой поколения: ключи содержат версии таблиц контента (core.versions) -
+те же, из которых строится ETag, поэтому после изменения контента, в том
+числе без сигналов (массовые действия админки, команды), старые записи
+просто перестают читаться и вытесняются по таймауту, а клиент с прежним
+ETag получает новый ответ, а не 304 на устаревшее тело. Ответы, зависящие
+от неверсионируемых таблиц, добавляют в ключ их явно меняемые версии
+(cache_response(models=...)).
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from core import versions
+from core.language import get_request_language
+
+from .models import News, NewsCategory, NewsTag, NewsTagRelation, Event, Announcement
+
+CACHE_PREFIX = 'news:response'
+HITS_KEY = f'{CACHE_PREFIX}:hits'
+MISSES_KEY = f'{CACHE_PREFIX}:misses'
+
+
+def get_cache_timeout():
+    return getattr(settings, 'NEWS_RESPONSE_CACHE_TIMEOUT', 300)
+
+
+# Таблицы, от которых зависят ответы новостей: ключи кэша ответов и ETag (core.conditional)
+NEWS_CONTENT_MODELS = (News, NewsCategory, NewsTag, NewsTagRelation, Event, Announcement)
+
+
+def get_cache_version(models=NEWS_CONTENT_MODELS):
+    """Текущее поколение кэша - версии таблиц контента новостей"""
+    return versions.version_token(models)
+
+
+def invalidate_response_cache():
+    """
+    Сбрасывает все закэшированные ответы новостей (и их ETag) после
+    изменений без сигналов; сигналы меняют версии сами.
+    """
+    versions.bump_version(News)
+
+
+def build_cache_key(request, models=NEWS_CONTENT_MODELS):
+    query = sorted(request.query_params.lists())
+    # Формат ответа может выбираться заголовком Accept, а не только ?format=
+    renderer = getattr(request, 'accepted_renderer', None)
+    raw = f'{request.path}?{query}:{getattr(renderer, "format", "")}'
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f'{CACHE_PREFIX}:{get_cache_version(models)}:{get_request_language(request)}:{digest}'
+
+
+def _increment(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key)
+
+
+def get_cache_stats():
+    """Счетчики попаданий и промахов кэша ответов"""
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else 0.0,
+    }
+
+
+def reset_cache_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
+
+
+def cache_response(view_method=None, *, models=NEWS_CONTENT_MODELS):
+    """
+    Кэширует данные ответа GET-запросов анонимных пользователей.
+    Применяется к методам ViewSet (list и @action), под декоратором @action;
+    models - таблицы, версии которых входят в ключ.
+    """
+    if view_method is None:
+        return lambda method: cache_response(method, models=models)
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return view_method(self, request, *args, **kwargs)
+
+        key = build_cache_key(request, models)
+        data = cache.get(key)
+        if data is not None:
+            _increment(HITS_KEY)
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        _increment(MISSES_KEY)
+        response = view_method(self, request, *args, **kwargs)
+        # Потоковые ответы (полные выгрузки) не кэшируются
+        if response.status_code == 200 and isinstance(response, Response):
+            cache.set(key, response.data, get_cache_timeout())
+        response['X-Cache'] = 'MISS'
+        return response
+
+    return wrapper
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from core import versions
+from news.cache import invalidate_response_cache
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает количество слов и время чтения для существующих новостей'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Количество новостей, обновляемых за один запрос'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        fields = ['word_count_ru', 'word_count_kg', 'word_count_en', 'read_time']
+
+        batch = []
+        updated = 0
+        queryset = News.objects.only('id', *News.CONTENT_FIELDS).order_by('id')
+        for news in queryset.iterator(chunk_size=batch_size):
+            news.update_text_metrics()
+            batch.append(news)
+            if len(batch) >= batch_size:
+                News.objects.bulk_update(batch, fields)
+                updated += len(batch)
+                batch = []
+
+        if batch:
+            News.objects.bulk_update(batch, fields)
+            updated += len(batch)
+
+        # bulk_update не отправляет сигналы: сбрасываем ETag и кэш ответов сами
+        if updated:
+            versions.bump_version(News)
+            invalidate_response_cache()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено новостей: {updated}')
+        )
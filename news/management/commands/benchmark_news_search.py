@@ -0,0 +1,98 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from core import search
+from news.models import News, NewsCategory
+
+# Тематические слова встречаются редко, остальной текст - из большого словаря
+TOPIC_WORDS = (
+    'университет студент наука конференция стипендия лекция семинар экзамен '
+    'факультет исследование грант проект лаборатория кафедра выпускник олимпиада '
+    'university student science research grant lecture seminar faculty project'
+).split()
+SYLLABLES = 'ка ра ло ми ту не со да ви ре по жа ны бе ку ли ма то зе ри'.split()
+TOPIC_RATE = 0.01
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает поиск LIKE по текстовым полям новостей и поиск по полнотекстовому индексу. '
+        'Создает синтетические новости в транзакции, которая откатывается после замера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Количество синтетических новостей')
+        parser.add_argument('--repeat', type=int, default=5, help='Повторов каждого запроса')
+        parser.add_argument('--queries', nargs='*', default=['грант', 'олимпиада кафедра', 'research'])
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.run(options)
+            transaction.set_rollback(True)
+
+    def run(self, options):
+        count = self.create_news(options['rows'])
+        started = time.perf_counter()
+        search.rebuild_index(['news.news'])
+        self.stdout.write(f'Индексация {count} новостей: {time.perf_counter() - started:.2f} с')
+
+        for query in options['queries']:
+            like = self.measure(lambda: self.like_search(query), options['repeat'])
+            fts = self.measure(lambda: self.index_search(query), options['repeat'])
+            self.stdout.write(
+                f'"{query}": LIKE {like * 1000:.1f} мс, индекс {fts * 1000:.1f} мс, '
+                f'ускорение x{like / fts if fts else 0:.1f}'
+            )
+
+    def create_news(self, count):
+        category, _ = NewsCategory.objects.get_or_create(
+            name=NewsCategory.NEWS,
+            defaults={'slug': 'news', 'name_ru': 'Новости', 'name_kg': 'Жаңылыктар', 'name_en': 'News'}
+        )
+        rng = random.Random(0)
+        vocabulary = list({
+            ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(20000)
+        })
+
+        def word():
+            return rng.choice(TOPIC_WORDS) if rng.random() < TOPIC_RATE else rng.choice(vocabulary)
+
+        def text(size):
+            return ' '.join(word() for _ in range(size))
+
+        for start in range(0, count, 1000):
+            News.objects.bulk_create([
+                News(
+                    title_ru=text(6), title_kg=text(6), title_en=text(6),
+                    slug=f'benchmark-search-{index}',
+                    summary_ru=text(30), summary_kg=text(30), summary_en=text(30),
+                    content_ru=text(200), content_kg=text(50), content_en=text(50),
+                    category=category,
+                )
+                for index in range(start, min(start + 1000, count))
+            ])
+        return count
+
+    def like_search(self, query):
+        """Прежняя схема: icontains по всем языковым полям + отдельный count()"""
+        condition = Q()
+        for language in search.LANGUAGES:
+            for field in ('title', 'summary', 'content'):
+                condition |= Q(**{f'{field}_{language}__icontains': query})
+        queryset = News.objects.filter(condition, is_published=True)
+        list(queryset.values_list('pk', flat=True)[:5])
+        queryset.count()
+
+    def index_search(self, query):
+        search.search(query, ['news.news'], limit=5)
+        search.count(query, ['news.news'])
+
+    def measure(self, func, repeat):
+        func()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - started) / repeat
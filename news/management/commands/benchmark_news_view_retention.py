@@ -0,0 +1,96 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import override_settings
+from django.utils import timezone
+from news import retention
+from news.models import News, NewsCategory, NewsView
+
+
+class Command(BaseCommand):
+    help = (
+        'Моделирует накопление просмотров новостей по дням без очистки и со сверткой '
+        'и удалением старых строк: размер таблицы NewsView и задержка вставки. '
+        'Данные создаются в транзакции, которая откатывается после замера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=60, help='Количество моделируемых дней')
+        parser.add_argument('--views-per-day', type=int, default=1000, help='Новых просмотров в день')
+        parser.add_argument('--retention-days', type=int, default=14, help='Срок хранения сырых просмотров')
+        parser.add_argument('--news', type=int, default=20, help='Количество тестовых новостей')
+        parser.add_argument('--report-every', type=int, default=10, help='Период отчета, дней')
+
+    def handle(self, *args, **options):
+        for label, compact in (('без очистки', False), ('со сверткой', True)):
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            with transaction.atomic():
+                self.run_mode(compact, options)
+                transaction.set_rollback(True)
+
+    def run_mode(self, compact, options):
+        news_ids = self.create_news(options['news'])
+        start = timezone.now() - timedelta(days=options['days'])
+        sequence = 0
+        latencies = []
+
+        with override_settings(NEWS_VIEW_RETENTION_DAYS=options['retention_days']):
+            for day in range(options['days']):
+                day_started = start + timedelta(days=day)
+                for index in range(options['views_per_day']):
+                    sequence += 1
+                    # Уникальный IP на каждый просмотр - худший случай для индекса
+                    ip_address = f'10.{sequence // 65536 % 256}.{sequence // 256 % 256}.{sequence % 256}'
+                    started = time.perf_counter()
+                    NewsView.objects.get_or_create(
+                        news_id=news_ids[index % len(news_ids)], ip_address=ip_address,
+                        defaults={'viewed_at': day_started + timedelta(seconds=index)}
+                    )
+                    latencies.append((time.perf_counter() - started) * 1000)
+
+                if compact:
+                    retention.compact_views(now=day_started + timedelta(days=1))
+
+                if (day + 1) % options['report_every'] == 0 or day + 1 == options['days']:
+                    latencies.sort()
+                    self.stdout.write(
+                        f'день {day + 1:>4}: строк NewsView {NewsView.objects.count():>8}, '
+                        f'размер {self.table_size()}, вставка среднее {statistics.mean(latencies):.3f} мс, '
+                        f'p95 {latencies[int(len(latencies) * 0.95)]:.3f} мс'
+                    )
+                    latencies = []
+
+    def create_news(self, count):
+        category, _ = NewsCategory.objects.get_or_create(
+            name=NewsCategory.NEWS,
+            defaults={'slug': 'news', 'name_ru': 'Новости', 'name_kg': 'Жаңылыктар', 'name_en': 'News'}
+        )
+        return [
+            News.objects.create(
+                title_ru=f'Бенчмарк {index}', title_kg=f'Бенчмарк {index}', title_en=f'Benchmark {index}',
+                slug=f'benchmark-retention-{index}',
+                summary_ru='-', summary_kg='-', summary_en='-',
+                content_ru='-', content_kg='-', content_en='-',
+                category=category,
+            ).id
+            for index in range(count)
+        ]
+
+    def table_size(self):
+        """Страницы таблицы и индексов NewsView (SQLite dbstat), если доступно"""
+        if connection.vendor != 'sqlite':
+            return 'н/д'
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT SUM(pgsize) FROM dbstat WHERE name = %s "
+                    "OR name IN (SELECT name FROM sqlite_master WHERE tbl_name = %s AND type = 'index')",
+                    [NewsView._meta.db_table, NewsView._meta.db_table]
+                )
+                size = cursor.fetchone()[0] or 0
+        except Exception:
+            return 'н/д'
+        return f'{size / 1024:>8.0f} КБ'
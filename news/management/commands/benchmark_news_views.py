@@ -0,0 +1,79 @@
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from news import view_counter
+from news.models import News, NewsCategory
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет пропускную способность детальной страницы новости '
+        'с синхронным и буферизованным учетом просмотров. '
+        'Данные создаются в транзакции, которая откатывается после замера, '
+        'кэш подменяется отдельным локальным.'
+    )
+
+    # Отдельный кэш: замер не сбрасывает кэш ответов и версий работающего сайта
+    BENCHMARK_CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'benchmark-news-views',
+        },
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Количество запросов на режим')
+        parser.add_argument('--news', type=int, default=20, help='Количество тестовых новостей')
+
+    def handle(self, *args, **options):
+        results = {}
+        for label, buffering in (('sync', False), ('buffered', True)):
+            # Запросы выполняются в этом же потоке: другие соединения не видят
+            # данных неподтвержденной транзакции
+            with override_settings(CACHES=self.BENCHMARK_CACHES), transaction.atomic():
+                # Очищается только кэш замера
+                cache.clear()
+                slugs = self.create_news(options['news'])
+                results[label] = self.run_mode(buffering, slugs, options['requests'])
+                transaction.set_rollback(True)
+
+        for label, (elapsed, rps) in results.items():
+            self.stdout.write(f'{label:>9}: {elapsed:.2f} с, {rps:.0f} запросов/с')
+        if results['sync'][1]:
+            self.stdout.write(
+                self.style.SUCCESS(f'Ускорение: x{results["buffered"][1] / results["sync"][1]:.2f}')
+            )
+
+    def create_news(self, count):
+        category, _ = NewsCategory.objects.get_or_create(
+            name=NewsCategory.NEWS,
+            defaults={'slug': 'news', 'name_ru': 'Новости', 'name_kg': 'Жаңылыктар', 'name_en': 'News'}
+        )
+        slugs = []
+        for index in range(count):
+            news = News.objects.create(
+                title_ru=f'Бенчмарк {index}', title_kg=f'Бенчмарк {index}', title_en=f'Benchmark {index}',
+                slug=f'benchmark-views-{index}',
+                summary_ru='-', summary_kg='-', summary_en='-',
+                content_ru='текст ' * 300, content_kg='-', content_en='-',
+                category=category,
+            )
+            slugs.append(news.slug)
+        return slugs
+
+    def run_mode(self, buffering, slugs, total_requests):
+        client = Client()
+        with override_settings(NEWS_VIEW_BUFFERING=buffering, NEWS_VIEW_FLUSH_INTERVAL=None):
+            started = time.perf_counter()
+            for index in range(total_requests):
+                # Уникальный IP на каждый запрос - худший случай для записи
+                ip_address = f'10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}'
+                client.get(f'/api/news/{slugs[index % len(slugs)]}/', REMOTE_ADDR=ip_address)
+            if buffering:
+                view_counter.flush_views()
+            elapsed = time.perf_counter() - started
+
+        return elapsed, total_requests / elapsed if elapsed else 0
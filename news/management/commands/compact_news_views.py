@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from news import retention
+
+
+class Command(BaseCommand):
+    help = (
+        'Сворачивает просмотры новостей по дням (число и уникальные посетители) '
+        'и удаляет сырые просмотры старше NEWS_VIEW_RETENTION_DAYS'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=retention.PRUNE_BATCH_SIZE,
+            help='Количество строк, удаляемых за одну транзакцию'
+        )
+
+    def handle(self, *args, **options):
+        days, deleted = retention.compact_views(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Свернуто дней: {days}, удалено сырых просмотров: {deleted}')
+        )
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from news import view_counter
+
+
+class Command(BaseCommand):
+    help = 'Сбрасывает буфер просмотров новостей в базу данных'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=view_counter.FLUSH_BATCH_SIZE,
+            help='Количество записей буфера, обрабатываемых за одну транзакцию'
+        )
+
+    def handle(self, *args, **options):
+        pending = view_counter.pending_views_count()
+        created = view_counter.flush_views(batch_size=options['batch_size'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано записей буфера: {pending}, новых просмотров: {created}')
+        )
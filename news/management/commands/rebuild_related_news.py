@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+from news import related
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает связанные новости для всех опубликованных новостей'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Размер пачки при записи')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = related.rebuild_related_news(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Связанные новости пересчитаны для {count} новостей за {time.perf_counter() - started:.1f} с'
+        ))
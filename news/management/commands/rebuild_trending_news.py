@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from news import trending
+from news.models import NewsViewBucket, TrendingNews
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает почасовые корзины просмотров и рейтинги популярных новостей по NewsView'
+
+    def handle(self, *args, **options):
+        trending.rebuild_trending()
+        self.stdout.write(self.style.SUCCESS(
+            f'Корзин просмотров: {NewsViewBucket.objects.count()}, '
+            f'строк рейтинга: {TrendingNews.objects.count()}'
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_remove_event_location_remove_news_author_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='news',
+            name='read_time',
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name='Время чтения (мин)'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='word_count_en',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество слов (английский)'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='word_count_kg',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество слов (кыргызский)'),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='word_count_ru',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество слов (русский)'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:47
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_news_text_metrics'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='newsview',
+            name='viewed_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False, verbose_name='Дата просмотра'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_newsview_viewed_at_default'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['published_at', 'id'], name='news_news_publish_164ab9_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0006_news_cursor_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['priority', 'deadline'], name='announcement_priority_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['announcement_type', 'priority', 'deadline'], name='announcement_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(condition=models.Q(('target_students', True)), fields=['priority', 'deadline'], name='announcement_students_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['status', 'event_date', 'event_time'], name='event_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['event_date', 'event_time'], name='event_date_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(fields=['category', 'published_at'], name='news_category_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['published_at'], name='news_featured_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='news',
+            index=models.Index(condition=models.Q(('is_pinned', True)), fields=['published_at'], name='news_pinned_published_idx'),
+        ),
+    ]
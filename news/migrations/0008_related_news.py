@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0007_api_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedNews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(verbose_name='Оценка связи')),
+                ('position', models.PositiveSmallIntegerField(verbose_name='Позиция')),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_entries', to='news.news')),
+                ('related', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_backrefs', to='news.news')),
+            ],
+            options={
+                'verbose_name': 'Связанная новость',
+                'verbose_name_plural': 'Связанные новости',
+                'indexes': [models.Index(fields=['news', 'position'], name='related_news_position_idx')],
+                'unique_together': {('news', 'related')},
+            },
+        ),
+    ]
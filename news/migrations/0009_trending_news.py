@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0008_related_news'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsViewBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField(verbose_name='Час')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Просмотры')),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_buckets', to='news.news')),
+            ],
+            options={
+                'verbose_name': 'Просмотры за час',
+                'verbose_name_plural': 'Просмотры по часам',
+                'indexes': [models.Index(fields=['hour'], name='news_view_bucket_hour_idx')],
+                'unique_together': {('news', 'hour')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TrendingNews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.CharField(choices=[('24h', '24 часа'), ('7d', '7 дней'), ('30d', '30 дней')], max_length=3, verbose_name='Окно')),
+                ('score', models.FloatField(default=0, verbose_name='Оценка')),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trending', to='news.news')),
+            ],
+            options={
+                'verbose_name': 'Популярная новость',
+                'verbose_name_plural': 'Популярные новости',
+                'indexes': [models.Index(fields=['window', '-score'], name='trending_news_score_idx')],
+                'unique_together': {('window', 'news')},
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0009_trending_news'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsDailyViews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(verbose_name='День')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='Просмотры')),
+                ('visitors', models.BinaryField(verbose_name='Скетч уникальных посетителей')),
+            ],
+            options={
+                'verbose_name': 'Просмотры за день',
+                'verbose_name_plural': 'Просмотры по дням',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='newsview',
+            index=models.Index(fields=['viewed_at'], name='news_view_viewed_at_idx'),
+        ),
+        migrations.AddField(
+            model_name='newsdailyviews',
+            name='news',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_views', to='news.news'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='newsdailyviews',
+            unique_together={('news', 'date')},
+        ),
+    ]
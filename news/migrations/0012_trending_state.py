@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0011_image_renditions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.CharField(choices=[('24h', '24 часа'), ('7d', '7 дней'), ('30d', '30 дней')], max_length=3, unique=True, verbose_name='Окно')),
+                ('epoch', models.DateTimeField(verbose_name='Опорный час')),
+                ('cutoff', models.DateTimeField(verbose_name='Граница окна')),
+            ],
+            options={
+                'verbose_name': 'Состояние рейтинга',
+                'verbose_name_plural': 'Состояния рейтинга',
+            },
+        ),
+    ]
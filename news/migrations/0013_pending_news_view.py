@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:41
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0012_trending_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingNewsView',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ip_address', models.GenericIPAddressField(verbose_name='IP адрес')),
+                ('user_agent', models.TextField(blank=True, verbose_name='User Agent')),
+                ('viewed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата просмотра')),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_views', to='news.news')),
+            ],
+            options={
+                'verbose_name': 'Просмотр в буфере',
+                'verbose_name_plural': 'Просмотры в буфере',
+            },
+        ),
+    ]
@@ -53,6 +53,7 @@ class News(models.Model):
     content_en = models.TextField(verbose_name='Полное содержание (английский)')
     
     image = models.ImageField(upload_to='news/images/', blank=True, null=True, verbose_name='Изображение')
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name='Варианты изображения')
     image_url = models.URLField(blank=True, null=True, verbose_name='URL изображения')
     
     category = models.ForeignKey(NewsCategory, on_delete=models.CASCADE, verbose_name='Категория')
@@ -74,14 +75,61 @@ class News(models.Model):
     # Счетчики
     views_count = models.PositiveIntegerField(default=0, verbose_name='Количество просмотров')
     
+    # Предрасчитанные метрики текста (обновляются при сохранении)
+    word_count_ru = models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество слов (русский)')
+    word_count_kg = models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество слов (кыргызский)')
+    word_count_en = models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество слов (английский)')
+    read_time = models.PositiveIntegerField(default=1, editable=False, verbose_name='Время чтения (мин)')
+    
+    CONTENT_FIELDS = ('content_ru', 'content_kg', 'content_en')
+    WORDS_PER_MINUTE = 200
+    
     class Meta:
         verbose_name = 'Новость'
         verbose_name_plural = 'Новости'
         ordering = ['-published_at']
+        indexes = [
+            # Лента и курсорная пагинация: ORDER BY published_at, id.
+            # is_published в индекс не входит: SQLite не использует индекс
+            # для условия WHERE is_published без сравнения.
+            models.Index(fields=['published_at', 'id']),
+            # Списки категории: WHERE category_id ORDER BY published_at
+            models.Index(fields=['category', 'published_at'], name='news_category_published_idx'),
+            # featured/pinned: частичные индексы, условие совпадает с WHERE запроса
+            models.Index(
+                fields=['published_at'], name='news_featured_published_idx',
+                condition=models.Q(is_featured=True),
+            ),
+            models.Index(
+                fields=['published_at'], name='news_pinned_published_idx',
+                condition=models.Q(is_pinned=True),
+            ),
+        ]
     
     def __str__(self):
         return self.title_ru
     
+    def save(self, *args, **kwargs):
+        # Пересчитываем метрики, только если содержимое загружено (не defer)
+        if not self.get_deferred_fields().intersection(self.CONTENT_FIELDS):
+            self.update_text_metrics()
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {
+                    'word_count_ru', 'word_count_kg', 'word_count_en', 'read_time'
+                }
+        super().save(*args, **kwargs)
+    
+    def update_text_metrics(self):
+        """Пересчитывает количество слов по языкам и время чтения"""
+        self.word_count_ru = len((self.content_ru or '').split())
+        self.word_count_kg = len((self.content_kg or '').split())
+        self.word_count_en = len((self.content_en or '').split())
+        
+        # Время чтения считаем по первому заполненному языку (200 слов в минуту)
+        word_count = self.word_count_ru or self.word_count_kg or self.word_count_en
+        self.read_time = max(1, word_count // self.WORDS_PER_MINUTE)
+    
     @property
     def image_url_or_default(self):
         """Возвращает URL изображения или дефолтный URL"""
@@ -137,6 +185,12 @@ class Event(models.Model):
         verbose_name = 'Событие'
         verbose_name_plural = 'События'
         ordering = ['event_date', 'event_time']
+        indexes = [
+            # upcoming/past: WHERE status ORDER BY event_date, event_time
+            models.Index(fields=['status', 'event_date', 'event_time'], name='event_status_date_idx'),
+            # Лента и this_month: диапазон event_date в порядке списка
+            models.Index(fields=['event_date', 'event_time'], name='event_date_time_idx'),
+        ]
     
     def __str__(self):
         return f"{self.news.title_ru} - {self.event_date}"
@@ -184,6 +238,17 @@ class Announcement(models.Model):
         verbose_name = 'Объявление'
         verbose_name_plural = 'Объявления'
         ordering = ['-priority', '-deadline']
+        indexes = [
+            # Список и urgent: ORDER BY priority, deadline
+            models.Index(fields=['priority', 'deadline'], name='announcement_priority_idx'),
+            # by_type: WHERE announcement_type ORDER BY priority, deadline
+            models.Index(fields=['announcement_type', 'priority', 'deadline'], name='announcement_type_idx'),
+            # for_students: частичный индекс по target_students
+            models.Index(
+                fields=['priority', 'deadline'], name='announcement_students_idx',
+                condition=models.Q(target_students=True),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.news.title_ru} ({self.get_priority_display()})"
@@ -201,15 +266,52 @@ class Announcement(models.Model):
 
 class NewsView(models.Model):
     """Модель для отслеживания просмотров новостей"""
+    # Длиннее User-Agent обрезается: полный заголовок не нужен, а строк много
+    USER_AGENT_MAX_LENGTH = 256
+    
     news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='news_views')
     ip_address = models.GenericIPAddressField(verbose_name='IP адрес')
     user_agent = models.TextField(blank=True, verbose_name='User Agent')
-    viewed_at = models.DateTimeField(auto_now_add=True, verbose_name='Дата просмотра')
+    # default вместо auto_now_add: буфер просмотров сохраняет реальное время просмотра
+    viewed_at = models.DateTimeField(default=timezone.now, editable=False, verbose_name='Дата просмотра')
     
     class Meta:
         verbose_name = 'Просмотр новости'
         verbose_name_plural = 'Просмотры новостей'
         unique_together = ['news', 'ip_address']  # Один просмотр с одного IP
+        indexes = [
+            # Свертка по дням и удаление старых строк: WHERE viewed_at
+            models.Index(fields=['viewed_at'], name='news_view_viewed_at_idx'),
+        ]
+
+
+class PendingNewsView(models.Model):
+    """
+    Просмотр в буфере, еще не записанный в NewsView (см. news.view_counter).
+    Таблица общая для всех процессов, в отличие от локального кэша.
+    """
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='pending_views')
+    ip_address = models.GenericIPAddressField(verbose_name='IP адрес')
+    user_agent = models.TextField(blank=True, verbose_name='User Agent')
+    viewed_at = models.DateTimeField(default=timezone.now, verbose_name='Дата просмотра')
+    
+    class Meta:
+        verbose_name = 'Просмотр в буфере'
+        verbose_name_plural = 'Просмотры в буфере'
+
+
+class NewsDailyViews(models.Model):
+    """Свертка просмотров новости за день (см. news.retention)"""
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='daily_views')
+    date = models.DateField(verbose_name='День')
+    views = models.PositiveIntegerField(default=0, verbose_name='Просмотры')
+    # HyperLogLog IP-адресов за день (core.hyperloglog)
+    visitors = models.BinaryField(verbose_name='Скетч уникальных посетителей')
+    
+    class Meta:
+        unique_together = ['news', 'date']
+        verbose_name = 'Просмотры за день'
+        verbose_name_plural = 'Просмотры по дням'
 
 
 class NewsTag(models.Model):
@@ -237,3 +339,71 @@ class NewsTagRelation(models.Model):
         unique_together = ['news', 'tag']
         verbose_name = 'Связь новости с тегом'
         verbose_name_plural = 'Связи новостей с тегами'
+
+
+class RelatedNews(models.Model):
+    """Предрасчитанные связанные новости (см. news.related)"""
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='related_entries')
+    related = models.ForeignKey(News, on_delete=models.CASCADE, related_name='related_backrefs')
+    score = models.FloatField(verbose_name='Оценка связи')
+    position = models.PositiveSmallIntegerField(verbose_name='Позиция')
+    
+    class Meta:
+        unique_together = ['news', 'related']
+        verbose_name = 'Связанная новость'
+        verbose_name_plural = 'Связанные новости'
+        indexes = [
+            models.Index(fields=['news', 'position'], name='related_news_position_idx'),
+        ]
+
+
+class NewsViewBucket(models.Model):
+    """Число просмотров новости за час (см. news.trending)"""
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='view_buckets')
+    hour = models.DateTimeField(verbose_name='Час')
+    views = models.PositiveIntegerField(default=0, verbose_name='Просмотры')
+    
+    class Meta:
+        unique_together = ['news', 'hour']
+        verbose_name = 'Просмотры за час'
+        verbose_name_plural = 'Просмотры по часам'
+        indexes = [
+            # Пересчет окна и удаление устаревших корзин: WHERE hour
+            models.Index(fields=['hour'], name='news_view_bucket_hour_idx'),
+        ]
+
+
+class TrendingNews(models.Model):
+    """Предрасчитанный рейтинг популярности новости в окне (см. news.trending)"""
+    WINDOW_CHOICES = [
+        ('24h', '24 часа'),
+        ('7d', '7 дней'),
+        ('30d', '30 дней'),
+    ]
+    
+    news = models.ForeignKey(News, on_delete=models.CASCADE, related_name='trending')
+    window = models.CharField(max_length=3, choices=WINDOW_CHOICES, verbose_name='Окно')
+    score = models.FloatField(default=0, verbose_name='Оценка')
+    
+    class Meta:
+        unique_together = ['window', 'news']
+        verbose_name = 'Популярная новость'
+        verbose_name_plural = 'Популярные новости'
+        indexes = [
+            # popular: WHERE window ORDER BY score DESC LIMIT k
+            models.Index(fields=['window', '-score'], name='trending_news_score_idx'),
+        ]
+
+
+class TrendingState(models.Model):
+    """
+    Опорный час и граница окна рейтинга (см. news.trending). Хранится в БД
+    рядом с TrendingNews, чтобы все процессы прибавляли оценки с одним весом.
+    """
+    window = models.CharField(max_length=3, choices=TrendingNews.WINDOW_CHOICES, unique=True, verbose_name='Окно')
+    epoch = models.DateTimeField(verbose_name='Опорный час')
+    cutoff = models.DateTimeField(verbose_name='Граница окна')
+    
+    class Meta:
+        verbose_name = 'Состояние рейтинга'
+        verbose_name_plural = 'Состояния рейтинга'
@@ -0,0 +1,208 @@
+"""
+Предрасчитанные связанные новости.
+
+Для каждой опубликованной новости хранится top-N связанных (RelatedNews),
+поэтому детальная страница читает их одним запросом вместо выборки по
+категории на каждый просмотр.
+
+Оценка пары симметрична: общая категория и общие теги (тег весит больше
+категории), умноженные на близость дат публикации - вес падает вдвое
+каждые RELATED_HALF_LIFE_DAYS дней разницы. Кандидаты - по RELATED_WINDOW
+ближайших по дате новостей в каждой общей группе (категория, каждый тег):
+более далекие проигрывают им из-за затухания.
+
+Полный пересчет - rebuild_related_news() (команда rebuild_related_news).
+При публикации и изменении новости или ее тегов пересчитывается только ее
+список, а сама новость добавляется в списки кандидатов, если проходит в их
+top-N (оценка симметрична). Пересчет выполняет воркер фоновых задач
+(core.tasks) после коммита транзакции, а не запрос, сохранивший новость.
+"""
+import heapq
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.db import transaction
+
+from core.tasks import task
+
+from .models import News, NewsTagRelation, RelatedNews
+
+CATEGORY_WEIGHT = 1.0
+TAG_WEIGHT = 2.0
+RELATED_HALF_LIFE_DAYS = 30
+RELATED_WINDOW = 10
+
+Item = namedtuple('Item', 'id category_id published_at tags')
+
+
+def get_related_limit():
+    return getattr(settings, 'NEWS_RELATED_LIMIT', 3)
+
+
+def score_pair(item, other):
+    """Оценка связи двух новостей (0 - не связаны)"""
+    similarity = TAG_WEIGHT * len(item.tags & other.tags)
+    if item.category_id == other.category_id:
+        similarity += CATEGORY_WEIGHT
+    if not similarity:
+        return 0.0
+    days = abs((item.published_at - other.published_at).total_seconds()) / 86400
+    return similarity * 0.5 ** (days / RELATED_HALF_LIFE_DAYS)
+
+
+def top_related(item, candidates, limit):
+    """[(оценка, id)] лучших кандидатов; при равной оценке - более новые"""
+    scored = (
+        (score_pair(item, other), other.published_at, other.id)
+        for other in candidates if other.id != item.id
+    )
+    best = heapq.nlargest(limit, (entry for entry in scored if entry[0] > 0))
+    return [(score, news_id) for score, _, news_id in best]
+
+
+def group_keys(item):
+    yield ('category', item.category_id)
+    for tag_id in item.tags:
+        yield ('tag', tag_id)
+
+
+def build_entries(news_id, ranked):
+    return [
+        RelatedNews(news_id=news_id, related_id=related_id, score=score, position=position)
+        for position, (score, related_id) in enumerate(ranked)
+    ]
+
+
+def load_items(queryset):
+    rows = list(queryset.values_list('id', 'category_id', 'published_at'))
+    tags = defaultdict(set)
+    for news_id, tag_id in NewsTagRelation.objects.filter(
+        news_id__in=[row[0] for row in rows]
+    ).values_list('news_id', 'tag_id'):
+        tags[news_id].add(tag_id)
+    return {row[0]: Item(*row, frozenset(tags[row[0]])) for row in rows}
+
+
+def rebuild_related_news(batch_size=1000):
+    """Полный пересчет связанных новостей; возвращает число новостей"""
+    limit = get_related_limit()
+    items = load_items(News.objects.filter(is_published=True))
+
+    # Группы, упорядоченные по дате: соседи по дате - кандидаты
+    groups = defaultdict(list)
+    for item in items.values():
+        for key in group_keys(item):
+            groups[key].append(item)
+    positions = {}
+    for key, members in groups.items():
+        members.sort(key=lambda member: (member.published_at, member.id))
+        for index, member in enumerate(members):
+            positions[key, member.id] = index
+
+    entries = []
+    for item in items.values():
+        candidates = set()
+        for key in group_keys(item):
+            members = groups[key]
+            index = positions[key, item.id]
+            candidates.update(members[max(0, index - RELATED_WINDOW):index + RELATED_WINDOW + 1])
+        entries.extend(build_entries(item.id, top_related(item, candidates, limit)))
+
+    with transaction.atomic():
+        RelatedNews.objects.all().delete()
+        RelatedNews.objects.bulk_create(entries, batch_size=batch_size)
+    return len(items)
+
+
+def find_candidate_ids(item):
+    """Id ближайших по дате опубликованных новостей в каждой группе новости"""
+    published = News.objects.filter(is_published=True).exclude(id=item.id)
+    groups = [published.filter(category_id=item.category_id)]
+    groups.extend(published.filter(tags__tag_id=tag_id) for tag_id in item.tags)
+
+    candidate_ids = set()
+    for queryset in groups:
+        before = queryset.filter(published_at__lte=item.published_at).order_by('-published_at', '-id')
+        after = queryset.filter(published_at__gt=item.published_at).order_by('published_at', 'id')
+        candidate_ids.update(before.values_list('id', flat=True)[:RELATED_WINDOW])
+        candidate_ids.update(after.values_list('id', flat=True)[:RELATED_WINDOW])
+    return candidate_ids
+
+
+@task()
+def refresh_related_news(news_id, propagate=True):
+    """
+    Пересчитывает список новости. С propagate новость также добавляется в
+    списки кандидатов, если проходит в их top-N.
+    """
+    item = load_items(News.objects.filter(id=news_id, is_published=True)).get(news_id)
+    if item is None:
+        remove_related_news(news_id)
+        return
+
+    limit = get_related_limit()
+    candidates = load_items(News.objects.filter(id__in=find_candidate_ids(item)))
+    ranked = top_related(item, candidates.values(), limit)
+    entries = build_entries(news_id, ranked)
+
+    if not propagate:
+        with transaction.atomic():
+            RelatedNews.objects.filter(news_id=news_id).delete()
+            RelatedNews.objects.bulk_create(entries)
+        return
+
+    # Текущие списки кандидатов: новость вставляется по своей оценке
+    updated = [news_id]
+    lists = defaultdict(list)
+    for entry in RelatedNews.objects.filter(news_id__in=candidates).exclude(related_id=news_id):
+        lists[entry.news_id].append((entry.score, entry.related_id))
+    for other in candidates.values():
+        score = score_pair(item, other)
+        current = lists[other.id]
+        if score <= 0 or (len(current) >= limit and score <= min(current)[0]):
+            continue
+        current = sorted(current + [(score, news_id)], reverse=True)[:limit]
+        entries.extend(build_entries(other.id, current))
+        updated.append(other.id)
+
+    # Списки вне кандидатов, где была новость (сменились категория или теги):
+    # новость из них убирается, и они пересчитываются
+    stale = set(
+        RelatedNews.objects.filter(related_id=news_id).exclude(news_id__in=updated).values_list('news_id', flat=True)
+    )
+    with transaction.atomic():
+        RelatedNews.objects.filter(news_id__in=updated).delete()
+        RelatedNews.objects.filter(related_id=news_id).delete()
+        RelatedNews.objects.bulk_create(entries)
+    for other_id in stale:
+        refresh_related_news(other_id, propagate=False)
+
+
+def remove_related_news(news_id):
+    """Убирает снятую с публикации новость и пересчитывает затронутые списки"""
+    affected = set(
+        RelatedNews.objects.filter(related_id=news_id).values_list('news_id', flat=True)
+    )
+    RelatedNews.objects.filter(news_id=news_id).delete()
+    RelatedNews.objects.filter(related_id=news_id).delete()
+    for other_id in affected - {news_id}:
+        refresh_related_news(other_id, propagate=False)
+
+
+def schedule_refresh(news_id):
+    """Пересчет в фоне: удаляемая вместе с тегами новость к этому моменту уже удалена"""
+    refresh_related_news.enqueue(news_id)
+
+
+def schedule_removal(news_id):
+    """Перед удалением новости: списки, где она была, пересчитываются в фоне"""
+    holders = RelatedNews.objects.filter(related_id=news_id).values_list('news_id', flat=True)
+    for holder_id in list(holders):
+        refresh_related_news.enqueue(holder_id, propagate=False)
+
+
+def get_related_news(news):
+    """Связанные новости из предрасчета: один запрос с категорией"""
+    return News.objects.filter(
+        related_backrefs__news=news, is_published=True
+    ).select_related('category').defer(*News.CONTENT_FIELDS).order_by('related_backrefs__position')
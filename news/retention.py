@@ -0,0 +1,124 @@
+"""
+Хранение просмотров новостей: свертка по дням и удаление старых строк.
+
+NewsView хранит строку на пару (новость, IP), и без очистки таблица и ее
+уникальный индекс растут бесконечно. Завершенные дни сворачиваются в
+NewsDailyViews: число просмотров и HyperLogLog IP-адресов (уникальные
+посетители за любой период оцениваются объединением дневных скетчей).
+Затем сырые строки старше NEWS_VIEW_RETENTION_DAYS удаляются пачками,
+каждая в своей транзакции, чтобы не держать длинную блокировку.
+
+Последний свернутый день при следующем запуске сворачивается заново:
+буфер просмотров может дописать в него строки позже. Поэтому строки этого
+и более поздних дней не удаляются, даже если они старше срока хранения.
+
+После удаления сырой строки повторный просмотр с того же IP снова
+учитывается, то есть дедупликация просмотров действует в пределах срока
+хранения. Пересчет популярных (rebuild_trending_news) читает NewsView за
+30 дней, поэтому срок хранения не должен быть короче.
+"""
+from collections import defaultdict
+from datetime import datetime, time as day_time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from core.hyperloglog import HyperLogLog
+
+from .models import NewsDailyViews, NewsView
+
+PRUNE_BATCH_SIZE = 5000
+ROLLUP_CHUNK_SIZE = 5000
+
+
+def get_retention_days():
+    return getattr(settings, 'NEWS_VIEW_RETENTION_DAYS', 90)
+
+
+def day_start(date):
+    return timezone.make_aware(datetime.combine(date, day_time.min))
+
+
+def rollup_day(date):
+    """Пересчитывает свертку просмотров за день по сырым строкам"""
+    counts = defaultdict(int)
+    sketches = defaultdict(HyperLogLog)
+    rows = NewsView.objects.filter(
+        viewed_at__gte=day_start(date), viewed_at__lt=day_start(date + timedelta(days=1))
+    ).values_list('news_id', 'ip_address')
+    for news_id, ip_address in rows.iterator(chunk_size=ROLLUP_CHUNK_SIZE):
+        counts[news_id] += 1
+        sketches[news_id].add(ip_address)
+
+    with transaction.atomic():
+        NewsDailyViews.objects.filter(date=date).delete()
+        NewsDailyViews.objects.bulk_create([
+            NewsDailyViews(news_id=news_id, date=date, views=views, visitors=sketches[news_id].to_bytes())
+            for news_id, views in counts.items()
+        ])
+    return len(counts)
+
+
+def rollup_views(now=None):
+    """
+    Сворачивает завершенные дни, начиная с последнего свернутого.
+    Возвращает число обработанных дней.
+    """
+    today = timezone.localdate(now)
+    start = NewsDailyViews.objects.aggregate(last=Max('date'))['last']
+    if start is None:
+        first_view = NewsView.objects.aggregate(first=Min('viewed_at'))['first']
+        if first_view is None:
+            return 0
+        start = timezone.localdate(first_view)
+
+    days = 0
+    date = start
+    while date < today:
+        rollup_day(date)
+        date += timedelta(days=1)
+        days += 1
+    return days
+
+
+def prune_cutoff(now=None):
+    """Граница удаления: срок хранения, но не позже начала последнего свернутого дня"""
+    now = now or timezone.now()
+    cutoff = now - timedelta(days=get_retention_days())
+    last = NewsDailyViews.objects.aggregate(last=Max('date'))['last']
+    if last is None:
+        return None
+    return min(cutoff, day_start(last))
+
+
+def prune_views(now=None, batch_size=PRUNE_BATCH_SIZE):
+    """Удаляет свернутые сырые просмотры старше срока хранения; возвращает число строк"""
+    cutoff = prune_cutoff(now)
+    if cutoff is None:
+        return 0
+
+    deleted = 0
+    while True:
+        ids = list(NewsView.objects.filter(viewed_at__lt=cutoff).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            deleted += NewsView.objects.filter(id__in=ids).delete()[0]
+
+
+def compact_views(now=None, batch_size=PRUNE_BATCH_SIZE):
+    """Свертка завершенных дней и удаление старых строк: (дней, удалено строк)"""
+    days = rollup_views(now)
+    return days, prune_views(now, batch_size)
+
+
+def unique_visitors(news_id, start_date, end_date):
+    """Оценка уникальных посетителей новости за дни [start_date, end_date]"""
+    sketch = HyperLogLog()
+    for visitors in NewsDailyViews.objects.filter(
+        news_id=news_id, date__gte=start_date, date__lte=end_date
+    ).values_list('visitors', flat=True):
+        sketch.merge(HyperLogLog.from_bytes(visitors))
+    return sketch.count()
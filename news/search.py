@@ -0,0 +1,108 @@
+"""
+Поисковые индексы новостей, событий и объявлений (см. core.search).
+
+Событие и объявление ищутся по заголовку и тексту своей новости, поэтому
+при сохранении новости их документы переиндексируются вместе с ней.
+"""
+from core.search import SearchIndex, register, related_or_none
+
+from .models import News, Event, Announcement
+
+
+@register
+class NewsSearchIndex(SearchIndex):
+    model = News
+    label = 'news.news'
+
+    def get_title(self, obj, language):
+        return getattr(obj, f'title_{language}')
+
+    def get_body(self, obj, language):
+        return [getattr(obj, f'summary_{language}'), getattr(obj, f'content_{language}')]
+
+    def is_public(self, obj):
+        return obj.is_published
+
+    def get_published_at(self, obj):
+        return obj.published_at
+
+    def get_related_objects(self, obj):
+        return [
+            related for related in (
+                related_or_none(obj, 'event_details'),
+                related_or_none(obj, 'announcement_details'),
+            )
+            if related is not None
+        ]
+
+    def get_result_queryset(self):
+        return self.get_queryset().filter(is_published=True).defer(*News.CONTENT_FIELDS)
+
+    def serialize(self, obj, language):
+        return {
+            'title': getattr(obj, f'title_{language}') or obj.title_ru,
+            'summary': getattr(obj, f'summary_{language}') or obj.summary_ru,
+            'slug': obj.slug,
+            'date': obj.published_at,
+            'image_url': obj.image_url_or_default,
+        }
+
+
+class NewsDetailsSearchIndex(SearchIndex):
+    """Общая часть индексов моделей, расширяющих новость"""
+
+    def get_queryset(self):
+        return self.model._default_manager.select_related('news')
+
+    def get_result_queryset(self):
+        return self.get_queryset().filter(news__is_published=True).defer(
+            *[f'news__{field}' for field in News.CONTENT_FIELDS]
+        )
+
+    def get_title(self, obj, language):
+        return getattr(obj.news, f'title_{language}')
+
+    def is_public(self, obj):
+        return obj.news.is_published
+
+    def get_published_at(self, obj):
+        return obj.news.published_at
+
+    def serialize(self, obj, language):
+        return {
+            'title': self.get_title(obj, language) or obj.news.title_ru,
+            'summary': getattr(obj.news, f'summary_{language}') or obj.news.summary_ru,
+            'slug': obj.news.slug,
+        }
+
+
+@register
+class EventSearchIndex(NewsDetailsSearchIndex):
+    model = Event
+    label = 'news.event'
+
+    def get_body(self, obj, language):
+        return [getattr(obj.news, f'summary_{language}'), getattr(obj, f'location_{language}')]
+
+    def serialize(self, obj, language):
+        return {
+            **super().serialize(obj, language),
+            'date': obj.event_date,
+            'location': getattr(obj, f'location_{language}') or obj.location_ru,
+        }
+
+
+@register
+class AnnouncementSearchIndex(NewsDetailsSearchIndex):
+    model = Announcement
+    label = 'news.announcement'
+
+    def get_body(self, obj, language):
+        return [getattr(obj.news, f'summary_{language}'), getattr(obj.news, f'content_{language}')]
+
+    def serialize(self, obj, language):
+        return {
+            **super().serialize(obj, language),
+            'date': obj.deadline,
+            'priority': obj.priority,
+        }
@@ -1,36 +1,16 @@
 from rest_framework import serializers
-from django.utils import translation
+from django.db.models import Prefetch
+from core.localization import LocalizedField, LocalizedSerializerMixin
+from core.renditions import ImageSrcsetField
 from .models import News, NewsCategory, Event, Announcement, NewsTag, NewsTagRelation
+from .related import get_related_news
 
 
-class LanguageAwareSerializer(serializers.ModelSerializer):
+class LanguageAwareSerializer(LocalizedSerializerMixin, serializers.ModelSerializer):
     """Базовый сериализатор с поддержкой языков"""
-    
-    def get_localized_field(self, instance, field_name):
-        """Получить переведенное поле в зависимости от текущего языка"""
-        # Получаем язык из заголовка запроса или используем текущий язык Django
-        request = self.context.get('request')
-        if request:
-            current_language = request.headers.get('Accept-Language', 'ru')
-        else:
-            current_language = translation.get_language() or 'ru'
-        
-        # Попробуем получить поле для текущего языка
-        localized_field = f"{field_name}_{current_language}"
-        if hasattr(instance, localized_field):
-            value = getattr(instance, localized_field)
-            if value:
-                return value
-        
-        # Если нет перевода для текущего языка, вернем русский (по умолчанию)
-        default_field = f"{field_name}_ru"
-        if hasattr(instance, default_field):
-            value = getattr(instance, default_field)
-            if value:
-                return value
-        
-        # Если и русского нет, вернем базовое поле
-        return getattr(instance, field_name, 'not given')
+    # Нет перевода - русский, нет и русского - заглушка
+    localized_fallbacks = ('ru',)
+    localized_placeholder = 'not given'
     
     def to_representation(self, instance):
         """Переопределяем представление для автоматической локализации"""
@@ -46,6 +26,17 @@ class LanguageAwareSerializer(serializers.ModelSerializer):
         return data
 
 
+class NewsLocalizedField(LocalizedField):
+    """Поле новости на языке запроса с тем же fallback, что у LanguageAwareSerializer"""
+    
+    def __init__(self, **kwargs):
+        super().__init__(
+            fallbacks=LanguageAwareSerializer.localized_fallbacks,
+            placeholder=LanguageAwareSerializer.localized_placeholder,
+            **kwargs
+        )
+
+
 class NewsCategorySerializer(serializers.ModelSerializer):
     class Meta:
         model = NewsCategory
@@ -58,6 +49,35 @@ class NewsTagSerializer(serializers.ModelSerializer):
         fields = ['id', 'name_ru', 'name_kg', 'name_en', 'slug', 'color']
 
 
+def news_tags_prefetch():
+    """Prefetch для пакетной загрузки тегов новостей одним запросом на страницу"""
+    return Prefetch('tags', queryset=NewsTagRelation.objects.select_related('tag'))
+
+
+class NewsTagCompactSerializer(serializers.ModelSerializer):
+    """Тег на языке запроса для компактного списка"""
+    name = NewsLocalizedField()
+    
+    class Meta:
+        model = NewsTag
+        fields = ['slug', 'name', 'color']
+
+
+class NewsTagsMixin:
+    """Сериализация тегов новости с использованием кэша prefetch_related"""
+    tag_serializer_class = NewsTagSerializer
+    
+    def get_tags(self, obj):
+        prefetched = getattr(obj, '_prefetched_objects_cache', {})
+        if 'tags' in prefetched:
+            tag_relations = obj.tags.all()
+        else:
+            # Queryset без prefetch: один запрос на новость
+            tag_relations = obj.tags.select_related('tag')
+        tags = [relation.tag for relation in tag_relations]
+        return self.tag_serializer_class(tags, many=True, context=self.context).data
+
+
 class EventDetailSerializer(serializers.ModelSerializer):
     """Детализированный сериализатор для событий"""
     event_category_display = serializers.CharField(source='get_event_category_display', read_only=True)
@@ -116,18 +136,18 @@ class AnnouncementDetailSerializer(serializers.ModelSerializer):
         return audiences
 
 
-class NewsListSerializer(serializers.ModelSerializer):
+class NewsListSerializer(NewsTagsMixin, serializers.ModelSerializer):
     """Сериализатор для списка новостей (краткая информация)"""
     category = NewsCategorySerializer(read_only=True)
     image_url = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField(source='image_renditions')
     tags = serializers.SerializerMethodField()
-    read_time = serializers.SerializerMethodField()
     
     class Meta:
         model = News
         fields = [
             'id', 'title_ru', 'title_kg', 'title_en', 'slug', 
-            'summary_ru', 'summary_kg', 'summary_en', 'image_url',
+            'summary_ru', 'summary_kg', 'summary_en', 'image_url', 'image_srcset',
             'category', 'author_ru', 'author_kg', 'author_en', 
             'published_at', 'is_featured', 'is_pinned', 'views_count', 
             'tags', 'read_time'
@@ -135,38 +155,51 @@ class NewsListSerializer(serializers.ModelSerializer):
     
     def get_image_url(self, obj):
         return obj.image_url_or_default
+
+
+class NewsCompactSerializer(NewsTagsMixin, serializers.ModelSerializer):
+    """Компактный список новостей на одном языке (?lang=, см. core.compact)"""
+    tag_serializer_class = NewsTagCompactSerializer
+    title = NewsLocalizedField()
+    summary = NewsLocalizedField()
+    author = NewsLocalizedField()
+    category = serializers.CharField(source='category.slug', read_only=True)
+    category_name = NewsLocalizedField(source='category.name')
+    image_url = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField(source='image_renditions')
+    tags = serializers.SerializerMethodField()
     
-    def get_tags(self, obj):
-        # Получаем связанные теги через промежуточную модель
-        tag_relations = NewsTagRelation.objects.filter(news=obj).select_related('tag')
-        tags = [relation.tag for relation in tag_relations]
-        return NewsTagSerializer(tags, many=True, context=self.context).data
+    class Meta:
+        model = News
+        fields = [
+            'id', 'title', 'slug', 'summary', 'image_url', 'image_srcset',
+            'category', 'category_name', 'author',
+            'published_at', 'is_featured', 'is_pinned', 'views_count',
+            'tags', 'read_time'
+        ]
+        # Колонки, которые читает image_url_or_default
+        extra_columns = ('image', 'image_url')
     
-    def get_read_time(self, obj):
-        # Примерный расчет времени чтения (200 слов в минуту)
-        content = obj.content_ru or obj.content_kg or obj.content_en or ''
-        if content:
-            word_count = len(content.split())
-            return max(1, word_count // 200)
-        return 1
+    def get_image_url(self, obj):
+        return obj.image_url_or_default
 
 
-class NewsDetailSerializer(serializers.ModelSerializer):
+class NewsDetailSerializer(NewsTagsMixin, serializers.ModelSerializer):
     """Детализированный сериализатор для новости"""
     category = NewsCategorySerializer(read_only=True)
     image_url = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField(source='image_renditions')
     tags = serializers.SerializerMethodField()
     event_details = EventDetailSerializer(read_only=True)
     announcement_details = AnnouncementDetailSerializer(read_only=True)
     related_news = serializers.SerializerMethodField()
-    read_time = serializers.SerializerMethodField()
     
     class Meta:
         model = News
         fields = [
             'id', 'title_ru', 'title_kg', 'title_en', 'slug', 
             'summary_ru', 'summary_kg', 'summary_en', 
-            'content_ru', 'content_kg', 'content_en', 'image_url',
+            'content_ru', 'content_kg', 'content_en', 'image_url', 'image_srcset',
             'category', 'author_ru', 'author_kg', 'author_en', 
             'created_at', 'updated_at', 'published_at',
             'is_featured', 'is_pinned', 'views_count', 'tags', 'read_time',
@@ -176,39 +209,22 @@ class NewsDetailSerializer(serializers.ModelSerializer):
     def get_image_url(self, obj):
         return obj.image_url
     
-    def get_tags(self, obj):
-        # Получаем связанные теги
-        tag_relations = NewsTagRelation.objects.filter(news=obj).select_related('tag')
-        tags = [relation.tag for relation in tag_relations]
-        return NewsTagSerializer(tags, many=True, context=self.context).data
-    
-    def get_read_time(self, obj):
-        # Расчет времени чтения
-        content = obj.content_ru or obj.content_kg or obj.content_en or ''
-        if content:
-            word_count = len(content.split())
-            return max(1, word_count // 200)
-        return 1
-    
     def get_related_news(self, obj):
-        """Получение связанных новостей той же категории"""
-        related = News.objects.filter(
-            category=obj.category,
-            is_published=True
-        ).exclude(id=obj.id)[:3]
-        
+        """Связанные новости из предрасчета (news.related)"""
+        related = get_related_news(obj).prefetch_related(news_tags_prefetch())
         return NewsListSerializer(related, many=True, context=self.context).data
 
 
 class EventListSerializer(LanguageAwareSerializer):
     """Сериализатор для списка событий"""
-    title = serializers.SerializerMethodField()
+    title = NewsLocalizedField(source='news.title')
     slug = serializers.CharField(source='news.slug', read_only=True)
-    summary = serializers.SerializerMethodField()
+    summary = NewsLocalizedField(source='news.summary')
     image_url = serializers.SerializerMethodField()
-    author = serializers.SerializerMethodField()
+    image_srcset = ImageSrcsetField(source='news.image_renditions')
+    author = NewsLocalizedField(source='news.author')
     published_at = serializers.DateTimeField(source='news.published_at', read_only=True)
-    location = serializers.SerializerMethodField()
+    location = LocalizedField(fallbacks=('ru',))
     
     event_category_display = serializers.CharField(source='get_event_category_display', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
@@ -217,31 +233,13 @@ class EventListSerializer(LanguageAwareSerializer):
     class Meta:
         model = Event
         fields = [
-            'id', 'title', 'slug', 'summary', 'image_url', 'author', 'published_at',
+            'id', 'title', 'slug', 'summary', 'image_url', 'image_srcset', 'author', 'published_at',
             'event_date', 'event_time', 'location',
             'event_category', 'event_category_display',
             'status', 'status_display',
             'participants_info', 'registration_required'
         ]
     
-    def get_title(self, obj):
-        return self.get_localized_field(obj.news, 'title')
-    
-    def get_summary(self, obj):
-        return self.get_localized_field(obj.news, 'summary')
-    
-    def get_author(self, obj):
-        return self.get_localized_field(obj.news, 'author')
-    
-    def get_location(self, obj):
-        """Получает локализованное поле места проведения события"""
-        language = self.context.get('request').headers.get('Accept-Language', 'ru')
-        if language == 'ky':
-            return obj.location_kg or obj.location_ru
-        elif language == 'en':
-            return obj.location_en or obj.location_ru
-        return obj.location_ru
-    
     def get_image_url(self, obj):
         """Получает URL изображения события"""
         return obj.news.image_url_or_default
@@ -254,9 +252,9 @@ class EventListSerializer(LanguageAwareSerializer):
 
 class AnnouncementListSerializer(LanguageAwareSerializer):
     """Сериализатор для списка объявлений"""
-    title = serializers.SerializerMethodField()
-    summary = serializers.SerializerMethodField()
-    content = serializers.SerializerMethodField()
+    title = NewsLocalizedField(source='news.title')
+    summary = NewsLocalizedField(source='news.summary')
+    content = NewsLocalizedField(source='news.content')
     slug = serializers.CharField(source='news.slug', read_only=True)
     author = serializers.CharField(source='news.author_ru', read_only=True)
     published_at = serializers.DateTimeField(source='news.published_at', read_only=True)
@@ -277,15 +275,6 @@ class AnnouncementListSerializer(LanguageAwareSerializer):
             'attachment_name', 'attachment_name_display'
         ]
     
-    def get_title(self, obj):
-        return self.get_localized_field(obj.news, 'title')
-    
-    def get_summary(self, obj):
-        return self.get_localized_field(obj.news, 'summary')
-    
-    def get_content(self, obj):
-        return self.get_localized_field(obj.news, 'content')
-    
     def get_attachment_name_display(self, obj):
         if obj.attachment:
             return obj.attachment_name or obj.attachment.name.split('/')[-1]
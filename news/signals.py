@@ -0,0 +1,32 @@
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+
+from .models import News, NewsTagRelation
+from . import related
+from . import search  # noqa: регистрация поисковых индексов
+
+# Кэш ответов и снимок статистики сбрасываются сменой версий таблиц
+# (core.versions), которые обновляются по сигналам моделей
+
+
+# Поля новости, от которых зависят связанные новости
+RELATED_NEWS_FIELDS = {'category', 'category_id', 'published_at', 'is_published'}
+
+
+@receiver(post_save, sender=News)
+def refresh_related_news(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Пересчет связанных новостей при публикации и изменении новости"""
+    if raw or (update_fields is not None and not RELATED_NEWS_FIELDS.intersection(update_fields)):
+        return
+    related.schedule_refresh(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=NewsTagRelation)
+def refresh_related_news_tags(sender, instance, raw=False, **kwargs):
+    if not raw:
+        related.schedule_refresh(instance.news_id)
+
+
+@receiver(pre_delete, sender=News)
+def remove_related_news(sender, instance, **kwargs):
+    related.schedule_removal(instance.pk)
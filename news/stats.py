@@ -0,0 +1,31 @@
+from django.db.models import Count, Q
+
+from core.stats import StatsSnapshot
+from .models import News, Event, Announcement
+
+
+def build_news_stats():
+    """Статистика новостей: один запрос с условной агрегацией на таблицу"""
+    news = News.objects.aggregate(
+        total_news=Count('id', filter=Q(is_published=True)),
+        featured_news=Count('id', filter=Q(is_published=True, is_featured=True)),
+    )
+    events = Event.objects.filter(news__is_published=True).aggregate(
+        total_events=Count('id'),
+        upcoming_events=Count('id', filter=Q(status='upcoming')),
+    )
+    announcements = Announcement.objects.filter(news__is_published=True).aggregate(
+        total_announcements=Count('id'),
+        urgent_announcements=Count('id', filter=Q(priority__in=['high', 'urgent'])),
+    )
+    return {
+        'total_news': news['total_news'],
+        'total_events': events['total_events'],
+        'total_announcements': announcements['total_announcements'],
+        'upcoming_events': events['upcoming_events'],
+        'urgent_announcements': announcements['urgent_announcements'],
+        'featured_news': news['featured_news'],
+    }
+
+
+news_stats_snapshot = StatsSnapshot('news', build_news_stats, [News, Event, Announcement])
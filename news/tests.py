@@ -0,0 +1,585 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.models import SearchEntry
+
+from . import related, retention, trending, view_counter
+from .cache import get_cache_stats, reset_cache_stats
+from .models import News, NewsCategory, NewsTag, NewsTagRelation, NewsView, Event, Announcement, RelatedNews, TrendingNews, TrendingState, NewsDailyViews
+
+
+def create_category(name=NewsCategory.NEWS):
+    return NewsCategory.objects.create(
+        name=name, slug=name,
+        name_ru=name, name_kg=name, name_en=name,
+    )
+
+
+def create_news(category, index, **kwargs):
+    defaults = {
+        'title_ru': f'Новость {index}',
+        'title_kg': f'Жаңылык {index}',
+        'title_en': f'News {index}',
+        'slug': f'news-{index}',
+        'summary_ru': 'Кратко', 'summary_kg': 'Кыскача', 'summary_en': 'Summary',
+        'content_ru': 'слово ' * 450, 'content_kg': 'сөз ' * 10, 'content_en': 'word ' * 10,
+        'category': category,
+    }
+    defaults.update(kwargs)
+    return News.objects.create(**defaults)
+
+
+class NewsListQueryCountTests(TestCase):
+    """Количество запросов списка новостей не зависит от числа тегов и строк"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        category = create_category()
+        tags = [
+            NewsTag.objects.create(
+                name_ru=f'Тег {i}', name_kg=f'Тег {i}', name_en=f'Tag {i}', slug=f'tag-{i}'
+            )
+            for i in range(3)
+        ]
+        for index in range(25):
+            news = create_news(category, index)
+            for tag in tags:
+                NewsTagRelation.objects.create(news=news, tag=tag)
+
+    def test_list_page_uses_constant_queries(self):
+        # Версии таблиц для ETag + COUNT для пагинации + страница новостей с категорией + теги страницы
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/news/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertEqual(len(response.data['results'][0]['tags']), 3)
+
+    def test_featured_uses_constant_queries(self):
+        News.objects.update(is_featured=True)
+        # Версии таблиц + COUNT для пагинации + страница + теги страницы
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/news/featured/')
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertEqual(len(response.data['results'][-1]['tags']), 3)
+
+
+class NewsReadTimeTests(TestCase):
+    """Время чтения хранится в модели и не требует загрузки текста"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.category = create_category()
+
+    def test_save_updates_text_metrics(self):
+        news = create_news(self.category, 1)
+        self.assertEqual(news.word_count_ru, 450)
+        self.assertEqual(news.word_count_en, 10)
+        self.assertEqual(news.read_time, 2)
+
+        news.content_ru = ''
+        news.save(update_fields=['content_ru'])
+        news.refresh_from_db()
+        self.assertEqual(news.word_count_ru, 0)
+        self.assertEqual(news.read_time, 1)
+
+    def test_list_does_not_load_content(self):
+        create_news(self.category, 1)
+        # Версии таблиц, COUNT, страница, теги
+        with self.assertNumQueries(4) as context:
+            response = self.client.get('/api/news/')
+        self.assertEqual(response.data['results'][0]['read_time'], 2)
+        news_query = context.captured_queries[2]['sql']
+        self.assertNotIn('content_ru', news_query)
+
+    def test_backfill_command(self):
+        news = create_news(self.category, 1)
+        News.objects.filter(pk=news.pk).update(read_time=1, word_count_ru=0)
+        call_command('backfill_news_read_time', stdout=StringIO())
+        news.refresh_from_db()
+        self.assertEqual(news.word_count_ru, 450)
+        self.assertEqual(news.read_time, 2)
+
+    def test_backfill_invalidates_cached_responses(self):
+        news = create_news(self.category, 1, is_featured=True)
+        News.objects.filter(pk=news.pk).update(read_time=1, word_count_ru=0)
+        response = self.client.get('/api/news/featured/')
+        etag = response['ETag']
+        self.assertEqual(response.data['results'][0]['read_time'], 1)
+
+        call_command('backfill_news_read_time', stdout=StringIO())
+        response = self.client.get('/api/news/featured/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['read_time'], 2)
+
+
+class NewsResponseCacheTests(TestCase):
+    """Кэш ответов списка и подборок новостей"""
+
+    def setUp(self):
+        cache.clear()
+        reset_cache_stats()
+        self.client = APIClient()
+        self.category = create_category()
+        self.news = create_news(self.category, 1, is_featured=True)
+
+    def test_repeated_request_is_served_from_cache(self):
+        first = self.client.get('/api/news/featured/')
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/news/featured/')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(get_cache_stats()['hits'], 1)
+        self.assertEqual(get_cache_stats()['misses'], 1)
+
+    def test_cache_is_keyed_by_language_and_query(self):
+        self.client.get('/api/news/', HTTP_ACCEPT_LANGUAGE='ru')
+        self.assertEqual(self.client.get('/api/news/', HTTP_ACCEPT_LANGUAGE='en')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/news/?page=1', HTTP_ACCEPT_LANGUAGE='en')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/news/', HTTP_ACCEPT_LANGUAGE='en')['X-Cache'], 'HIT')
+
+    def test_content_change_invalidates_cache(self):
+        self.client.get('/api/news/featured/')
+        self.news.title_en = 'Updated'
+        self.news.save()
+        response = self.client.get('/api/news/featured/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title_en'], 'Updated')
+
+        tag = NewsTag.objects.create(name_ru='Тег', name_kg='Тег', name_en='Tag', slug='tag')
+        NewsTagRelation.objects.create(news=self.news, tag=tag)
+        response = self.client.get('/api/news/featured/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(response.data['results'][0]['tags']), 1)
+
+
+@override_settings(NEWS_VIEW_BUFFERING=True, NEWS_VIEW_FLUSH_INTERVAL=None)
+class BufferedNewsViewsTests(TestCase):
+    """Буферизованный учет просмотров детальной страницы"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.news = create_news(create_category(), 1)
+
+    def test_retrieve_only_appends_to_buffer(self):
+        self.client.get(f'/api/news/{self.news.slug}/')
+        # Новость, теги, строка буфера, детали события/объявления и связанные новости
+        with self.assertNumQueries(6) as context:
+            response = self.client.get(f'/api/news/{self.news.slug}/', REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.data['views_count'], 1)
+        writes = [query['sql'] for query in context.captured_queries if not query['sql'].startswith('SELECT')]
+        self.assertEqual(len(writes), 1)
+        self.assertTrue(writes[0].startswith('INSERT INTO "news_pendingnewsview"'))
+        self.assertFalse(NewsView.objects.exists())
+
+    def test_buffer_survives_cache_loss(self):
+        # Больше записей, чем держит локальный кэш; сброс - из другого процесса с пустым кэшем
+        for index in range(400):
+            view_counter.record_view(self.news.id, f'10.0.{index // 256}.{index % 256}')
+        cache.clear()
+        self.assertEqual(view_counter.pending_views_count(), 400)
+
+        call_command('flush_news_views', '--batch-size', '150', stdout=StringIO())
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.views_count, 400)
+        self.assertEqual(NewsView.objects.filter(news=self.news).count(), 400)
+        self.assertEqual(view_counter.pending_views_count(), 0)
+
+    def test_flush_deduplicates_and_aggregates(self):
+        for ip_address in ['10.0.0.1', '10.0.0.2', '10.0.0.1', '10.0.0.3']:
+            self.client.get(f'/api/news/{self.news.slug}/', REMOTE_ADDR=ip_address)
+        self.assertEqual(view_counter.pending_views_count(), 3)
+
+        call_command('flush_news_views', stdout=StringIO())
+
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.views_count, 3)
+        self.assertEqual(NewsView.objects.filter(news=self.news).count(), 3)
+        self.assertEqual(view_counter.pending_views_count(), 0)
+
+    def test_flush_skips_views_already_in_database(self):
+        NewsView.objects.create(news=self.news, ip_address='10.0.0.1')
+        view_counter.record_view(self.news.id, '10.0.0.1')
+        view_counter.record_view(self.news.id, '10.0.0.9')
+        self.assertEqual(view_counter.flush_views(), 1)
+        self.news.refresh_from_db()
+        self.assertEqual(self.news.views_count, 1)
+
+
+class TrendingNewsTests(TestCase):
+    """Популярные новости по почасовым корзинам с затуханием"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        category = create_category()
+        self.viral = create_news(category, 1)
+        self.fresh = create_news(category, 2)
+        self.now = timezone.now()
+
+    def view(self, news, count, hours_ago):
+        trending.record_views([(news.id, self.now - timedelta(hours=hours_ago))] * count)
+
+    def popular_ids(self, **params):
+        response = self.client.get('/api/news/popular/', params)
+        return [item['id'] for item in response.data]
+
+    def test_recent_views_outrank_old_viral_news(self):
+        self.view(self.viral, 100, hours_ago=20 * 24)
+        self.view(self.fresh, 30, hours_ago=1)
+
+        self.assertEqual(self.popular_ids(), [self.fresh.id, self.viral.id])
+        self.assertEqual(self.popular_ids(window='24h'), [self.fresh.id])
+        response = self.client.get('/api/news/popular/', {'window': '1y'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_popular_reads_precomputed_ranking(self):
+        self.view(self.fresh, 3, hours_ago=1)
+        # Версии таблиц для ключа кэша ответов + первые k строк рейтинга с новостями и категориями + теги
+        with self.assertNumQueries(3) as context:
+            self.client.get('/api/news/popular/', {'window': '7d'})
+        self.assertIn('LIMIT 10', context.captured_queries[1]['sql'])
+
+    def test_incremental_scores_match_rebuild_and_expire(self):
+        self.view(self.viral, 10, hours_ago=30)
+        self.view(self.fresh, 4, hours_ago=2)
+        self.view(self.viral, 2, hours_ago=1)
+        incremental = dict(TrendingNews.objects.filter(window='7d').values_list('news_id', 'score'))
+
+        trending.rebuild_window('7d')
+        rebuilt = dict(TrendingNews.objects.filter(window='7d').values_list('news_id', 'score'))
+        # Оценки отличаются общим множителем (опорным часом)
+        self.assertAlmostEqual(
+            incremental[self.viral.id] / incremental[self.fresh.id],
+            rebuilt[self.viral.id] / rebuilt[self.fresh.id]
+        )
+
+        trending.advance_trending(self.now + timedelta(hours=22))
+        self.assertEqual(self.popular_ids(window='24h'), [self.fresh.id, self.viral.id])
+        # Сдвиг окна меняет версию рейтинга: закэшированный ответ не отдается
+        trending.advance_trending(self.now + timedelta(days=2))
+        self.assertFalse(TrendingNews.objects.filter(window='24h').exists())
+        response = self.client.get('/api/news/popular/', {'window': '24h'})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(self.popular_ids(window='7d'), [self.viral.id, self.fresh.id])
+
+    def test_popular_cache_follows_new_views(self):
+        self.view(self.viral, 2, hours_ago=1)
+        self.assertEqual(self.popular_ids(window='24h'), [self.viral.id])
+        self.view(self.fresh, 5, hours_ago=1)
+        self.assertEqual(self.popular_ids(window='24h'), [self.fresh.id, self.viral.id])
+
+    def test_empty_ranking_falls_back_to_views_count(self):
+        News.objects.filter(pk=self.viral.pk).update(views_count=50)
+        News.objects.filter(pk=self.fresh.pk).update(views_count=10)
+        old = create_news(self.fresh.category, 3, views_count=100, published_at=self.now - timedelta(days=40))
+        self.assertFalse(TrendingNews.objects.exists())
+        self.assertEqual(self.popular_ids(), [self.viral.id, self.fresh.id])
+        self.assertNotIn(old.id, self.popular_ids(window='7d'))
+
+    def test_state_is_shared_through_database(self):
+        self.view(self.viral, 10, hours_ago=30)
+        epoch = TrendingState.objects.get(window='7d').epoch
+        row = TrendingNews.objects.get(window='7d', news=self.viral)
+        # Процесс с холодным кэшем продолжает с тем же опорным часом, без пересчета окна
+        cache.clear()
+        self.view(self.fresh, 4, hours_ago=2)
+        self.assertEqual(TrendingState.objects.get(window='7d').epoch, epoch)
+        self.assertTrue(TrendingNews.objects.filter(pk=row.pk).exists())
+
+        incremental = dict(TrendingNews.objects.filter(window='7d').values_list('news_id', 'score'))
+        trending.rebuild_window('7d')
+        rebuilt = dict(TrendingNews.objects.filter(window='7d').values_list('news_id', 'score'))
+        self.assertAlmostEqual(
+            incremental[self.viral.id] / incremental[self.fresh.id],
+            rebuilt[self.viral.id] / rebuilt[self.fresh.id]
+        )
+
+    def test_flush_and_rebuild_command_fill_ranking(self):
+        for ip_address in ['10.0.0.1', '10.0.0.2']:
+            view_counter.record_view(self.fresh.id, ip_address)
+        view_counter.record_view(self.viral.id, '10.0.0.1')
+        view_counter.flush_views()
+        self.assertEqual(self.popular_ids(window='24h'), [self.fresh.id, self.viral.id])
+
+        TrendingNews.objects.all().delete()
+        call_command('rebuild_trending_news', stdout=StringIO())
+        self.assertEqual(self.popular_ids(window='24h'), [self.fresh.id, self.viral.id])
+
+
+class NewsViewRetentionTests(TestCase):
+    """Свертка просмотров по дням и удаление старых сырых строк"""
+
+    def setUp(self):
+        self.news = create_news(create_category(), 1)
+        self.now = timezone.now()
+
+    def view(self, ip_address, days_ago):
+        NewsView.objects.create(news=self.news, ip_address=ip_address, viewed_at=self.now - timedelta(days=days_ago))
+
+    def test_compact_rolls_up_days_and_prunes_old_rows(self):
+        self.view('10.0.0.1', 100)
+        self.view('10.0.0.2', 100)
+        self.view('10.0.0.3', 95)
+        self.view('10.0.0.4', 1)
+
+        call_command('compact_news_views', '--batch-size', '1', stdout=StringIO())
+
+        daily = dict(NewsDailyViews.objects.values_list('date', 'views'))
+        self.assertEqual(sum(daily.values()), 4)
+        self.assertEqual(daily[timezone.localdate(self.now - timedelta(days=100))], 2)
+        self.assertEqual(list(NewsView.objects.values_list('ip_address', flat=True)), ['10.0.0.4'])
+
+        today = timezone.localdate(self.now)
+        self.assertEqual(retention.unique_visitors(self.news.id, today - timedelta(days=101), today), 4)
+
+    def test_rollup_is_repeatable_and_keeps_last_rolled_day(self):
+        self.view('10.0.0.1', 2)
+        with override_settings(NEWS_VIEW_RETENTION_DAYS=1):
+            retention.compact_views()
+            # Поздно записанный просмотр последнего свернутого дня учитывается при повторной свертке
+            self.view('10.0.0.2', 2)
+            retention.compact_views()
+        self.assertEqual(NewsDailyViews.objects.get().views, 2)
+        self.assertEqual(NewsView.objects.count(), 2)
+
+
+class NewsStatsTests(TestCase):
+    """Статистика новостей отдается из снимка"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        category = create_category()
+        create_news(category, 1, is_featured=True)
+        create_news(category, 2, is_published=False, is_featured=True)
+        event_news = create_news(category, 3)
+        Event.objects.create(
+            news=event_news, event_date='2030-01-01', event_time='10:00',
+            location_ru='Зал', location_kg='Зал', location_en='Hall', event_category='seminar'
+        )
+        Announcement.objects.create(news=create_news(category, 4), announcement_type='academic', priority='urgent')
+
+    def test_stats_are_built_with_one_query_per_table(self):
+        # Версии таблиц + по запросу на News, Event и Announcement
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/stats/')
+        self.assertEqual(response.json(), {
+            'total_news': 3, 'total_events': 1, 'total_announcements': 1,
+            'upcoming_events': 1, 'urgent_announcements': 1, 'featured_news': 1,
+        })
+        with self.assertNumQueries(0):
+            self.client.get('/api/stats/')
+
+    def test_snapshot_is_refreshed_on_change(self):
+        self.client.get('/api/stats/')
+        News.objects.filter(slug='news-1').first().delete()
+        self.assertEqual(self.client.get('/api/stats/').json()['featured_news'], 0)
+
+
+class SearchAllTests(TestCase):
+    """Общий поиск идет по полнотекстовому индексу, синхронизируемому сигналами"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.category = create_category()
+
+    def test_search_matches_all_languages_and_ranks_title_first(self):
+        create_news(self.category, 1, title_ru='Грант для студентов')
+        create_news(self.category, 2, summary_ru='Объявлен новый грант')
+        create_news(self.category, 3, title_en='Scholarship programme')
+        create_news(self.category, 4, title_ru='Про грант', is_published=False)
+
+        data = self.client.get('/api/search/', {'q': 'грант'}).json()
+        self.assertEqual([item['slug'] for item in data['news']], ['news-1', 'news-2'])
+        self.assertEqual(data['total_found'], 2)
+
+        data = self.client.get('/api/search/', {'q': 'scholar'}).json()
+        self.assertEqual([item['slug'] for item in data['news']], ['news-3'])
+
+        data = self.client.get('/api/search/', {'q': 'scholarship', 'lang': 'ru'}).json()
+        self.assertEqual(data['total_found'], 0)
+
+    def test_index_follows_changes(self):
+        news = create_news(self.category, 1, title_ru='Олимпиада по физике')
+        event = Event.objects.create(
+            news=news, event_date='2026-01-01', event_time='10:00',
+            location_ru='Актовый зал', location_kg='Жыйындар залы', location_en='Assembly hall',
+            event_category='competition',
+        )
+
+        data = self.client.get('/api/search/', {'q': 'актовый'}).json()
+        self.assertEqual([item['id'] for item in data['events']], [event.id])
+
+        news.title_ru = 'Олимпиада по химии'
+        news.save()
+        data = self.client.get('/api/search/', {'q': 'химии'}).json()
+        self.assertEqual(data['counts'], {'news': 1, 'events': 1, 'announcements': 0})
+
+        news.delete()
+        data = self.client.get('/api/search/', {'q': 'химии'}).json()
+        self.assertEqual(data['total_found'], 0)
+
+    def test_admin_bulk_publication_updates_index(self):
+        news = create_news(self.category, 1, title_ru='Олимпиада по физике')
+        event = Event.objects.create(
+            news=news, event_date='2026-01-01', event_time='10:00',
+            location_ru='Актовый зал', location_kg='Жыйындар залы', location_en='Assembly hall',
+            event_category='competition',
+        )
+        admin = APIClient()
+        admin.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+
+        # Фильтр списка изменений по публикации не мешает переиндексации
+        admin.post('/admin/news/news/?is_published__exact=1', {'action': 'make_unpublished', '_selected_action': [news.pk]})
+        self.assertFalse(SearchEntry.objects.get(content_type='news.event', object_id=event.pk).is_public)
+        data = self.client.get('/api/search/', {'q': 'олимпиада'}).json()
+        self.assertEqual(data['total_found'], 0)
+
+        admin.post('/admin/news/news/', {'action': 'make_published', '_selected_action': [news.pk]})
+        data = self.client.get('/api/search/', {'q': 'олимпиада'}).json()
+        self.assertEqual(data['counts'], {'news': 1, 'events': 1, 'announcements': 0})
+
+    def test_unpublished_results_are_hidden_with_stale_index(self):
+        news = create_news(self.category, 1, title_ru='Олимпиада по физике')
+        News.objects.filter(pk=news.pk).update(is_published=False)
+        data = self.client.get('/api/search/', {'q': 'олимпиада'}).json()
+        self.assertEqual(data['news'], [])
+        data = self.client.get('/api/core/search/', {'q': 'олимпиада'}).json()
+        self.assertEqual(data['results'], [])
+
+    def test_pagination_and_query_count(self):
+        for index in range(12):
+            create_news(self.category, index, title_ru=f'Ёлка {index}')
+
+        # Подсчет + страница новостей + объекты с категорией + теги; события и объявления не ищутся
+        with self.assertNumQueries(4):
+            data = self.client.get('/api/search/', {'q': 'елка', 'page': 3, 'page_size': 5}).json()
+        self.assertEqual(data['total_found'], 12)
+        self.assertEqual(len(data['news']), 2)
+
+    def test_rebuild_command(self):
+        create_news(self.category, 1, title_ru='Семинар')
+        SearchEntry.objects.all().delete()
+
+        call_command('rebuild_search_index', stdout=StringIO())
+        data = self.client.get('/api/search/', {'q': 'семинар'}).json()
+        self.assertEqual(data['total_found'], 1)
+
+
+@override_settings(TASKS_EAGER=True)
+class RelatedNewsTests(TestCase):
+    """Связанные новости предрасчитываются и обновляются после коммита"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.category = create_category()
+        self.other_category = create_category(NewsCategory.EVENTS)
+        self.tag = NewsTag.objects.create(name_ru='Тег', name_kg='Тег', name_en='Tag', slug='tag')
+        self.now = timezone.now()
+
+    def publish(self, index, category=None, days_ago=0, tagged=False):
+        with self.captureOnCommitCallbacks(execute=True):
+            news = create_news(
+                category or self.category, index, published_at=self.now - timedelta(days=days_ago)
+            )
+            if tagged:
+                NewsTagRelation.objects.create(news=news, tag=self.tag)
+        return news
+
+    def related_ids(self, news):
+        return list(RelatedNews.objects.filter(news=news).order_by('position').values_list('related_id', flat=True))
+
+    def test_ranking_prefers_tags_and_recent_news(self):
+        news = self.publish(1, tagged=True)
+        old = self.publish(2, days_ago=90)
+        recent = self.publish(3, days_ago=1)
+        tagged = self.publish(4, category=self.other_category, days_ago=5, tagged=True)
+        unrelated = self.publish(5, category=self.other_category)
+
+        self.assertEqual(self.related_ids(news), [tagged.id, recent.id, old.id])
+        self.assertNotIn(unrelated.id, self.related_ids(news))
+        # Новая новость попала и в списки кандидатов
+        self.assertEqual(self.related_ids(tagged)[0], news.id)
+
+        RelatedNews.objects.all().delete()
+        call_command('rebuild_related_news', stdout=StringIO())
+        self.assertEqual(self.related_ids(news), [tagged.id, recent.id, old.id])
+
+    def test_unpublish_and_delete_update_lists(self):
+        news = self.publish(1)
+        hidden = self.publish(2, days_ago=1)
+        removed = self.publish(3, days_ago=2)
+        self.assertEqual(self.related_ids(news), [hidden.id, removed.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            hidden.is_published = False
+            hidden.save()
+        self.assertEqual(self.related_ids(news), [removed.id])
+        self.assertFalse(RelatedNews.objects.filter(news=hidden).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            removed.delete()
+        self.assertEqual(self.related_ids(news), [])
+
+    def test_detail_reads_related_from_index(self):
+        news = self.publish(1)
+        self.publish(2, days_ago=1, tagged=True)
+        # Связанные новости: список из предрасчета + их теги
+        with CaptureQueriesContext(connection) as context:
+            data = self.client.get(f'/api/news/{news.slug}/').json()
+        self.assertEqual([item['id'] for item in data['related_news']], self.related_ids(news))
+        self.assertEqual(len(data['related_news'][0]['tags']), 1)
+        related_queries = [query['sql'] for query in context.captured_queries if 'news_relatednews' in query['sql']]
+        self.assertEqual(len(related_queries), 1)
+
+
+class ListActionTests(TestCase):
+    """Списки в @action пагинируются, полная выгрузка отдается потоком NDJSON"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        category = create_category()
+        for index in range(25):
+            Event.objects.create(
+                news=create_news(category, index), event_date='2026-01-01', event_time='10:00',
+                location_ru='Зал', location_kg='Зал', location_en='Hall', event_category='lecture',
+            )
+
+    def test_action_is_paginated(self):
+        data = self.client.get('/api/events/upcoming/').json()
+        self.assertEqual(data['count'], 25)
+        self.assertEqual(len(data['results']), 20)
+        self.assertEqual(len(self.client.get(data['next']).json()['results']), 5)
+
+    def test_ndjson_export_streams_all_rows(self):
+        response = self.client.get('/api/events/upcoming/', {'format': 'ndjson'})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 25)
+        self.assertEqual(json.loads(lines[0])['location'], 'Зал')
+
+    def test_ndjson_via_accept_header_bypasses_response_cache(self):
+        News.objects.update(is_featured=True)
+        self.client.get('/api/news/featured/')
+        response = self.client.get('/api/news/featured/', HTTP_ACCEPT='application/x-ndjson')
+        self.assertTrue(response.streaming)
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 25)
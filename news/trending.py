@@ -0,0 +1,223 @@
+"""
+Популярные новости с затуханием по времени.
+
+Просмотры копятся в почасовых корзинах (NewsViewBucket): буфер просмотров
+при сбросе увеличивает счетчики корзин. Оценка новости в окне (24h, 7d,
+30d) - сумма просмотров корзин окна, где вес корзины падает вдвое каждые
+half_life окна. Поэтому старая вирусная новость уступает свежей.
+
+Рейтинг хранится в TrendingNews, и popular читает первые k строк по индексу
+(window, -score) без сортировки всех новостей. Чтобы не пересчитывать все
+оценки каждый час, вес считается от опорного часа окна (epoch):
+2 ** ((hour - epoch) / half_life). Общий множитель не меняет порядок, так
+что новые просмотры только прибавляются к оценке, а корзины, вышедшие из
+окна, вычитаются (advance_trending). Когда веса от опорного часа становятся
+слишком большими, окно пересчитывается целиком с новым опорным часом.
+
+Опорный час и граница окна хранятся в TrendingState рядом с рейтингом и
+читаются с блокировкой строки (select_for_update) в той же транзакции, что
+и изменение оценок: процесс, пересчитывающий окно с новым опорным часом,
+и процессы, прибавляющие просмотры, не смешивают веса от разных опорных
+часов. Без строки состояния окно пересчитывается по корзинам. Сдвиг окон
+выполняется при сбросе буфера просмотров (view_counter.flush_views), полный
+пересчет по NewsView - командой rebuild_trending_news.
+
+Таблицы рейтинга не версионируются сигналами (core.versions), поэтому каждое
+изменение оценок явно меняет версию TrendingState: она входит в ключ кэша
+ответа popular. Пока рейтинг окна пуст (rebuild_trending_news еще не
+запускалась или в окне нет просмотров), popular отдает свежие новости по
+views_count, как до появления рейтинга.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Value, When
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from core import versions
+
+from .models import NewsView, NewsViewBucket, TrendingNews, TrendingState
+
+# Окно: (длина, период полураспада веса просмотров)
+WINDOWS = {
+    '24h': (timedelta(hours=24), timedelta(hours=6)),
+    '7d': (timedelta(days=7), timedelta(days=1)),
+    '30d': (timedelta(days=30), timedelta(days=7)),
+}
+DEFAULT_WINDOW = '30d'
+TRENDING_LIMIT = 10
+
+# Через сколько периодов полураспада от опорного часа окно пересчитывается
+REBASE_HALF_LIVES = 64
+
+
+def truncate_hour(moment):
+    """Начало часа в UTC: корзины не зависят от часового пояса"""
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def bucket_weight(hour, epoch, half_life):
+    return 2 ** ((hour - epoch) / half_life)
+
+
+def window_cutoff(window, now):
+    """Первый час, входящий в окно"""
+    length, _ = WINDOWS[window]
+    return truncate_hour(now) - length
+
+
+def mark_changed():
+    """Новая версия рейтинга: закэшированные ответы popular перестают читаться"""
+    versions.bump_version(TrendingState)
+
+
+def lock_states():
+    """
+    {окно: TrendingState} с блокировкой строк до конца транзакции; окна без
+    состояния отсутствуют. Вызывается внутри transaction.atomic().
+    """
+    return {state.window: state for state in TrendingState.objects.select_for_update().filter(window__in=WINDOWS)}
+
+
+def rebuild_window(window, now=None):
+    """Пересчитывает рейтинг окна по корзинам с новым опорным часом"""
+    now = now or timezone.now()
+    _, half_life = WINDOWS[window]
+    cutoff = window_cutoff(window, now)
+
+    with transaction.atomic():
+        # Блокировка состояния: параллельные прибавления ждут новый опорный час
+        TrendingState.objects.select_for_update().filter(window=window).first()
+        scores = defaultdict(float)
+        for news_id, hour, views in NewsViewBucket.objects.filter(hour__gte=cutoff).values_list('news_id', 'hour', 'views'):
+            scores[news_id] += views * bucket_weight(hour, cutoff, half_life)
+
+        TrendingNews.objects.filter(window=window).delete()
+        TrendingNews.objects.bulk_create([
+            TrendingNews(news_id=news_id, window=window, score=score)
+            for news_id, score in scores.items() if score > 0
+        ])
+        TrendingState.objects.update_or_create(window=window, defaults={'epoch': cutoff, 'cutoff': cutoff})
+    mark_changed()
+
+
+def _add_scores(window, deltas):
+    """Прибавляет к оценкам окна значения {news_id: delta}"""
+    TrendingNews.objects.bulk_create(
+        [TrendingNews(news_id=news_id, window=window) for news_id in deltas], ignore_conflicts=True
+    )
+    TrendingNews.objects.filter(window=window, news_id__in=deltas).update(
+        score=F('score') + Case(
+            *[When(news_id=news_id, then=Value(delta)) for news_id, delta in deltas.items()],
+            default=Value(0.0), output_field=FloatField()
+        )
+    )
+
+
+def record_views(views):
+    """
+    Учитывает новые просмотры [(news_id, viewed_at)]: корзины и оценки окон.
+    Вызывается при записи просмотров в NewsView.
+    """
+    counts = Counter((news_id, truncate_hour(viewed_at)) for news_id, viewed_at in views)
+    if not counts:
+        return
+
+    news_ids = {news_id for news_id, _ in counts}
+    hours = {hour for _, hour in counts}
+    with transaction.atomic():
+        NewsViewBucket.objects.bulk_create(
+            [NewsViewBucket(news_id=news_id, hour=hour) for news_id, hour in counts], ignore_conflicts=True
+        )
+        NewsViewBucket.objects.filter(news_id__in=news_ids, hour__in=hours).update(
+            views=F('views') + Case(
+                *[When(news_id=news_id, hour=hour, then=Value(count)) for (news_id, hour), count in counts.items()],
+                default=Value(0)
+            )
+        )
+
+        states = lock_states()
+        for window, (_, half_life) in WINDOWS.items():
+            state = states.get(window)
+            if state is None:
+                rebuild_window(window)
+                continue
+            deltas = defaultdict(float)
+            for (news_id, hour), count in counts.items():
+                if hour >= state.cutoff:
+                    deltas[news_id] += count * bucket_weight(hour, state.epoch, half_life)
+            if deltas:
+                _add_scores(window, deltas)
+    mark_changed()
+
+
+def advance_trending(now=None):
+    """
+    Сдвигает окна к текущему часу: вычитает вышедшие из окна корзины и
+    удаляет корзины старше самого длинного окна.
+    """
+    now = now or timezone.now()
+    changed = False
+    with transaction.atomic():
+        states = lock_states()
+        for window, (_, half_life) in WINDOWS.items():
+            state = states.get(window)
+            if state is None or now - state.epoch > half_life * REBASE_HALF_LIVES:
+                rebuild_window(window, now)
+                continue
+            new_cutoff = window_cutoff(window, now)
+            if new_cutoff <= state.cutoff:
+                continue
+            changed = True
+
+            deltas = defaultdict(float)
+            expired = NewsViewBucket.objects.filter(hour__gte=state.cutoff, hour__lt=new_cutoff)
+            for news_id, hour, views in expired.values_list('news_id', 'hour', 'views'):
+                deltas[news_id] -= views * bucket_weight(hour, state.epoch, half_life)
+            if deltas:
+                _add_scores(window, deltas)
+            # У новости с просмотрами в окне оценка не меньше веса первого часа;
+            # меньшие значения - остаток округления после вычитания
+            TrendingNews.objects.filter(
+                window=window, score__lt=bucket_weight(new_cutoff, state.epoch, half_life) / 2
+            ).delete()
+            state.cutoff = new_cutoff
+            state.save(update_fields=['cutoff'])
+    if changed:
+        mark_changed()
+
+    longest = max(length for length, _ in WINDOWS.values())
+    NewsViewBucket.objects.filter(hour__lt=truncate_hour(now) - longest).delete()
+
+
+def rebuild_trending(now=None):
+    """Полный пересчет корзин по NewsView и рейтингов всех окон"""
+    now = now or timezone.now()
+    longest = max(length for length, _ in WINDOWS.values())
+    rows = (
+        NewsView.objects.filter(viewed_at__gte=truncate_hour(now) - longest)
+        .annotate(hour=TruncHour('viewed_at', tzinfo=dt_timezone.utc))
+        .values('news_id', 'hour')
+        .annotate(views=Count('id'))
+        .values_list('news_id', 'hour', 'views')
+    )
+    with transaction.atomic():
+        NewsViewBucket.objects.all().delete()
+        NewsViewBucket.objects.bulk_create(
+            [NewsViewBucket(news_id=news_id, hour=hour, views=views) for news_id, hour, views in rows],
+            batch_size=1000
+        )
+        for window in WINDOWS:
+            rebuild_window(window, now)
+
+
+def get_trending_news(queryset, window=DEFAULT_WINDOW, limit=TRENDING_LIMIT, now=None):
+    """Первые limit новостей queryset по рейтингу окна; без рейтинга - по views_count за окно"""
+    ranked = list(queryset.filter(trending__window=window).order_by('-trending__score', '-id')[:limit])
+    if ranked:
+        return ranked
+    length, _ = WINDOWS[window]
+    now = now or timezone.now()
+    return list(queryset.filter(published_at__gte=now - length).order_by('-views_count')[:limit])
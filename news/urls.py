@@ -36,6 +36,7 @@ urlpatterns = [
 # DELETE /news/api/tags/{slug}/ - удалить тег
 #
 # GET /news/api/news/ - список новостей
+# GET /news/api/news/?pagination=cursor - список новостей с курсорной пагинацией (поле next)
 # POST /news/api/news/ - создать новость
 # GET /news/api/news/{slug}/ - детали новости
 # PUT /news/api/news/{slug}/ - обновить новость
@@ -51,6 +52,7 @@ urlpatterns = [
 # PUT /news/api/events/{news__slug}/ - обновить событие
 # DELETE /news/api/events/{news__slug}/ - удалить событие
 # GET /news/api/events/upcoming/ - предстоящие события
+# GET /news/api/events/upcoming/?format=ndjson - полная выгрузка потоком NDJSON (для всех списков-действий)
 # GET /news/api/events/past/ - прошедшие события
 # GET /news/api/events/this_month/ - события этого месяца
 #
@@ -65,4 +67,4 @@ urlpatterns = [
 # GET /news/api/announcements/for_students/ - объявления для студентов
 #
 # GET /news/api/stats/ - статистика
-# GET /news/api/search/?q={query} - поиск по всем типам контента
+# GET /news/api/search/?q={query}&page=1&page_size=5&lang=ru - полнотекстовый поиск по всем типам контента
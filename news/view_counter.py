@@ -0,0 +1,168 @@
+"""
+Буферизованный учет просмотров новостей (write-behind).
+
+Запрос детальной страницы только помечает пару (новость, IP) в кэше и
+добавляет строку в буфер PendingNewsView - один INSERT в узкую таблицу без
+уникальных индексов вместо проверки NewsView, обновления views_count и
+рейтинга. Буфер хранится в БД, а не в кэше: локальный кэш у каждого процесса
+свой и вытесняет записи, а таблицу видят все процессы, в том числе команда
+flush_news_views. Отметка в кэше только отсекает повторы в пределах
+процесса; окончательная проверка уникальности выполняется при сбросе.
+
+Накопленные просмотры периодически сбрасываются в БД пачками: bulk_create
+для NewsView и один UPDATE для счетчиков views_count, после чего обработанные
+строки буфера удаляются по первичному ключу. Сброс выполняет фоновый поток
+(NEWS_VIEW_FLUSH_INTERVAL) или команда flush_news_views; он же обновляет
+почасовые корзины и рейтинг популярных новостей (news.trending).
+"""
+import logging
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils import timezone
+
+from . import trending
+from .models import News, NewsView, PendingNewsView
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = 'news:views'
+LOCK_KEY = f'{CACHE_PREFIX}:lock'
+
+# Сколько держим отметку о просмотре (news, ip) для дедупликации в кэше
+SEEN_TIMEOUT = 60 * 60 * 24
+LOCK_TIMEOUT = 60
+FLUSH_BATCH_SIZE = 500
+
+_flusher_lock = threading.Lock()
+_flusher_started = False
+
+
+def is_buffering_enabled():
+    return getattr(settings, 'NEWS_VIEW_BUFFERING', True)
+
+
+def _seen_key(news_id, ip_address):
+    return f'{CACHE_PREFIX}:seen:{news_id}:{ip_address}'
+
+
+def record_view(news_id, ip_address, user_agent=''):
+    """
+    Регистрирует просмотр в буфере.
+    Возвращает True, если просмотр с этого IP учтен впервые.
+    """
+    if not cache.add(_seen_key(news_id, ip_address), 1, SEEN_TIMEOUT):
+        return False
+
+    PendingNewsView.objects.create(
+        news_id=news_id, ip_address=ip_address,
+        user_agent=user_agent[:NewsView.USER_AGENT_MAX_LENGTH], viewed_at=timezone.now()
+    )
+    ensure_background_flusher()
+    return True
+
+
+def pending_views_count():
+    """Количество записей в буфере, еще не сброшенных в БД"""
+    return PendingNewsView.objects.count()
+
+
+def flush_views(batch_size=FLUSH_BATCH_SIZE):
+    """
+    Сбрасывает накопленные просмотры в БД.
+    Возвращает количество новых просмотров, записанных в NewsView.
+    """
+    if not cache.add(LOCK_KEY, 1, LOCK_TIMEOUT):
+        # Сброс уже выполняется другим потоком этого процесса
+        return 0
+
+    try:
+        created = 0
+        while True:
+            with transaction.atomic():
+                batch = list(
+                    PendingNewsView.objects.order_by('id')
+                    .values_list('id', 'news_id', 'ip_address', 'user_agent', 'viewed_at')[:batch_size]
+                )
+                if not batch:
+                    break
+                created += _write_entries([entry[1:] for entry in batch])
+                PendingNewsView.objects.filter(id__in=[entry[0] for entry in batch]).delete()
+        trending.advance_trending()
+        return created
+    finally:
+        cache.delete(LOCK_KEY)
+
+
+def _write_entries(entries):
+    """
+    Записывает пачку просмотров: новые NewsView и агрегированные счетчики.
+    Вызывается внутри транзакции.
+    """
+    if not entries:
+        return 0
+
+    unique = {}
+    for news_id, ip_address, user_agent, viewed_at in entries:
+        unique.setdefault((news_id, ip_address), (user_agent, viewed_at))
+
+    # Блокировка строк новостей: параллельный сброс из другого процесса
+    # дождется коммита и увидит уже записанные просмотры, а не учтет их дважды.
+    # Новости могли быть удалены, пока просмотры лежали в буфере.
+    news_ids = {news_id for news_id, _ in unique}
+    alive = set(News.objects.select_for_update().filter(id__in=news_ids).order_by('id').values_list('id', flat=True))
+    ip_addresses = {ip_address for _, ip_address in unique}
+    existing = set(
+        NewsView.objects.filter(
+            news_id__in=news_ids, ip_address__in=ip_addresses
+        ).values_list('news_id', 'ip_address')
+    )
+
+    new_views = [
+        NewsView(news_id=news_id, ip_address=ip_address, user_agent=user_agent, viewed_at=viewed_at)
+        for (news_id, ip_address), (user_agent, viewed_at) in unique.items()
+        if (news_id, ip_address) not in existing and news_id in alive
+    ]
+    if not new_views:
+        return 0
+
+    increments = Counter(view.news_id for view in new_views)
+    NewsView.objects.bulk_create(new_views, ignore_conflicts=True)
+    News.objects.filter(id__in=increments).update(
+        views_count=F('views_count') + Case(
+            *[When(id=news_id, then=Value(count)) for news_id, count in increments.items()],
+            default=Value(0)
+        )
+    )
+    trending.record_views((view.news_id, view.viewed_at) for view in new_views)
+    return len(new_views)
+
+
+def ensure_background_flusher():
+    """Запускает фоновый поток периодического сброса (один на процесс)"""
+    global _flusher_started
+    interval = getattr(settings, 'NEWS_VIEW_FLUSH_INTERVAL', None)
+    if not interval or _flusher_started:
+        return
+
+    with _flusher_lock:
+        if _flusher_started:
+            return
+        thread = threading.Thread(
+            target=_flush_loop, args=(interval,), name='news-view-flusher', daemon=True
+        )
+        thread.start()
+        _flusher_started = True
+
+
+def _flush_loop(interval):
+    stop = threading.Event()
+    while not stop.wait(interval):
+        try:
+            flush_views()
+        except Exception:
+            logger.exception('Не удалось сбросить буфер просмотров новостей')
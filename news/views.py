@@ -7,49 +7,72 @@ from django.db.models import Q, F
 from django.shortcuts import get_object_or_404
 from datetime import datetime, timedelta
 
-from .models import News, NewsCategory, Event, Announcement, NewsTag, NewsView
+from core import search
+from core.compact import CompactListMixin
+from core.conditional import ConditionalGetMixin
+from core.pagination import ListActionMixin
+
+from . import trending, view_counter
+from .cache import NEWS_CONTENT_MODELS, cache_response
+from .stats import news_stats_snapshot
+from .models import News, NewsCategory, Event, Announcement, NewsTag, NewsView, TrendingState
 from .serializers import (
-    NewsListSerializer, NewsDetailSerializer, NewsCreateUpdateSerializer,
+    NewsListSerializer, NewsCompactSerializer, NewsDetailSerializer, NewsCreateUpdateSerializer,
     EventListSerializer, EventCreateUpdateSerializer,
     AnnouncementListSerializer, AnnouncementCreateUpdateSerializer,
-    NewsCategorySerializer, NewsTagSerializer
+    NewsCategorySerializer, NewsTagSerializer, news_tags_prefetch
 )
 
-
-class NewsCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class NewsCategoryViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для категорий новостей"""
     queryset = NewsCategory.objects.all()
     serializer_class = NewsCategorySerializer
+    conditional_models = (NewsCategory,)
     lookup_field = 'slug'
 
 
-class NewsTagViewSet(viewsets.ModelViewSet):
+class NewsTagViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """ViewSet для тегов новостей"""
     queryset = NewsTag.objects.all()
     serializer_class = NewsTagSerializer
+    conditional_models = (NewsTag,)
     lookup_field = 'slug'
 
 
-class NewsViewSet(viewsets.ModelViewSet):
+class NewsViewSet(ConditionalGetMixin, CompactListMixin, ListActionMixin, viewsets.ModelViewSet):
     """ViewSet для новостей"""
     queryset = News.objects.filter(is_published=True)
+    compact_serializer_class = NewsCompactSerializer
+    conditional_models = NEWS_CONTENT_MODELS
+    # Детальная страница учитывает просмотр, popular зависит от просмотров
+    conditional_exclude_actions = ('retrieve', 'popular')
     permission_classes = [IsAuthenticatedOrReadOnly]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category__name', 'is_featured', 'is_pinned']
     search_fields = ['title', 'summary', 'content']
     ordering_fields = ['published_at', 'views_count', 'created_at']
     ordering = ['-published_at']
+    # Ключ курсорной пагинации (?pagination=cursor), см. core.pagination
+    cursor_ordering = ('-published_at', '-id')
+    
+    # Действия, отдающие краткий список (без полного содержания)
+    list_actions = ['list', 'featured', 'pinned', 'popular', 'by_category']
+    compact_actions = list_actions
     
     def get_queryset(self):
         """Переопределяем queryset для поддержки поиска по slug"""
-        queryset = News.objects.filter(is_published=True)
+        queryset = super().get_queryset()
         
         # Поддержка поиска по slug в query параметрах
         slug = self.request.query_params.get('slug', None)
         if slug is not None:
             queryset = queryset.filter(slug=slug)
+        
+        # Списку не нужны тексты: время чтения хранится в отдельном поле
+        if self.action in self.list_actions:
+            queryset = queryset.defer(*News.CONTENT_FIELDS)
             
-        return queryset.select_related('category')
+        return queryset.select_related('category').prefetch_related(news_tags_prefetch())
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -58,28 +81,39 @@ class NewsViewSet(viewsets.ModelViewSet):
             return NewsCreateUpdateSerializer
         return NewsDetailSerializer
     
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+    
     def retrieve(self, request, *args, **kwargs):
         """Переопределяем для поддержки ID и slug, и учета просмотров"""
         lookup_value = kwargs.get('pk')
         
         # Проверяем, является ли значение числом (ID) или строкой (slug)
         if lookup_value.isdigit():
-            instance = get_object_or_404(News, pk=lookup_value, is_published=True)
+            instance = get_object_or_404(self.get_queryset(), pk=lookup_value)
         else:
-            instance = get_object_or_404(News, slug=lookup_value, is_published=True)
+            instance = get_object_or_404(self.get_queryset(), slug=lookup_value)
         
-        # Увеличиваем счетчик просмотров
+        # Учитываем просмотр
         ip_address = self.get_client_ip(request)
-        news_view, created = NewsView.objects.get_or_create(
-            news=instance,
-            ip_address=ip_address,
-            defaults={'user_agent': request.META.get('HTTP_USER_AGENT', '')}
-        )
-        
-        if created:
-            # Увеличиваем счетчик только для новых просмотров
-            News.objects.filter(id=instance.id).update(views_count=F('views_count') + 1)
-            instance.refresh_from_db()
+        user_agent = request.META.get('HTTP_USER_AGENT', '')[:NewsView.USER_AGENT_MAX_LENGTH]
+        if view_counter.is_buffering_enabled():
+            # Просмотр попадает в буфер и записывается в БД пачкой позже
+            if view_counter.record_view(instance.id, ip_address, user_agent):
+                instance.views_count += 1
+        else:
+            news_view, created = NewsView.objects.get_or_create(
+                news=instance,
+                ip_address=ip_address,
+                defaults={'user_agent': user_agent}
+            )
+            
+            if created:
+                # Увеличиваем счетчик только для новых просмотров
+                News.objects.filter(id=instance.id).update(views_count=F('views_count') + 1)
+                trending.record_views([(instance.id, news_view.viewed_at)])
+                instance.views_count += 1
         
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
@@ -94,29 +128,31 @@ class NewsViewSet(viewsets.ModelViewSet):
         return ip
     
     @action(detail=False, methods=['get'])
+    @cache_response
     def featured(self, request):
         """Получение рекомендуемых новостей"""
         featured_news = self.get_queryset().filter(is_featured=True)
-        serializer = NewsListSerializer(featured_news, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.list_response(featured_news, NewsListSerializer)
     
     @action(detail=False, methods=['get'])
+    @cache_response
     def pinned(self, request):
         """Получение закрепленных новостей"""
         pinned_news = self.get_queryset().filter(is_pinned=True)
-        serializer = NewsListSerializer(pinned_news, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.list_response(pinned_news, NewsListSerializer)
     
     @action(detail=False, methods=['get'])
+    @cache_response(models=NEWS_CONTENT_MODELS + (TrendingState,))
     def popular(self, request):
-        """Получение популярных новостей"""
-        # Популярные новости за последние 30 дней
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        popular_news = self.get_queryset().filter(
-            published_at__gte=thirty_days_ago
-        ).order_by('-views_count')[:10]
+        """Популярные новости за окно ?window=24h|7d|30d по рейтингу с затуханием"""
+        window = request.query_params.get('window', trending.DEFAULT_WINDOW)
+        if window not in trending.WINDOWS:
+            return Response({'error': f'Параметр window должен быть одним из: {", ".join(trending.WINDOWS)}'},
+                          status=status.HTTP_400_BAD_REQUEST)
+        popular_news = trending.get_trending_news(self.get_queryset(), window)
         
-        serializer = NewsListSerializer(popular_news, many=True, context={'request': request})
+        serializer_class = self.compact_serializer_class if self.is_compact() else NewsListSerializer
+        serializer = serializer_class(popular_news, many=True, context={'request': request})
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
@@ -129,20 +165,13 @@ class NewsViewSet(viewsets.ModelViewSet):
         
         category = get_object_or_404(NewsCategory, slug=category_slug)
         news = self.get_queryset().filter(category=category)
-        
-        # Применяем фильтрацию и пагинацию
-        page = self.paginate_queryset(news)
-        if page is not None:
-            serializer = NewsListSerializer(page, many=True, context={'request': request})
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = NewsListSerializer(news, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.list_response(news, NewsListSerializer)
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ConditionalGetMixin, ListActionMixin, viewsets.ModelViewSet):
     """ViewSet для событий"""
     queryset = Event.objects.select_related('news').filter(news__is_published=True)
+    conditional_models = NEWS_CONTENT_MODELS
     permission_classes = [IsAuthenticatedOrReadOnly]
     lookup_field = 'news__slug'
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -167,15 +196,13 @@ class EventViewSet(viewsets.ModelViewSet):
     def upcoming(self, request):
         """Предстоящие события"""
         upcoming_events = self.get_queryset().filter(status='upcoming')
-        serializer = EventListSerializer(upcoming_events, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.list_response(upcoming_events, EventListSerializer)
     
     @action(detail=False, methods=['get'])
     def past(self, request):
         """Прошедшие события"""
         past_events = self.get_queryset().filter(status='past')
-        serializer = EventListSerializer(past_events, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.list_response(past_events, EventListSerializer)
     
     @action(detail=False, methods=['get'])
     def this_month(self, request):
@@ -192,13 +219,13 @@ class EventViewSet(viewsets.ModelViewSet):
             event_date__lte=last_day
         )
         
-        serializer = EventListSerializer(month_events, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.list_response(month_events, EventListSerializer)
 
 
-class AnnouncementViewSet(viewsets.ModelViewSet):
+class AnnouncementViewSet(ConditionalGetMixin, ListActionMixin, viewsets.ModelViewSet):
     """ViewSet для объявлений"""
     queryset = Announcement.objects.select_related('news').filter(news__is_published=True)
+    conditional_models = NEWS_CONTENT_MODELS
     permission_classes = [IsAuthenticatedOrReadOnly]
     lookup_field = 'news__slug'
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -223,8 +250,7 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
     def pinned(self, request):
         """Закрепленные объявления"""
         pinned_announcements = self.get_queryset().filter(news__is_pinned=True)
-        serializer = AnnouncementListSerializer(pinned_announcements, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.list_response(pinned_announcements, AnnouncementListSerializer)
     
     @action(detail=False, methods=['get'])
     def urgent(self, request):
@@ -232,8 +258,7 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
         urgent_announcements = self.get_queryset().filter(
             Q(priority='high') | Q(priority='urgent') | Q(is_deadline_approaching=True)
         )
-        serializer = AnnouncementListSerializer(urgent_announcements, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.list_response(urgent_announcements, AnnouncementListSerializer)
     
     @action(detail=False, methods=['get'])
     def by_type(self, request):
@@ -244,79 +269,80 @@ class AnnouncementViewSet(viewsets.ModelViewSet):
                           status=status.HTTP_400_BAD_REQUEST)
         
         announcements = self.get_queryset().filter(announcement_type=announcement_type)
-        
-        page = self.paginate_queryset(announcements)
-        if page is not None:
-            serializer = AnnouncementListSerializer(page, many=True, context={'request': request})
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = AnnouncementListSerializer(announcements, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.list_response(announcements, AnnouncementListSerializer)
     
     @action(detail=False, methods=['get'])
     def for_students(self, request):
         """Объявления для студентов"""
         student_announcements = self.get_queryset().filter(target_students=True)
-        serializer = AnnouncementListSerializer(student_announcements, many=True, context={'request': request})
-        return Response(serializer.data)
+        return self.list_response(student_announcements, AnnouncementListSerializer)
 
 
 # Дополнительные API views для статистики и поиска
-class NewsStatsView(generics.GenericAPIView):
+class NewsStatsView(ConditionalGetMixin, generics.GenericAPIView):
     """API для получения статистики новостей"""
+    conditional_models = NEWS_CONTENT_MODELS
     
     def get(self, request):
-        stats = {
-            'total_news': News.objects.filter(is_published=True).count(),
-            'total_events': Event.objects.filter(news__is_published=True).count(),
-            'total_announcements': Announcement.objects.filter(news__is_published=True).count(),
-            'upcoming_events': Event.objects.filter(
-                news__is_published=True, 
-                status='upcoming'
-            ).count(),
-            'urgent_announcements': Announcement.objects.filter(
-                news__is_published=True,
-                priority__in=['high', 'urgent']
-            ).count(),
-            'featured_news': News.objects.filter(
-                is_published=True, 
-                is_featured=True
-            ).count(),
-        }
-        return Response(stats)
+        # Снимок статистики из кэша, пересчитывается при изменении контента
+        return Response(news_stats_snapshot.get())
 
 
-class SearchAllView(generics.GenericAPIView):
-    """Общий поиск по всем типам контента"""
+class SearchAllView(ConditionalGetMixin, generics.GenericAPIView):
+    """
+    Общий поиск по всем типам контента через полнотекстовый индекс (core.search).
+    Параметры: q, page, page_size (по умолчанию 5, максимум 50),
+    lang - искать только в текстах на одном языке (ru/kg/en).
+    """
+    default_page_size = 5
+    max_page_size = 50
+    conditional_models = NEWS_CONTENT_MODELS
+    
+    def get_querysets(self):
+        # Фильтр публикации дублирует is_public индекса: документ мог устареть
+        return {
+            'news.news': News.objects.filter(is_published=True).select_related('category').prefetch_related(
+                news_tags_prefetch()
+            ).defer(*News.CONTENT_FIELDS),
+            'news.event': Event.objects.filter(news__is_published=True).select_related('news'),
+            'news.announcement': Announcement.objects.filter(news__is_published=True).select_related('news'),
+        }
+    
+    def get_page_params(self, request):
+        try:
+            page = max(1, int(request.query_params.get('page', 1)))
+            page_size = int(request.query_params.get('page_size', self.default_page_size))
+        except ValueError:
+            return 1, self.default_page_size
+        return page, min(max(1, page_size), self.max_page_size)
     
     def get(self, request):
-        query = request.query_params.get('q', '')
+        query = request.query_params.get('q', '').strip()
         if len(query) < 2:
             return Response({'error': 'Поисковый запрос должен содержать минимум 2 символа'})
         
-        # Поиск в новостях
-        news = News.objects.filter(
-            Q(title__icontains=query) | Q(summary__icontains=query) | Q(content__icontains=query),
-            is_published=True
-        )[:5]
-        
-        # Поиск в событиях
-        events = Event.objects.filter(
-            Q(news__title__icontains=query) | Q(news__summary__icontains=query) | Q(location__icontains=query),
-            news__is_published=True
-        )[:5]
+        language = request.query_params.get('lang')
+        languages = [language] if language in search.LANGUAGES else search.LANGUAGES
+        page, page_size = self.get_page_params(request)
         
-        # Поиск в объявлениях
-        announcements = Announcement.objects.filter(
-            Q(news__title__icontains=query) | Q(news__summary__icontains=query) | Q(news__content__icontains=query),
-            news__is_published=True
-        )[:5]
+        found, counts = search.search_by_type(
+            query, self.get_querysets(), languages,
+            limit=page_size, offset=(page - 1) * page_size
+        )
         
+        context = {'request': request}
         results = {
-            'news': NewsListSerializer(news, many=True, context={'request': request}).data,
-            'events': EventListSerializer(events, many=True, context={'request': request}).data,
-            'announcements': AnnouncementListSerializer(announcements, many=True, context={'request': request}).data,
-            'total_found': news.count() + events.count() + announcements.count()
+            'news': NewsListSerializer(found['news.news'], many=True, context=context).data,
+            'events': EventListSerializer(found['news.event'], many=True, context=context).data,
+            'announcements': AnnouncementListSerializer(found['news.announcement'], many=True, context=context).data,
+            'total_found': counts['total'],
+            'counts': {
+                'news': counts.get('news.news', 0),
+                'events': counts.get('news.event', 0),
+                'announcements': counts.get('news.announcement', 0),
+            },
+            'page': page,
+            'page_size': page_size,
         }
         
         return Response(results)
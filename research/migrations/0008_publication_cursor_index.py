@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0007_auto_20250908_1714'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='publication',
+            index=models.Index(fields=['publication_date', 'id'], name='research_pu_publica_e2446d_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('research', '0008_publication_cursor_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='conference',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['start_date'], name='conference_active_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='conference',
+            index=models.Index(fields=['status', 'deadline'], name='conference_status_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grant',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at'], name='grant_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grant',
+            index=models.Index(fields=['status', 'created_at'], name='grant_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='grant',
+            index=models.Index(fields=['status', 'deadline'], name='grant_status_deadline_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publication',
+            index=models.Index(fields=['research_area', 'publication_date'], name='publication_area_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publication',
+            index=models.Index(condition=models.Q(('is_featured', True)), fields=['publication_date'], name='publication_featured_idx'),
+        ),
+    ]
@@ -53,6 +53,7 @@ class ResearchCenter(models.Model):
     equipment_kg = models.TextField("Оборудование (кыр)", blank=True)
     
     image = models.ImageField("Изображение", upload_to='research/centers/', blank=True)
+    image_renditions = models.JSONField("Варианты изображения", default=dict, blank=True, editable=False)
     website = models.URLField("Веб-сайт", blank=True)
     email = models.EmailField("Email", blank=True)
     phone = models.CharField("Телефон", max_length=20, blank=True)
@@ -122,6 +123,14 @@ class Grant(models.Model):
         verbose_name = "Грант"
         verbose_name_plural = "Гранты"
         ordering = ['-created_at']
+        indexes = [
+            # Список: WHERE is_active ORDER BY created_at
+            models.Index(fields=['created_at'], name='grant_active_created_idx', condition=models.Q(is_active=True)),
+            # active/upcoming и фильтр status
+            models.Index(fields=['status', 'created_at'], name='grant_status_created_idx'),
+            # deadline_soon: WHERE status AND deadline BETWEEN
+            models.Index(fields=['status', 'deadline'], name='grant_status_deadline_idx'),
+        ]
         
     def __str__(self):
         return f"{self.title_ru} ({self.organization_ru})"
@@ -172,6 +181,7 @@ class Conference(models.Model):
     participants_limit = models.IntegerField("Лимит участников", null=True, blank=True)
     
     image = models.ImageField("Изображение", upload_to='research/conferences/', blank=True)
+    image_renditions = models.JSONField("Варианты изображения", default=dict, blank=True, editable=False)
     status = models.CharField("Статус", max_length=30, choices=STATUS_CHOICES, default='registration-open')
     
     is_active = models.BooleanField("Активно", default=True)
@@ -181,6 +191,12 @@ class Conference(models.Model):
         verbose_name = "Конференция"
         verbose_name_plural = "Конференции"
         ordering = ['start_date']
+        indexes = [
+            # Список и upcoming: WHERE is_active [AND start_date >=] ORDER BY start_date
+            models.Index(fields=['start_date'], name='conference_active_start_idx', condition=models.Q(is_active=True)),
+            # registration_open: WHERE status IN (...) AND deadline >=
+            models.Index(fields=['status', 'deadline'], name='conference_status_deadline_idx'),
+        ]
         
     def __str__(self):
         return f"{self.title_ru} ({self.start_date})"
@@ -240,6 +256,16 @@ class Publication(models.Model):
         verbose_name = "Публикация"
         verbose_name_plural = "Публикации"
         ordering = ['-publication_date']
+        indexes = [
+            # Архив и курсорная пагинация: ORDER BY publication_date, id
+            models.Index(fields=['publication_date', 'id']),
+            # by_research_area: WHERE research_area_id ORDER BY publication_date
+            models.Index(fields=['research_area', 'publication_date'], name='publication_area_date_idx'),
+            models.Index(
+                fields=['publication_date'], name='publication_featured_idx',
+                condition=models.Q(is_featured=True),
+            ),
+        ]
         
     def __str__(self):
         return f"{self.title_ru} ({self.publication_date.year})"
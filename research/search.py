@@ -0,0 +1,131 @@
+"""
+Поисковые индексы научного раздела (см. core.search).
+"""
+from django.utils.text import Truncator
+
+from core.search import SearchIndex, register
+
+from .models import ResearchArea, ResearchCenter, Grant, Conference, Publication
+
+SUMMARY_LENGTH = 200
+
+
+def localized(obj, field, language):
+    return getattr(obj, f'{field}_{language}') or getattr(obj, f'{field}_ru')
+
+
+def summary(text):
+    return Truncator(text or '').chars(SUMMARY_LENGTH)
+
+
+class ResearchSearchIndex(SearchIndex):
+    """Общая часть индексов: публичны только активные записи"""
+    title_field = 'title'
+
+    def get_title(self, obj, language):
+        return getattr(obj, f'{self.title_field}_{language}')
+
+    def is_public(self, obj):
+        return obj.is_active
+
+    def get_published_at(self, obj):
+        return obj.created_at
+
+
+@register
+class ResearchAreaSearchIndex(ResearchSearchIndex):
+    model = ResearchArea
+    label = 'research.area'
+
+    def get_body(self, obj, language):
+        return getattr(obj, f'description_{language}')
+
+    def serialize(self, obj, language):
+        return {
+            'title': localized(obj, 'title', language),
+            'summary': summary(localized(obj, 'description', language)),
+            'icon': obj.icon,
+        }
+
+
+@register
+class ResearchCenterSearchIndex(ResearchSearchIndex):
+    model = ResearchCenter
+    label = 'research.center'
+    title_field = 'name'
+
+    def get_body(self, obj, language):
+        return [
+            getattr(obj, f'description_{language}'),
+            getattr(obj, f'director_{language}'),
+            getattr(obj, f'equipment_{language}'),
+        ]
+
+    def serialize(self, obj, language):
+        return {
+            'title': localized(obj, 'name', language),
+            'summary': localized(obj, 'director', language),
+        }
+
+
+@register
+class GrantSearchIndex(ResearchSearchIndex):
+    model = Grant
+    label = 'research.grant'
+
+    def get_body(self, obj, language):
+        return [
+            getattr(obj, f'organization_{language}'),
+            getattr(obj, f'description_{language}'),
+            getattr(obj, f'requirements_{language}'),
+        ]
+
+    def serialize(self, obj, language):
+        return {
+            'title': localized(obj, 'title', language),
+            'summary': localized(obj, 'organization', language),
+            'date': obj.deadline,
+        }
+
+
+@register
+class ConferenceSearchIndex(ResearchSearchIndex):
+    model = Conference
+    label = 'research.conference'
+
+    def get_body(self, obj, language):
+        return [
+            getattr(obj, f'location_{language}'),
+            getattr(obj, f'description_{language}'),
+            getattr(obj, f'topics_{language}'),
+            getattr(obj, f'speakers_{language}'),
+        ]
+
+    def serialize(self, obj, language):
+        return {
+            'title': localized(obj, 'title', language),
+            'summary': localized(obj, 'location', language),
+            'date': obj.start_date,
+        }
+
+
+@register
+class PublicationSearchIndex(ResearchSearchIndex):
+    model = Publication
+    label = 'research.publication'
+
+    def get_body(self, obj, language):
+        return [
+            getattr(obj, f'authors_{language}'),
+            obj.journal,
+            obj.doi,
+            getattr(obj, f'abstract_{language}'),
+            getattr(obj, f'keywords_{language}'),
+        ]
+
+    def serialize(self, obj, language):
+        return {
+            'title': localized(obj, 'title', language),
+            'summary': f'{localized(obj, "authors", language)}. {obj.journal}',
+            'date': obj.publication_date,
+        }
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from core.localization import LocalizedField
+from core.renditions import ImageSrcsetField
 from .models import ResearchArea, ResearchCenter, Grant, Conference, Publication, GrantApplication
 
 
@@ -17,6 +19,7 @@ class ResearchAreaSerializer(serializers.ModelSerializer):
 
 class ResearchCenterSerializer(serializers.ModelSerializer):
     """Сериализатор для исследовательских центров"""
+    image_srcset = ImageSrcsetField(source='image_renditions', absolute=True)
     
     class Meta:
         model = ResearchCenter
@@ -26,7 +29,7 @@ class ResearchCenterSerializer(serializers.ModelSerializer):
             'director_ru', 'director_en', 'director_kg', 
             'staff_count', 'established_year',
             'equipment_ru', 'equipment_en', 'equipment_kg',
-            'image', 'website', 'email', 'phone', 'is_active'
+            'image', 'image_srcset', 'website', 'email', 'phone', 'is_active'
         ]
 
 
@@ -64,6 +67,7 @@ class GrantDetailSerializer(serializers.ModelSerializer):
 
 class ConferenceSerializer(serializers.ModelSerializer):
     """Сериализатор для конференций"""
+    image_srcset = ImageSrcsetField(source='image_renditions', absolute=True)
     is_upcoming = serializers.ReadOnlyField()
     
     class Meta:
@@ -75,7 +79,7 @@ class ConferenceSerializer(serializers.ModelSerializer):
             'description_ru', 'description_en', 'description_kg',
             'topics_ru', 'topics_en', 'topics_kg',
             'speakers_ru', 'speakers_en', 'speakers_kg',
-            'speakers_count', 'participants_limit', 'image',
+            'speakers_count', 'participants_limit', 'image', 'image_srcset',
             'website', 'status', 'is_upcoming'
         ]
 
@@ -115,6 +119,69 @@ class PublicationDetailSerializer(serializers.ModelSerializer):
         ]
 
 
+# Компактные сериализаторы списков на одном языке (?lang=, см. core.compact)
+class ResearchCenterCompactSerializer(serializers.ModelSerializer):
+    """Исследовательский центр без описаний и переводов"""
+    name = LocalizedField()
+    director = LocalizedField()
+    image_srcset = ImageSrcsetField(source='image_renditions', absolute=True)
+    
+    class Meta:
+        model = ResearchCenter
+        fields = [
+            'id', 'name', 'director', 'staff_count', 'established_year',
+            'image', 'image_srcset', 'website', 'email', 'phone'
+        ]
+
+
+class GrantCompactSerializer(serializers.ModelSerializer):
+    """Грант на языке запроса"""
+    title = LocalizedField()
+    organization = LocalizedField()
+    duration = LocalizedField()
+    is_deadline_soon = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = Grant
+        fields = [
+            'id', 'title', 'organization', 'amount', 'deadline',
+            'category', 'status', 'duration', 'is_deadline_soon'
+        ]
+
+
+class ConferenceCompactSerializer(serializers.ModelSerializer):
+    """Конференция без описаний, тем и списков докладчиков"""
+    title = LocalizedField()
+    location = LocalizedField()
+    image_srcset = ImageSrcsetField(source='image_renditions', absolute=True)
+    is_upcoming = serializers.ReadOnlyField()
+    
+    class Meta:
+        model = Conference
+        fields = [
+            'id', 'title', 'start_date', 'end_date', 'deadline', 'location',
+            'speakers_count', 'participants_limit', 'image', 'image_srcset',
+            'website', 'status', 'is_upcoming'
+        ]
+
+
+class PublicationCompactSerializer(serializers.ModelSerializer):
+    """Публикация на языке запроса"""
+    title = LocalizedField()
+    authors = LocalizedField()
+    research_area_name = LocalizedField(source='research_area.title')
+    research_center_name = LocalizedField(source='research_center.name')
+    
+    class Meta:
+        model = Publication
+        fields = [
+            'id', 'title', 'authors',
+            'journal', 'publication_date', 'publication_type',
+            'impact_factor', 'citations_count', 'doi', 'url',
+            'research_area_name', 'research_center_name', 'is_featured'
+        ]
+
+
 class GrantApplicationCreateSerializer(serializers.ModelSerializer):
     """Сериализатор для создания заявки на грант"""
     
@@ -0,0 +1 @@
+from . import search  # noqa: регистрация поисковых индексов
@@ -0,0 +1,33 @@
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from core.stats import StatsSnapshot
+from .models import ResearchArea, ResearchCenter, Grant, Conference, Publication, GrantApplication
+
+
+def build_research_stats():
+    """Статистика исследований: один запрос с условной агрегацией на таблицу"""
+    grants = Grant.objects.filter(is_active=True).aggregate(
+        total_grants=Count('id'),
+        active_grants=Count('id', filter=Q(status='active')),
+    )
+    conferences = Conference.objects.filter(is_active=True).aggregate(
+        total_conferences=Count('id'),
+        upcoming_conferences=Count('id', filter=Q(start_date__gte=timezone.now().date())),
+    )
+    return {
+        'total_areas': ResearchArea.objects.filter(is_active=True).count(),
+        'total_centers': ResearchCenter.objects.filter(is_active=True).count(),
+        'total_grants': grants['total_grants'],
+        'active_grants': grants['active_grants'],
+        'total_publications': Publication.objects.filter(is_active=True).count(),
+        'total_conferences': conferences['total_conferences'],
+        'upcoming_conferences': conferences['upcoming_conferences'],
+        'pending_applications': GrantApplication.objects.filter(status='pending').count(),
+    }
+
+
+research_stats_snapshot = StatsSnapshot(
+    'research', build_research_stats,
+    [ResearchArea, ResearchCenter, Grant, Conference, Publication, GrantApplication]
+)
@@ -1,3 +1,128 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import ResearchArea, ResearchCenter, Grant, Conference, Publication, GrantApplication
+
+
+def create_area(index=0, **kwargs):
+    defaults = {
+        'title_ru': f'Область {index}', 'title_en': f'Area {index}', 'title_kg': f'Тармак {index}',
+        'description_ru': 'Описание', 'description_en': 'Description', 'description_kg': 'Сүрөттөмө',
+    }
+    defaults.update(kwargs)
+    return ResearchArea.objects.create(**defaults)
+
+
+def create_center(index=0, **kwargs):
+    defaults = {
+        'name_ru': f'Центр {index}', 'name_en': f'Center {index}', 'name_kg': f'Борбор {index}',
+        'description_ru': 'Описание', 'description_en': 'Description', 'description_kg': 'Сүрөттөмө',
+        'director_ru': 'Директор', 'director_en': 'Director', 'director_kg': 'Директор',
+        'established_year': 2000,
+    }
+    defaults.update(kwargs)
+    return ResearchCenter.objects.create(**defaults)
+
+
+def create_grant(index=0, **kwargs):
+    defaults = {
+        'title_ru': f'Грант {index}', 'title_en': f'Grant {index}', 'title_kg': f'Грант {index}',
+        'organization_ru': 'Фонд', 'organization_en': 'Fund', 'organization_kg': 'Фонд',
+        'amount': '1000', 'deadline': timezone.now().date() + timedelta(days=60),
+        'category': 'youth',
+        'duration_ru': '1 год', 'duration_en': '1 year', 'duration_kg': '1 жыл',
+        'requirements_ru': '-', 'requirements_en': '-', 'requirements_kg': '-',
+        'description_ru': 'Описание', 'description_en': 'Description', 'description_kg': 'Сүрөттөмө',
+        'contact': 'grant@example.com', 'website': 'https://example.com',
+    }
+    defaults.update(kwargs)
+    return Grant.objects.create(**defaults)
+
+
+def create_conference(index=0, start_in_days=30, **kwargs):
+    start_date = timezone.now().date() + timedelta(days=start_in_days)
+    defaults = {
+        'title_ru': f'Конференция {index}', 'title_en': f'Conference {index}', 'title_kg': f'Конференция {index}',
+        'start_date': start_date, 'end_date': start_date + timedelta(days=2),
+        'location_ru': 'Бишкек', 'location_en': 'Bishkek', 'location_kg': 'Бишкек',
+        'deadline': start_date - timedelta(days=7), 'website': 'https://example.com',
+        'description_ru': 'Описание', 'description_en': 'Description', 'description_kg': 'Сүрөттөмө',
+    }
+    defaults.update(kwargs)
+    return Conference.objects.create(**defaults)
+
+
+def create_publication(index=0, **kwargs):
+    defaults = {
+        'title_ru': f'Публикация {index}', 'title_en': f'Publication {index}', 'title_kg': f'Басылма {index}',
+        'authors_ru': 'Иванов И.', 'authors_en': 'Ivanov I.', 'authors_kg': 'Иванов И.',
+        'journal': 'Journal', 'publication_date': timezone.now().date() - timedelta(days=index),
+    }
+    defaults.update(kwargs)
+    return Publication.objects.create(**defaults)
+
+
+class ResearchStatsTests(TestCase):
+    """Общая статистика исследований отдается из снимка"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        create_area(1)
+        create_area(2, is_active=False)
+        create_center(1)
+        grant = create_grant(1)
+        create_grant(2, status='upcoming')
+        create_conference(1)
+        create_conference(2, start_in_days=-30)
+        create_publication(1)
+        GrantApplication.objects.create(
+            grant=grant, project_title='Проект', principal_investigator='Иванов',
+            email='pi@example.com', department='Кафедра', project_description='-',
+            budget=1000, timeline=12, expected_results='-'
+        )
+
+    def test_stats_are_built_with_one_query_per_table(self):
+        with self.assertNumQueries(6):
+            response = self.client.get('/research/api/stats/')
+        self.assertEqual(response.json(), {
+            'total_areas': 1, 'total_centers': 1, 'total_grants': 2, 'active_grants': 1,
+            'total_publications': 1, 'total_conferences': 2, 'upcoming_conferences': 1,
+            'pending_applications': 1,
+        })
+        with self.assertNumQueries(0):
+            self.client.get('/research/api/stats/')
+
+    def test_snapshot_is_refreshed_on_change(self):
+        self.client.get('/research/api/stats/')
+        create_publication(2)
+        self.assertEqual(self.client.get('/research/api/stats/').json()['total_publications'], 2)
+
+    def test_refresh_command_rebuilds_snapshot(self):
+        call_command('refresh_stats_snapshots', 'research', stdout=StringIO())
+        with self.assertNumQueries(0):
+            self.client.get('/research/api/stats/')
+
+
+class ResearchSearchTests(TestCase):
+    """Поиск научного раздела идет по общему полнотекстовому индексу"""
+
+    def test_search_all_uses_index(self):
+        grant = create_grant(1, title_ru='Грант по кардиологии')
+        create_grant(2, title_ru='Грант по кардиологии (архив)', is_active=False)
+        create_publication(1, keywords_ru=['кардиология', 'терапия'])
+
+        response = APIClient().get('/research/api/search/', {'q': 'кардиолог', 'lang': 'ru'})
+        data = response.json()
+        self.assertEqual([item['id'] for item in data['grants']], [grant.id])
+        self.assertEqual(len(data['publications']), 1)
+        self.assertEqual(data['conferences'], [])
 
-# Create your tests here.
+        response = APIClient().get('/research/api/search/', {'q': 'кардиолог', 'lang': 'en'})
+        self.assertEqual(response.json()['grants'], [])
@@ -45,6 +45,7 @@ GET /research/api/grants/ - список грантов
 GET /research/api/grants/{id}/ - детали гранта
 GET /research/api/grants/active/ - активные гранты
 GET /research/api/grants/upcoming/ - предстоящие гранты
+GET /research/api/grants/upcoming/?format=ndjson - полная выгрузка потоком NDJSON (для всех списков-действий)
 GET /research/api/grants/deadline_soon/ - гранты с близким дедлайном
 
 Параметры фильтрации для грантов:
@@ -65,6 +66,7 @@ GET /research/api/conferences/registration_open/ - конференции с о
 
 ПУБЛИКАЦИИ:
 GET /research/api/publications/ - список публикаций
+GET /research/api/publications/?pagination=cursor - список публикаций с курсорной пагинацией
 GET /research/api/publications/{id}/ - детали публикации
 GET /research/api/publications/featured/ - рекомендуемые публикации
 GET /research/api/publications/recent/ - недавние публикации
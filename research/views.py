@@ -7,21 +7,33 @@ from django.db.models import Count, Q, Avg
 from django.utils import timezone
 from datetime import timedelta
 
+from core import search
+from core.compact import CompactListMixin
+from core.conditional import ConditionalGetMixin, conditional_get
+from core.pagination import ListActionMixin
+
+from .stats import research_stats_snapshot
 from .models import ResearchArea, ResearchCenter, Grant, Conference, Publication, GrantApplication
 from .serializers import (
     ResearchAreaSerializer, ResearchCenterSerializer,
     GrantListSerializer, GrantDetailSerializer,
     ConferenceSerializer, PublicationListSerializer, PublicationDetailSerializer,
+    ResearchCenterCompactSerializer, GrantCompactSerializer,
+    ConferenceCompactSerializer, PublicationCompactSerializer,
     GrantApplicationCreateSerializer, GrantApplicationSerializer,
     ResearchStatsSerializer, GrantStatsSerializer, PublicationStatsSerializer
 )
 
+# Таблицы, от которых зависят ответы исследований (ETag, см. core.conditional)
+RESEARCH_CONTENT_MODELS = (ResearchArea, ResearchCenter, Grant, Conference, Publication)
+
 
-class ResearchAreaViewSet(viewsets.ReadOnlyModelViewSet):
+class ResearchAreaViewSet(ConditionalGetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для областей исследований"""
     queryset = ResearchArea.objects.filter(is_active=True)
     serializer_class = ResearchAreaSerializer
     permission_classes = [AllowAny]
+    conditional_models = RESEARCH_CONTENT_MODELS
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -29,21 +41,26 @@ class ResearchAreaViewSet(viewsets.ReadOnlyModelViewSet):
         return queryset.order_by('id')
 
 
-class ResearchCenterViewSet(viewsets.ReadOnlyModelViewSet):
+class ResearchCenterViewSet(ConditionalGetMixin, CompactListMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для исследовательских центров"""
     queryset = ResearchCenter.objects.filter(is_active=True)
     serializer_class = ResearchCenterSerializer
+    compact_serializer_class = ResearchCenterCompactSerializer
     permission_classes = [AllowAny]
+    conditional_models = RESEARCH_CONTENT_MODELS
     
     def get_queryset(self):
         queryset = super().get_queryset()
         return queryset.order_by('name_ru')
 
 
-class GrantViewSet(viewsets.ReadOnlyModelViewSet):
+class GrantViewSet(ConditionalGetMixin, CompactListMixin, ListActionMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для грантов"""
     queryset = Grant.objects.filter(is_active=True)
+    compact_serializer_class = GrantCompactSerializer
+    compact_actions = ('list', 'active', 'upcoming', 'deadline_soon')
     permission_classes = [AllowAny]
+    conditional_models = RESEARCH_CONTENT_MODELS
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['category', 'status', 'organization_ru', 'organization_en', 'organization_kg']
     search_fields = ['title_ru', 'title_en', 'title_kg', 'organization_ru', 'organization_en', 'organization_kg', 'description_ru']
@@ -59,15 +76,13 @@ class GrantViewSet(viewsets.ReadOnlyModelViewSet):
     def active(self, request):
         """Активные гранты"""
         queryset = self.get_queryset().filter(status='active')
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_response(queryset)
     
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """Предстоящие гранты"""
         queryset = self.get_queryset().filter(status='upcoming')
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_response(queryset)
     
     @action(detail=False, methods=['get'])
     def deadline_soon(self, request):
@@ -78,15 +93,17 @@ class GrantViewSet(viewsets.ReadOnlyModelViewSet):
             deadline__gte=timezone.now().date(),
             status='active'
         )
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_response(queryset)
 
 
-class ConferenceViewSet(viewsets.ReadOnlyModelViewSet):
+class ConferenceViewSet(ConditionalGetMixin, CompactListMixin, ListActionMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для конференций"""
     queryset = Conference.objects.filter(is_active=True)
     serializer_class = ConferenceSerializer
+    compact_serializer_class = ConferenceCompactSerializer
+    compact_actions = ('list', 'upcoming', 'registration_open')
     permission_classes = [AllowAny]
+    conditional_models = RESEARCH_CONTENT_MODELS
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status']
     search_fields = ['title_ru', 'title_en', 'title_kg', 'location_ru', 'description_ru']
@@ -97,8 +114,7 @@ class ConferenceViewSet(viewsets.ReadOnlyModelViewSet):
     def upcoming(self, request):
         """Предстоящие конференции"""
         queryset = self.get_queryset().filter(start_date__gte=timezone.now().date())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_response(queryset)
     
     @action(detail=False, methods=['get'])
     def registration_open(self, request):
@@ -107,19 +123,23 @@ class ConferenceViewSet(viewsets.ReadOnlyModelViewSet):
             status__in=['registration-open', 'early-bird'],
             deadline__gte=timezone.now().date()
         )
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_response(queryset)
 
 
-class PublicationViewSet(viewsets.ReadOnlyModelViewSet):
+class PublicationViewSet(ConditionalGetMixin, CompactListMixin, ListActionMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet для публикаций"""
-    queryset = Publication.objects.filter(is_active=True)
+    queryset = Publication.objects.filter(is_active=True).select_related('research_area', 'research_center')
+    compact_serializer_class = PublicationCompactSerializer
+    compact_actions = ('list', 'featured', 'recent', 'by_research_area')
     permission_classes = [AllowAny]
+    conditional_models = RESEARCH_CONTENT_MODELS
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['publication_type', 'research_area', 'research_center', 'is_featured']
     search_fields = ['title_ru', 'title_en', 'title_kg', 'authors', 'journal']
     ordering_fields = ['publication_date', 'impact_factor', 'citations_count']
     ordering = ['-publication_date']
+    # Ключ курсорной пагинации (?pagination=cursor), см. core.pagination
+    cursor_ordering = ('-publication_date', '-id')
     
     def get_serializer_class(self):
         if self.action == 'retrieve':
@@ -130,16 +150,14 @@ class PublicationViewSet(viewsets.ReadOnlyModelViewSet):
     def featured(self, request):
         """Рекомендуемые публикации"""
         queryset = self.get_queryset().filter(is_featured=True)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_response(queryset)
     
     @action(detail=False, methods=['get'])
     def recent(self, request):
         """Недавние публикации"""
         recent_date = timezone.now().date() - timedelta(days=365)
         queryset = self.get_queryset().filter(publication_date__gte=recent_date)
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        return self.list_response(queryset)
     
     @action(detail=False, methods=['get'])
     def by_research_area(self, request):
@@ -147,8 +165,7 @@ class PublicationViewSet(viewsets.ReadOnlyModelViewSet):
         area_id = request.query_params.get('area_id')
         if area_id:
             queryset = self.get_queryset().filter(research_area_id=area_id)
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+            return self.list_response(queryset)
         return Response({"error": "area_id parameter is required"}, status=400)
 
 
@@ -174,7 +191,7 @@ class GrantApplicationCreateView(generics.CreateAPIView):
 
 class GrantApplicationListView(generics.ListAPIView):
     """Список заявок на грант (для администраторов)"""
-    queryset = GrantApplication.objects.all()
+    queryset = GrantApplication.objects.select_related('grant')
     serializer_class = GrantApplicationSerializer
     permission_classes = [IsAuthenticated]  # Только для авторизованных пользователей
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
@@ -185,27 +202,18 @@ class GrantApplicationListView(generics.ListAPIView):
 
 
 @api_view(['GET'])
+@conditional_get(*RESEARCH_CONTENT_MODELS, GrantApplication)
 def research_stats(request):
     """Общая статистика исследований"""
-    stats = {
-        'total_areas': ResearchArea.objects.filter(is_active=True).count(),
-        'total_centers': ResearchCenter.objects.filter(is_active=True).count(),
-        'total_grants': Grant.objects.filter(is_active=True).count(),
-        'active_grants': Grant.objects.filter(is_active=True, status='active').count(),
-        'total_publications': Publication.objects.filter(is_active=True).count(),
-        'total_conferences': Conference.objects.filter(is_active=True).count(),
-        'upcoming_conferences': Conference.objects.filter(
-            is_active=True, 
-            start_date__gte=timezone.now().date()
-        ).count(),
-        'pending_applications': GrantApplication.objects.filter(status='pending').count(),
-    }
+    # Снимок статистики из кэша, пересчитывается при изменении данных
+    stats = research_stats_snapshot.get()
     
     serializer = ResearchStatsSerializer(stats)
     return Response(serializer.data)
 
 
 @api_view(['GET'])
+@conditional_get(*RESEARCH_CONTENT_MODELS)
 def grant_stats_by_category(request):
     """Статистика грантов по категориям"""
     stats = Grant.objects.filter(is_active=True).values('category').annotate(
@@ -223,6 +231,7 @@ def grant_stats_by_category(request):
 
 
 @api_view(['GET'])
+@conditional_get(*RESEARCH_CONTENT_MODELS)
 def publication_stats_by_type(request):
     """Статистика публикаций по типам"""
     stats = Publication.objects.filter(is_active=True).values('publication_type').annotate(
@@ -242,69 +251,32 @@ def publication_stats_by_type(request):
 
 
 @api_view(['GET'])
+@conditional_get(*RESEARCH_CONTENT_MODELS)
 def search_all(request):
-    """Поиск по всем сущностям"""
+    """Поиск по всем сущностям через общий полнотекстовый индекс (core.search)"""
     query = request.query_params.get('q', '')
-    lang = request.query_params.get('lang', 'ru')
+    lang = request.query_params.get('lang')
     
     if not query:
         return Response({"error": "Query parameter 'q' is required"}, status=400)
     
-    # Определяем поля для поиска в зависимости от языка
-    title_field = f'title_{lang}' if lang in ['ru', 'en', 'kg'] else 'title_ru'
-    name_field = f'name_{lang}' if lang in ['ru', 'en', 'kg'] else 'name_ru'
-    desc_field = f'description_{lang}' if lang in ['ru', 'en', 'kg'] else 'description_ru'
+    # Если язык указан - ищем только в текстах на этом языке
+    languages = [lang] if lang in search.LANGUAGES else search.LANGUAGES
+    
+    found, counts = search.search_by_type(query, {
+        'research.grant': Grant.objects.all(),
+        'research.conference': Conference.objects.all(),
+        'research.publication': Publication.objects.select_related('research_area', 'research_center'),
+        'research.area': ResearchArea.objects.all(),
+        'research.center': ResearchCenter.objects.all(),
+    }, languages)
     
     results = {
-        'grants': [],
-        'conferences': [],
-        'publications': [],
-        'research_areas': [],
-        'research_centers': []
+        'grants': GrantListSerializer(found['research.grant'], many=True).data,
+        'conferences': ConferenceSerializer(found['research.conference'], many=True).data,
+        'publications': PublicationListSerializer(found['research.publication'], many=True).data,
+        'research_areas': ResearchAreaSerializer(found['research.area'], many=True).data,
+        'research_centers': ResearchCenterSerializer(found['research.center'], many=True).data
     }
     
-    # Поиск грантов
-    grants = Grant.objects.filter(
-        Q(**{f'{title_field}__icontains': query}) |
-        Q(organization__icontains=query) |
-        Q(**{f'{desc_field}__icontains': query}),
-        is_active=True
-    )[:5]
-    results['grants'] = GrantListSerializer(grants, many=True).data
-    
-    # Поиск конференций
-    conferences = Conference.objects.filter(
-        Q(**{f'{title_field}__icontains': query}) |
-        Q(**{f'location_{lang}__icontains': query}) |
-        Q(**{f'{desc_field}__icontains': query}),
-        is_active=True
-    )[:5]
-    results['conferences'] = ConferenceSerializer(conferences, many=True).data
-    
-    # Поиск публикаций
-    publications = Publication.objects.filter(
-        Q(**{f'{title_field}__icontains': query}) |
-        Q(authors__icontains=query) |
-        Q(journal__icontains=query),
-        is_active=True
-    )[:5]
-    results['publications'] = PublicationListSerializer(publications, many=True).data
-    
-    # Поиск областей исследований
-    areas = ResearchArea.objects.filter(
-        Q(**{f'{title_field}__icontains': query}) |
-        Q(**{f'{desc_field}__icontains': query}),
-        is_active=True
-    )[:5]
-    results['research_areas'] = ResearchAreaSerializer(areas, many=True).data
-    
-    # Поиск исследовательских центров
-    centers = ResearchCenter.objects.filter(
-        Q(**{f'{name_field}__icontains': query}) |
-        Q(**{f'{desc_field}__icontains': query}) |
-        Q(director__icontains=query),
-        is_active=True
-    )[:5]
-    results['research_centers'] = ResearchCenterSerializer(centers, many=True).data
-    
     return Response(results)